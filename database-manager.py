@@ -32,9 +32,41 @@ parser.add_argument(
     action="store_true",
     help="if added, the report will be opened in a default browser",
 )
+parser.add_argument(
+    "-p",
+    "--profile",
+    action="store_true",
+    help="if added, the time and memory profile of the run will be saved in the reports dir",
+)
+parser.add_argument(
+    "-s",
+    "--stream",
+    action="store_true",
+    help="if added to -f, the data will be generated and filled month by month",
+)
+parser.add_argument(
+    "-e",
+    "--export",
+    choices=["parquet", "csv", "sql"],
+    help="if added, the random data will be saved in the given format in the exports dir",
+)
+parser.add_argument(
+    "-a",
+    "--append",
+    action="store_true",
+    help="if added instead of -f, only the days since the last update will be generated and added",
+)
 
 
 if __name__ == "__main__":
     chdir(Path(__file__).parent.absolute())
     args = parser.parse_args()
-    DBManagerApp().run(f=args.fill, r=args.report, o=args.open)
+    DBManagerApp().run(
+        f=args.fill,
+        r=args.report,
+        o=args.open,
+        p=args.profile,
+        s=args.stream,
+        e=args.export,
+        a=args.append,
+    )
@@ -0,0 +1,76 @@
+ALTER TABLE game_categories
+ADD CONSTRAINT UC_game_categories_game_category UNIQUE (game_category);
+ALTER TABLE game_types
+ADD CONSTRAINT UC_game_types_game_type UNIQUE (game_type);
+ALTER TABLE games
+ADD CONSTRAINT UC_games_title UNIQUE (title);
+ALTER TABLE maintenance_expenses
+ADD CONSTRAINT UC_maintenance_expenses_payment_id UNIQUE (payment_id);
+ALTER TABLE expense_titles
+ADD CONSTRAINT UC_expense_titles_title UNIQUE (title);
+ALTER TABLE expense_types
+ADD CONSTRAINT UC_expense_types_expenses_type UNIQUE (expenses_type);
+ALTER TABLE participations
+ADD CONSTRAINT UC_participations_fee_payment_id UNIQUE (fee_payment_id);
+ALTER TABLE participations
+ADD CONSTRAINT UC_participation UNIQUE (tournament_id, customer_id);
+ALTER TABLE rental
+ADD CONSTRAINT UC_rental_payment_id UNIQUE (payment_id);
+ALTER TABLE rental
+ADD CONSTRAINT UC_rental UNIQUE (inventory_id, rental_date);
+ALTER TABLE sales
+ADD CONSTRAINT UC_sales_payment_id UNIQUE (payment_id);
+ALTER TABLE games
+ADD CONSTRAINT FK_game_categories_TO_games FOREIGN KEY (category_id) REFERENCES game_categories (category_id);
+ALTER TABLE staff
+ADD CONSTRAINT FK_city_TO_staff FOREIGN KEY (city_id) REFERENCES city (city_id);
+ALTER TABLE customers
+ADD CONSTRAINT FK_city_TO_customers FOREIGN KEY (city_id) REFERENCES city (city_id);
+ALTER TABLE participations
+ADD CONSTRAINT FK_customers_TO_participations FOREIGN KEY (customer_id) REFERENCES customers (customer_id);
+ALTER TABLE tournaments
+ADD CONSTRAINT FK_games_TO_tournaments FOREIGN KEY (game_id) REFERENCES games (game_id);
+ALTER TABLE participations
+ADD CONSTRAINT FK_tournaments_TO_participations FOREIGN KEY (tournament_id) REFERENCES tournaments (tournament_id);
+ALTER TABLE inventory
+ADD CONSTRAINT FK_games_TO_inventory FOREIGN KEY (game_id) REFERENCES games (game_id);
+ALTER TABLE games
+ADD CONSTRAINT FK_game_types_TO_games FOREIGN KEY (type_id) REFERENCES game_types (type_id);
+ALTER TABLE rental
+ADD CONSTRAINT FK_inventory_TO_rental FOREIGN KEY (inventory_id) REFERENCES inventory (inventory_id);
+ALTER TABLE rental
+ADD CONSTRAINT FK_customers_TO_rental FOREIGN KEY (customer_id) REFERENCES customers (customer_id);
+ALTER TABLE sales
+ADD CONSTRAINT FK_inventory_TO_sales FOREIGN KEY (inventory_id) REFERENCES inventory (inventory_id);
+ALTER TABLE inventory
+ADD CONSTRAINT FK_game_prices_TO_inventory FOREIGN KEY (price_id) REFERENCES game_prices (price_id);
+ALTER TABLE relationships
+ADD CONSTRAINT FK_staff_TO_relationships FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
+ALTER TABLE relationships
+ADD CONSTRAINT FK_partners_TO_relationships FOREIGN KEY (partner_id) REFERENCES partners (partner_id);
+ALTER TABLE rental
+ADD CONSTRAINT FK_staff_TO_rental FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
+ALTER TABLE sales
+ADD CONSTRAINT FK_staff_TO_sales FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
+ALTER TABLE tournaments
+ADD CONSTRAINT FK_staff_TO_tournaments FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
+ALTER TABLE inventory
+ADD CONSTRAINT FK_payments_TO_inventory FOREIGN KEY (purchase_payment_id) REFERENCES payments (payment_id);
+ALTER TABLE tournaments
+ADD CONSTRAINT FK_payments_TO_tournaments FOREIGN KEY (expenses_payments_id) REFERENCES payments (payment_id);
+ALTER TABLE sales
+ADD CONSTRAINT FK_payments_TO_sales FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
+ALTER TABLE rental
+ADD CONSTRAINT FK_payments_TO_rental FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
+ALTER TABLE participations
+ADD CONSTRAINT FK_payments_TO_participations FOREIGN KEY (fee_payment_id) REFERENCES payments (payment_id);
+ALTER TABLE maintenance_expenses
+ADD CONSTRAINT FK_payments_TO_maintenance_expenses FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
+ALTER TABLE rental
+ADD CONSTRAINT FK_payments_TO_rental1 FOREIGN KEY (penalty_payment_id) REFERENCES payments (payment_id);
+ALTER TABLE payments
+ADD CONSTRAINT FK_invoices_TO_payments FOREIGN KEY (invoice_id) REFERENCES invoices (invoice_id);
+ALTER TABLE maintenance_expenses
+ADD CONSTRAINT FK_expense_titles_TO_maintenance_expenses FOREIGN KEY (title_id) REFERENCES expense_titles (title_id);
+ALTER TABLE expense_titles
+ADD CONSTRAINT FK_expense_types_TO_expense_titles FOREIGN KEY (expenses_type_id) REFERENCES expense_types (expenses_type_id);
\ No newline at end of file
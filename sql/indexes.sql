@@ -0,0 +1,12 @@
+-- employees_ranking, weekly_traffic
+CREATE INDEX IX_sales_ranking ON sales (return_oper, staff_id, date, sale_id);
+-- top_saled_games, game_category_ranking
+CREATE INDEX IX_sales_inventory ON sales (inventory_id, payment_id, return_oper, sale_id);
+-- top_rented_games, game_category_ranking
+CREATE INDEX IX_rental_inventory ON rental (inventory_id, payment_id, rental_id);
+-- top_players
+CREATE INDEX IX_participations_places ON participations (tournament_id, customer_id, place);
+-- bw_revenue_months, monthly_balance
+CREATE INDEX IX_payments_invoice ON payments (invoice_id, amount);
+-- monthly_balance
+CREATE INDEX IX_invoices_date ON invoices (date, invoice_id);
\ No newline at end of file
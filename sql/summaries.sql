@@ -0,0 +1,33 @@
+-- report views stored as tables, refreshed after every load
+DROP TABLE IF EXISTS mv_best_employees;
+CREATE TABLE mv_best_employees AS
+SELECT *
+FROM best_employees;
+DROP TABLE IF EXISTS mv_top_players;
+CREATE TABLE mv_top_players AS
+SELECT *
+FROM top_players;
+DROP TABLE IF EXISTS mv_top_saled_games;
+CREATE TABLE mv_top_saled_games AS
+SELECT *
+FROM top_saled_games;
+DROP TABLE IF EXISTS mv_top_rented_games;
+CREATE TABLE mv_top_rented_games AS
+SELECT *
+FROM top_rented_games;
+DROP TABLE IF EXISTS mv_game_category_ranking;
+CREATE TABLE mv_game_category_ranking AS
+SELECT *
+FROM game_category_ranking;
+DROP TABLE IF EXISTS mv_bw_revenue_months;
+CREATE TABLE mv_bw_revenue_months AS
+SELECT *
+FROM bw_revenue_months;
+DROP TABLE IF EXISTS mv_weekly_traffic;
+CREATE TABLE mv_weekly_traffic AS
+SELECT *
+FROM weekly_traffic;
+DROP TABLE IF EXISTS mv_sales_n_dates;
+CREATE TABLE mv_sales_n_dates AS
+SELECT *
+FROM sales_n_dates;
\ No newline at end of file
@@ -16,7 +16,7 @@ CREATE TABLE customers (
 );
 CREATE TABLE game_categories (
   category_id INT NOT NULL AUTO_INCREMENT,
-  game_category VARCHAR(40) NOT NULL UNIQUE,
+  game_category VARCHAR(40) NOT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (category_id)
 );
@@ -28,13 +28,13 @@ CREATE TABLE game_prices (
 );
 CREATE TABLE game_types (
   type_id INT NOT NULL AUTO_INCREMENT,
-  game_type VARCHAR(40) NOT NULL UNIQUE,
+  game_type VARCHAR(40) NOT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (type_id)
 );
 CREATE TABLE games (
   game_id INT NOT NULL AUTO_INCREMENT,
-  title VARCHAR(255) NOT NULL UNIQUE,
+  title VARCHAR(255) NOT NULL,
   description TEXT NULL,
   category_id INT NOT NULL,
   type_id INT NOT NULL,
@@ -56,21 +56,21 @@ CREATE TABLE inventory (
 CREATE TABLE maintenance_expenses (
   spend_id INT NOT NULL AUTO_INCREMENT,
   title_id INT NOT NULL,
-  payment_id INT NOT NULL UNIQUE,
+  payment_id INT NOT NULL,
   date TIMESTAMP NOT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (spend_id)
 );
 CREATE TABLE expense_titles (
   title_id INT NOT NULL AUTO_INCREMENT,
-  title VARCHAR(200) NOT NULL UNIQUE,
+  title VARCHAR(200) NOT NULL,
   expenses_type_id INT NOT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (title_id)
 );
 CREATE TABLE expense_types (
   expenses_type_id INT NOT NULL AUTO_INCREMENT,
-  expenses_type VARCHAR(40) NOT NULL UNIQUE,
+  expenses_type VARCHAR(40) NOT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (expenses_type_id)
 );
@@ -80,10 +80,9 @@ CREATE TABLE participations (
   customer_id INT NOT NULL,
   place INT NOT NULL,
   sign_up_date TIMESTAMP NOT NULL,
-  fee_payment_id INT NOT NULL UNIQUE,
+  fee_payment_id INT NOT NULL,
   updated_at TIMESTAMP NOT NULL,
-  PRIMARY KEY (particip_id),
-  CONSTRAINT UC_participation UNIQUE (tournament_id, customer_id)
+  PRIMARY KEY (particip_id)
 );
 CREATE TABLE partners (
   partner_id INT NOT NULL AUTO_INCREMENT,
@@ -120,18 +119,17 @@ CREATE TABLE rental (
   rental_date TIMESTAMP NOT NULL,
   return_date TIMESTAMP NULL,
   staff_id INT NOT NULL,
-  payment_id INT NOT NULL UNIQUE,
+  payment_id INT NOT NULL,
   penalty_payment_id INT NULL,
   rate INT NULL,
   updated_at TIMESTAMP NOT NULL,
-  PRIMARY KEY (rental_id),
-  CONSTRAINT UC_rental UNIQUE (inventory_id, rental_date)
+  PRIMARY KEY (rental_id)
 );
 CREATE TABLE sales (
   sale_id INT NOT NULL AUTO_INCREMENT,
   inventory_id INT NOT NULL,
   staff_id INT NOT NULL,
-  payment_id INT NOT NULL UNIQUE,
+  payment_id INT NOT NULL,
   date TIMESTAMP NOT NULL,
   return_oper BOOLEAN NOT NULL DEFAULT FALSE,
   updated_at TIMESTAMP NOT NULL,
@@ -164,58 +162,4 @@ CREATE TABLE tournaments (
   expenses_payments_id INT NULL,
   updated_at TIMESTAMP NOT NULL,
   PRIMARY KEY (tournament_id)
-);
-ALTER TABLE games
-ADD CONSTRAINT FK_game_categories_TO_games FOREIGN KEY (category_id) REFERENCES game_categories (category_id);
-ALTER TABLE staff
-ADD CONSTRAINT FK_city_TO_staff FOREIGN KEY (city_id) REFERENCES city (city_id);
-ALTER TABLE customers
-ADD CONSTRAINT FK_city_TO_customers FOREIGN KEY (city_id) REFERENCES city (city_id);
-ALTER TABLE participations
-ADD CONSTRAINT FK_customers_TO_participations FOREIGN KEY (customer_id) REFERENCES customers (customer_id);
-ALTER TABLE tournaments
-ADD CONSTRAINT FK_games_TO_tournaments FOREIGN KEY (game_id) REFERENCES games (game_id);
-ALTER TABLE participations
-ADD CONSTRAINT FK_tournaments_TO_participations FOREIGN KEY (tournament_id) REFERENCES tournaments (tournament_id);
-ALTER TABLE inventory
-ADD CONSTRAINT FK_games_TO_inventory FOREIGN KEY (game_id) REFERENCES games (game_id);
-ALTER TABLE games
-ADD CONSTRAINT FK_game_types_TO_games FOREIGN KEY (type_id) REFERENCES game_types (type_id);
-ALTER TABLE rental
-ADD CONSTRAINT FK_inventory_TO_rental FOREIGN KEY (inventory_id) REFERENCES inventory (inventory_id);
-ALTER TABLE rental
-ADD CONSTRAINT FK_customers_TO_rental FOREIGN KEY (customer_id) REFERENCES customers (customer_id);
-ALTER TABLE sales
-ADD CONSTRAINT FK_inventory_TO_sales FOREIGN KEY (inventory_id) REFERENCES inventory (inventory_id);
-ALTER TABLE inventory
-ADD CONSTRAINT FK_game_prices_TO_inventory FOREIGN KEY (price_id) REFERENCES game_prices (price_id);
-ALTER TABLE relationships
-ADD CONSTRAINT FK_staff_TO_relationships FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
-ALTER TABLE relationships
-ADD CONSTRAINT FK_partners_TO_relationships FOREIGN KEY (partner_id) REFERENCES partners (partner_id);
-ALTER TABLE rental
-ADD CONSTRAINT FK_staff_TO_rental FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
-ALTER TABLE sales
-ADD CONSTRAINT FK_staff_TO_sales FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
-ALTER TABLE tournaments
-ADD CONSTRAINT FK_staff_TO_tournaments FOREIGN KEY (staff_id) REFERENCES staff (staff_id);
-ALTER TABLE inventory
-ADD CONSTRAINT FK_payments_TO_inventory FOREIGN KEY (purchase_payment_id) REFERENCES payments (payment_id);
-ALTER TABLE tournaments
-ADD CONSTRAINT FK_payments_TO_tournaments FOREIGN KEY (expenses_payments_id) REFERENCES payments (payment_id);
-ALTER TABLE sales
-ADD CONSTRAINT FK_payments_TO_sales FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
-ALTER TABLE rental
-ADD CONSTRAINT FK_payments_TO_rental FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
-ALTER TABLE participations
-ADD CONSTRAINT FK_payments_TO_participations FOREIGN KEY (fee_payment_id) REFERENCES payments (payment_id);
-ALTER TABLE maintenance_expenses
-ADD CONSTRAINT FK_payments_TO_maintenance_expenses FOREIGN KEY (payment_id) REFERENCES payments (payment_id);
-ALTER TABLE rental
-ADD CONSTRAINT FK_payments_TO_rental1 FOREIGN KEY (penalty_payment_id) REFERENCES payments (payment_id);
-ALTER TABLE payments
-ADD CONSTRAINT FK_invoices_TO_payments FOREIGN KEY (invoice_id) REFERENCES invoices (invoice_id);
-ALTER TABLE maintenance_expenses
-ADD CONSTRAINT FK_expense_titles_TO_maintenance_expenses FOREIGN KEY (title_id) REFERENCES expense_titles (title_id);
-ALTER TABLE expense_titles
-ADD CONSTRAINT FK_expense_types_TO_expense_titles FOREIGN KEY (expenses_type_id) REFERENCES expense_types (expenses_type_id);
\ No newline at end of file
+);
\ No newline at end of file
@@ -34,7 +34,7 @@ ORDER BY YEAR(sa.date) DESC,
 CREATE VIEW best_employees AS
 SELECT year,
     month,
-    CONCAT_WS(" ", first_name, last_name) employee,
+    CONCAT_WS(' ', first_name, last_name) employee,
     number_of_sales
 FROM employees_ranking
 WHERE rank = 1
@@ -62,7 +62,7 @@ FROM (
                         PARTITION BY g.title,
                         c.customer_id
                     ) AS avg_score,
-                    CONCAT_WS(" ", c.first_name, c.last_name) player
+                    CONCAT_WS(' ', c.first_name, c.last_name) player
                 FROM customers c
                     RIGHT JOIN (
                         SELECT customer_id,
@@ -75,7 +75,7 @@ FROM (
                     RIGHT JOIN tournaments t USING(tournament_id)
                     LEFT JOIN games g USING(game_id)
                 WHERE g.title IS NOT NULL
-                    AND CONCAT_WS(" ", c.first_name, c.last_name) IS NOT NULL
+                    AND CONCAT_WS(' ', c.first_name, c.last_name) IS NOT NULL
             ) subsub
     ) sub
 WHERE group_rank <= 10
@@ -118,7 +118,7 @@ ORDER BY COUNT(DISTINCT r.rental_id) + COUNT(DISTINCT s.sale_id) DESC;
 -- q 4.2
 CREATE VIEW bw_revenue_months AS (
     SELECT (
-            SELECT "maximal"
+            SELECT 'maximal'
         ) record_type,
         YEAR(i.date) year,
         MONTH(i.date) month,
@@ -134,7 +134,7 @@ CREATE VIEW bw_revenue_months AS (
 UNION ALL
 (
     SELECT (
-            SELECT "minimal"
+            SELECT 'minimal'
         ) record_type,
         YEAR(i.date) year,
         MONTH(i.date) month,
@@ -162,11 +162,11 @@ SELECT rr.employee,
     COUNT(DISTINCT sa.sale_id) sales_number
 FROM (
         SELECT st.staff_id,
-            CONCAT_WS(" ", st.first_name, st.last_name) employee,
+            CONCAT_WS(' ', st.first_name, st.last_name) employee,
             SUM(r.dates_number) dates_number --
         FROM staff st
             LEFT JOIN relationships r USING(staff_id)
-        GROUP BY CONCAT_WS(" ", st.first_name, st.last_name)
+        GROUP BY CONCAT_WS(' ', st.first_name, st.last_name)
     ) rr
     LEFT JOIN sales sa USING(staff_id)
 WHERE sa.return_oper IS FALSE
@@ -5,7 +5,8 @@ from getpass import getpass
 
 from colorlog import ColoredFormatter
 
-from src import connection, drandom, fillup, reader, report
+from src import connection, drandom, export, fillup, reader, report
+from src.profiling import profiler
 
 
 class NoActionsError(Exception):
@@ -14,6 +15,12 @@ class NoActionsError(Exception):
     ...
 
 
+class ConflictingActionsError(Exception):
+    """When the options selected by the user cannot be performed together."""
+
+    ...
+
+
 class DBManagerApp:
     """Main database manager app."""
 
@@ -35,18 +42,29 @@ class DBManagerApp:
 
     @staticmethod
     def _establish_connection() -> connection.DBConnector:
-        """Ask for the password and establish the connection.
+        """Ask for the password, if the database needs it, and establish the connection.
         Inform the user about the success.
 
         Returns:
             DBConnector: A database connector object.
         """
-        password = getpass("Enter the connection password:")
+        backend = connection.DBConnector.read_settings()["backend"]
+        password = None
+        if connection.BACKENDS[backend].password_required:
+            password = getpass("Enter the connection password:")
         db_connector = connection.DBConnector(password)
         return db_connector
     
 
-    def _run(self, f: bool, r: bool, o: bool) -> None:
+    def _run(
+        self,
+        f: bool,
+        r: bool,
+        o: bool,
+        s: bool = False,
+        e: str = None,
+        a: bool = False,
+    ) -> None:
         """With the options provided establish the connection if needed,
         then check if any of the options was selected and perform the
         operations selected by the user.
@@ -55,25 +73,59 @@ class DBManagerApp:
             f (bool): New database fill-up flag.
             r (bool): New report generation flag.
             o (bool): Open report flag.
+            s (bool): Streamed fill-up flag. Defaults to False.
+            e (str): Export format. Defaults to None (no export).
+            a (bool): Append fill-up flag. Defaults to False.
 
         Raises:
             NoActionsError: If none of the options is selected.
+            ConflictingActionsError: If the options cannot be performed together.
         """
+        if s and not f:
+            raise ConflictingActionsError(
+                "Streaming (-s) works only with the fill-up (-f)"
+            )
+        if s and e:
+            raise ConflictingActionsError(
+                "Streamed data (-s) is not kept, so it cannot be exported (-e)"
+            )
+        if a and f:
+            raise ConflictingActionsError(
+                "Appending (-a) keeps the database, so it excludes the fill-up (-f)"
+            )
         # connection
-        if any([f, r]):
+        if any([f, r, a]):
             db_connector = self._establish_connection()
-        if not any([f, r, o]):
+        if not any([f, r, o, e, a]):
             raise NoActionsError("No actions selected")
         # actions
-        if f:
+        data = None
+        if e or (f and not s):
             data = drandom.generate_data()
+        if e:
+            export.export(data, e)
+        if f and s:
+            fillup.push_stream(drandom.stream_data(), db_connector)
+        elif f:
             fillup.push(data, db_connector)
+        elif a:
+            state = fillup.read_state(db_connector)
+            fillup.append(*drandom.continue_data(state), db_connector)
         if r:
             report.generate(db_connector)
         if o:
             reader.open_report()
 
-    def run(self, f: bool, r: bool, o: bool):
+    def run(
+        self,
+        f: bool,
+        r: bool,
+        o: bool,
+        p: bool = False,
+        s: bool = False,
+        e: str = None,
+        a: bool = False,
+    ):
         """Set up the app (the logger), launch it with the given options
         and handle the errors by logging them the right way (and stopping the execution).
 
@@ -85,12 +137,23 @@ class DBManagerApp:
             f (bool): New database fill-up flag.
             r (bool): New report generation flag.
             o (bool): Open report flag.
+            p (bool): Profiling flag. Defaults to False.
+            s (bool): Streamed fill-up flag. Defaults to False.
+            e (str): Export format. Defaults to None (no export).
+            a (bool): Append fill-up flag. Defaults to False.
 
         """
         self._log_setup()
+        if p:
+            profiler.enable()
         try:
-            self._run(f, r, o)
-        except (connection.SQLError, NoActionsError, report.AssetsMissingError) as err:
+            self._run(f, r, o, s, e, a)
+        except (
+            connection.SQLError,
+            NoActionsError,
+            ConflictingActionsError,
+            report.AssetsMissingError,
+        ) as err:
             logging.error(err)
         except reader.ReportOpenError as err:
             logging.warning(err)
@@ -98,4 +161,6 @@ class DBManagerApp:
             logging.fatal(
                 f"Some important files are missing: The structure is explained in `doc`.\n{err}"
             )
+        if profiler.records:
+            logging.info(f"Run profile has been saved in '{profiler.save()}'.")
         print("All the steps have been completed successfully.")
@@ -0,0 +1,256 @@
+"""Database engines the app can work with and their SQL dialects."""
+
+import datetime
+import re
+import sqlite3
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from mysql.connector import connect
+from mysql.connector.errors import ProgrammingError
+
+DAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+
+class MySQLBackend:
+    """The remote MySQL server the SQL files are written for.
+
+    Attributes:
+        errors: Errors of the statement execution.
+        placeholder: Parameter marker of the prepared statements.
+        password_required: Whether the connection needs a password.
+        parallel_writes: Whether the tables can be loaded on many connections at once.
+        local_infile: Whether the LOAD DATA LOCAL INFILE statement is available.
+        in_process: Whether the database runs inside the app process,
+            so that no statement is sent over the network.
+    """
+
+    errors = (ProgrammingError,)
+    placeholder = "%s"
+    password_required = True
+    parallel_writes = True
+    local_infile = True
+    in_process = False
+
+    @staticmethod
+    def connect(settings: dict) -> Any:
+        """Open a new connection.
+
+        Args:
+            settings (dict): A connection configuration dictionary.
+
+        Returns:
+            Any: A connection object.
+        """
+        return connect(
+            **{
+                key: value
+                for key, value in settings.items()
+                if key not in ("backend", "sqlite_file")
+            }
+        )
+
+    @staticmethod
+    def foreign_key_checks(enabled: bool) -> str:
+        """Get the statement switching the foreign key checks.
+
+        Args:
+            enabled (bool): Whether the checks are switched on.
+
+        Returns:
+            str: A statement.
+        """
+        return f"SET FOREIGN_KEY_CHECKS={int(enabled)};"
+
+    @staticmethod
+    def list_objects(q_type: str, db_name: str) -> str:
+        """Get the query for the names of all the objects of a given type.
+
+        Args:
+            q_type (str): Type of the objects (tables, views).
+            db_name (str): A database name.
+
+        Returns:
+            str: A query.
+        """
+        return f"""SELECT table_name
+                    FROM information_schema.{q_type}
+                    WHERE table_schema = '{db_name}';"""
+
+    @staticmethod
+    def translate(statement: str) -> str:
+        """Adapt the statement from the SQL files to the dialect.
+
+        Args:
+            statement (str): A statement in MySQL.
+
+        Returns:
+            str: The same statement.
+        """
+        return statement
+
+    @staticmethod
+    def explain(crsr: Any, query: str) -> set:
+        """Find the indexes in the execution plan of the query.
+
+        Args:
+            crsr (Any): A cursor object.
+            query (str): A query.
+
+        Returns:
+            set: Names of the used indexes.
+        """
+        crsr.execute(f"EXPLAIN {query}")
+        colnames = [col for col, *info in crsr.description]
+        keys = [row[colnames.index("key")] for row in crsr.fetchall()]
+        return {index for key in keys if key for index in key.split(",")}
+
+
+def _null_safe(fun: callable) -> callable:
+    # sql functions give null for null arguments
+    def wrapper(*args):
+        if any(arg is None for arg in args):
+            return None
+        return fun(*args)
+
+    return wrapper
+
+
+def _concat_ws(separator: str, *args) -> str:
+    if separator is None:
+        return None
+    return separator.join(str(arg) for arg in args if arg is not None)
+
+
+def _makedate(year: int, day_of_year: int) -> str:
+    if day_of_year < 1:
+        return None
+    date = datetime.date(year, 1, 1) + datetime.timedelta(days=day_of_year - 1)
+    return date.isoformat()
+
+
+def _to_text(timestamp: pd.Timestamp) -> str:
+    return timestamp.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# the values of the data frame cells, registered once for all the connections
+for _value_type, _adapter in [
+    (pd.Timestamp, _to_text),
+    (datetime.datetime, _to_text),
+    (np.int64, int),
+    (np.float64, float),
+    (np.bool_, int),
+]:
+    sqlite3.register_adapter(_value_type, _adapter)
+
+
+class SQLiteBackend(MySQLBackend):
+    """An embedded database in a local file, with no server needed. The MySQL
+    functions used by the views are added as user functions, the dates are kept
+    as `YYYY-MM-DD HH:MM:SS` texts and the foreign keys become plain indexes
+    (as MySQL creates them for the foreign keys).
+    """
+
+    errors = (sqlite3.OperationalError, sqlite3.ProgrammingError)
+    placeholder = "?"
+    password_required = False
+    parallel_writes = False
+    local_infile = False
+    in_process = True
+
+    @staticmethod
+    def connect(settings: dict) -> sqlite3.Connection:
+        """Open the database file, creating it if needed, and register
+        the MySQL functions.
+
+        Args:
+            settings (dict): A connection configuration dictionary.
+
+        Returns:
+            sqlite3.Connection: A connection object.
+        """
+        conn = sqlite3.connect(settings["sqlite_file"])
+        functions = {
+            "YEAR": (1, lambda date: int(date[:4])),
+            "MONTH": (1, lambda date: int(date[5:7])),
+            "DAYNAME": (
+                1,
+                lambda date: DAY_NAMES[
+                    datetime.date.fromisoformat(date[:10]).weekday()
+                ],
+            ),
+            "WEEKDAY": (
+                1,
+                lambda date: datetime.date.fromisoformat(date[:10]).weekday(),
+            ),
+            "MAKEDATE": (2, _makedate),
+        }
+        for name, (n_args, fun) in functions.items():
+            conn.create_function(name, n_args, _null_safe(fun), deterministic=True)
+        conn.create_function("CONCAT_WS", -1, _concat_ws, deterministic=True)
+        return conn
+
+    @staticmethod
+    def foreign_key_checks(enabled: bool) -> str:
+        return f"PRAGMA foreign_keys={'ON' if enabled else 'OFF'};"
+
+    @staticmethod
+    def list_objects(q_type: str, db_name: str) -> str:
+        return f"""SELECT name
+                    FROM sqlite_master
+                    WHERE type = '{q_type[:-1]}' AND name NOT LIKE 'sqlite_%';"""
+
+    @staticmethod
+    def translate(statement: str) -> str:
+        """Adapt the statement from the SQL files to the dialect.
+        Constraints cannot be added to the existing tables, so the unique ones
+        become unique indexes and for the foreign keys only the indexes
+        of their columns are created, which the views rely on.
+
+        Args:
+            statement (str): A statement in MySQL.
+
+        Returns:
+            str: The statement in SQLite.
+        """
+        statement = re.sub(
+            r"ALTER TABLE (\w+)\s+ADD CONSTRAINT (\w+) FOREIGN KEY (\([^)]*\)).*",
+            r"CREATE INDEX \2 ON \1 \3",
+            statement,
+            flags=re.DOTALL,
+        )
+        statement = re.sub(
+            r"ALTER TABLE (\w+)\s+ADD CONSTRAINT (\w+) UNIQUE (\([^)]*\))",
+            r"CREATE UNIQUE INDEX \2 ON \1 \3",
+            statement,
+        )
+        statement = statement.replace(" AUTO_INCREMENT", "")
+        statement = re.sub(r" COMMENT '[^']*'", "", statement)
+        statement = statement.replace("CREATE OR REPLACE VIEW", "CREATE VIEW")
+        # parenthesized parts of a compound query
+        statement = re.sub(r"(CREATE VIEW \w+ AS) \(", r"\1 SELECT * FROM (", statement)
+        statement = re.sub(
+            r"\)\s*UNION ALL\s*\(", ") UNION ALL SELECT * FROM (", statement
+        )
+        return statement
+
+    @staticmethod
+    def explain(crsr: sqlite3.Cursor, query: str) -> set:
+        crsr.execute(f"EXPLAIN QUERY PLAN {query}")
+        return {
+            match.group(1)
+            for *info, detail in crsr.fetchall()
+            for match in re.finditer(r"USING (?:COVERING )?INDEX (\w+)", detail)
+        }
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
@@ -0,0 +1,124 @@
+"""On-disk cache of the generated data sets."""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+
+# settings that do not change the generated values
+VOLATILE_SETTINGS = ("cache", "pipeline_workers")
+# modules deciding about the generated values
+GENERATOR_SOURCES = ("src/drandom.py", "src/randutils.py")
+
+
+class SnapshotCache:
+    """Cache of the generated data sets, one directory of Feather files per set.
+    The sets are identified by a hash of everything the generation depends on,
+    and the least recently used ones are removed once the cache grows too big.
+
+    Attributes:
+        directory: Path of the cache directory.
+        max_size: Maximal total size of the cached sets in bytes.
+
+    Args:
+        config (dict): The random settings, including the `cache` section.
+    """
+
+    def __init__(self, config: dict) -> None:
+        self.directory = Path(config["cache"]["directory"])
+        self.max_size = config["cache"]["max_size_mb"] * 1024**2
+
+    @staticmethod
+    def key(config: dict, seed: int) -> str:
+        """Hash the settings, the prompt tables, the seed, the generator code
+        and the current date (the data set ends today).
+
+        Args:
+            config (dict): The random settings.
+            seed (int): The random seed.
+
+        Returns:
+            str: A hex digest identifying the data set.
+        """
+        digest = hashlib.sha256()
+        settings = {
+            name: value
+            for name, value in config.items()
+            if name not in VOLATILE_SETTINGS
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update(str(seed).encode())
+        digest.update(datetime.date.today().isoformat().encode())
+        digest.update(f"{np.__version__} {pd.__version__}".encode())
+        paths = [Path(source) for source in GENERATOR_SOURCES]
+        paths += sorted(Path("config/prompts").glob("*.csv"))
+        for path in paths:
+            digest.update(path.as_posix().encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def load(self, key: str) -> dict:
+        """Read the cached data set and mark it as recently used.
+        The frames own their data, as the generated ones do, so the files
+        are read whole instead of being memory-mapped.
+
+        Args:
+            key (str): Data set identifier.
+
+        Returns:
+            dict: A dictionary of table names and the data frames
+                or None if the set is not cached.
+        """
+        set_dir = self.directory / key
+        if not (set_dir / "tables.json").exists():
+            return None
+        with open(set_dir / "tables.json", "r") as f:
+            tables = json.load(f)
+        data = {
+            table: feather.read_feather(set_dir / f"{table}.feather")
+            for table in tables
+        }
+        os.utime(set_dir)
+        return data
+
+    def save(self, key: str, data: dict) -> None:
+        """Write the data set as uncompressed Feather files, read back without
+        any decoding, and evict the least recently used sets.
+
+        Args:
+            key (str): Data set identifier.
+            data (dict): A dictionary of table names and the data frames.
+        """
+        set_dir = self.directory / key
+        set_dir.mkdir(parents=True, exist_ok=True)
+        for table, df in data.items():
+            feather.write_feather(
+                df.reset_index(drop=True),
+                set_dir / f"{table}.feather",
+                compression="uncompressed",
+            )
+        # written last, so that an interrupted save is not taken as a hit
+        with open(set_dir / "tables.json", "w") as f:
+            json.dump(list(data), f, indent=4)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used data sets until the cache fits its size."""
+        sets = [path for path in self.directory.iterdir() if path.is_dir()]
+        sizes = {
+            path: sum(file.stat().st_size for file in path.iterdir()) for path in sets
+        }
+        total_size = sum(sizes.values())
+        for path in sorted(sets, key=lambda path: path.stat().st_mtime):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(path)
+            total_size -= sizes[path]
+            logging.debug(f"Cached data set '{path.name}' has been evicted.")
@@ -4,11 +4,13 @@ import json
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from pathlib import Path
+from queue import Queue
 from typing import Any, Generator, Union
 
-from mysql.connector import connect
+from mysql.connector.abstracts import MySQLConnectionAbstract
 from mysql.connector.cursor import MySQLCursor
-from mysql.connector.errors import ProgrammingError
+
+from src.backends import BACKENDS
 
 class SQLError(Exception):
     """An error related to connection, statement execution etc."""
@@ -25,21 +27,33 @@ class DBConnector:
     Attributes:
         conn: A connection object.
         connection_settings: A connection configuration dictionary.
+        backend: The database engine selected in the connection configuration file.
 
     Args:
         password: A password for the database and user given in the connection configuration file.
+            Not needed by the embedded backend. Defaults to None.
     """
 
-    def __init__(self, password: str) -> None:
+    def __init__(self, password: str = None) -> None:
         self.conn = None
-        with open(Path("config/database.connection.json"), "r") as f:
-            self.connection_settings = json.load(f)
-            self.connection_settings["password"] = password
+        self.connection_settings = self.read_settings()
+        self.connection_settings["password"] = password
+        self.backend = BACKENDS[self.connection_settings["backend"]]
         try:
-            self.conn = connect(**self.connection_settings)
-        except ProgrammingError as err:
+            self.conn = self.backend.connect(self.connection_settings)
+        except self.backend.errors as err:
             raise SQLError(f"DB Architect could not estabilish a connection:\n {err}.")
 
+    @staticmethod
+    def read_settings() -> dict:
+        """Read the connection configuration file.
+
+        Returns:
+            dict: A connection configuration dictionary.
+        """
+        with open(Path("config/database.connection.json"), "r") as f:
+            return json.load(f)
+
     @property
     def db_name(self) -> Union[str, None]:
         """Get the name of database the object is connected to.
@@ -58,6 +72,68 @@ class DBConnector:
             self.conn.close()
 
 
+class DBConnectionPool:
+    """A fixed set of additional connections, opened with the settings of a connector,
+    which can be borrowed by the parallel workers. Every session starts
+    with the foreign key checks disabled. Nothing is committed until
+    the `commit` method is called.
+
+    A SQLError is raised in case of initial connecting issues.
+
+    Attributes:
+        connections: All the pool connection objects.
+
+    Args:
+        db_connector (DBConnector): A custom data base connector.
+        size (int): A number of connections.
+    """
+
+    def __init__(self, db_connector: DBConnector, size: int) -> None:
+        self.connections = []
+        self._idle = Queue()
+        try:
+            for _ in range(size):
+                conn = db_connector.backend.connect(db_connector.connection_settings)
+                crsr = conn.cursor()
+                crsr.execute(db_connector.backend.foreign_key_checks(False))
+                crsr.close()
+                self.connections.append(conn)
+                self._idle.put(conn)
+        except db_connector.backend.errors as err:
+            self.close()
+            raise SQLError(
+                f"Connection pool could not estabilish a connection:\n {err}."
+            )
+
+    @contextmanager
+    def connection(self) -> Generator[MySQLConnectionAbstract, Any, None]:
+        """Context to borrow an idle connection and give it back afterwards.
+        Wait if all of them are busy.
+
+        Yields:
+            Generator[MySQLConnectionAbstract, Any, None]: A connection.
+        """
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def commit(self) -> None:
+        """Commit the transactions of all the connections, one after another.
+        It is not atomic: if a commit fails, the connections committed before
+        keep their changes and the remaining ones are rolled back on closing.
+        """
+        for conn in self.connections:
+            conn.commit()
+
+    def close(self) -> None:
+        """Close all the connections. Uncommitted changes are rolled back."""
+        for conn in self.connections:
+            conn.close()
+        self.connections = []
+
+
 class DBEngineer(ABC):
     """Abstract worker, exectuting operations on databases.
 
@@ -72,23 +148,29 @@ class DBEngineer(ABC):
         self.db_connector = db_connector
 
     @contextmanager
-    def cursor(self, commit: bool = False) -> Generator[MySQLCursor, Any, None]:
+    def cursor(
+        self, commit: bool = False, conn: MySQLConnectionAbstract = None
+    ) -> Generator[MySQLCursor, Any, None]:
         """Context to safely use the cursor, and close it after completing the operations.
         It can additionally do the commit action.
 
         Args:
             commit (bool, optional): If the commit action is expected. Defaults to False.
+            conn (MySQLConnectionAbstract, optional): A connection to be used instead
+                of the main one, e.g. from a pool. Defaults to None.
 
         Yields:
             Generator[MySQLCursor, Any, None]: A cursor.
         """
-        crsr = self.db_connector.conn.cursor()
+        if conn is None:
+            conn = self.db_connector.conn
+        crsr = conn.cursor()
         try:
             yield crsr
         finally:
             crsr.close()
             if commit:
-                self.db_connector.conn.commit()
+                conn.commit()
 
     @abstractmethod
     def run(self) -> None:
@@ -1,17 +1,42 @@
 """Random data generation pipeline and export."""
 
 import datetime
-import itertools
+import functools
 import json
 import logging
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
+from typing import Iterator
 
 import holidays
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
-from src.randutils import RandomHelpers
+from src.cache import SnapshotCache
+from src.profiling import profiler
+from src.randutils import RandomHelpers, RemapIndex
+from src.scheduler import StepScheduler, step
+
+
+def seeded(fun: callable) -> callable:
+    """Decorate the generation step to pass it its own random generator.
+    The stream is derived from the generator seed and the step name only,
+    so the step draws the same values no matter when it is called.
+
+    Args:
+        fun (callable): Generation step taking the random generator.
+
+    Returns:
+        callable: A decorated function.
+    """
+
+    @functools.wraps(fun)
+    def wrapper(self, *args):
+        return fun(self, self.stage_rng(fun.__name__), *args)
+
+    return wrapper
 
 
 class RandomGenerator:
@@ -20,15 +45,22 @@ class RandomGenerator:
     Attributes: Multiple helper, working and final data frames.
 
     Args:
-        seed (int): Optional random seed. Defaults to None.
+        seed (int): Optional random seed. Defaults to None (the configured one).
     """
 
     def __init__(self, seed: int = None) -> None:
-        if seed is not None:
-            np.random.seed(seed)
-        self.random_helpers: RandomHelpers = None
         with open(Path("config/random.settings.json"), "r") as f:
             self.config = json.load(f)
+        self.seed = seed if seed is not None else self.config["seed"]
+        self.seed_sequence = np.random.SeedSequence(self.seed)
+        self.random_helpers: RandomHelpers = None
+        self.payment_index: RemapIndex = None
+        self.key_index: RemapIndex = None
+        self.shard_executor: ProcessPoolExecutor = None
+        # the period drawn (none for the whole lifetime at once) and the numbers
+        # of the rows drawn in the periods before, by the table names
+        self.period: str = None
+        self.id_offsets = {}
 
         self.prompt_games = pd.DataFrame()
         self.prompt_first_names_males = pd.DataFrame()
@@ -62,7 +94,35 @@ class RandomGenerator:
         self.city = pd.DataFrame()
         self.payments = pd.DataFrame()
         self.invoices = pd.DataFrame()
+        self.customer_activity = pd.DataFrame()
+
+    def stage_rng(self, stage: str) -> np.random.Generator:
+        # independent stream of each step, keyed by its name (and period)
+        if self.period is not None:
+            stage = f"{stage} {self.period}"
+        return np.random.Generator(
+            np.random.PCG64(
+                np.random.SeedSequence(
+                    self.seed_sequence.entropy,
+                    spawn_key=(zlib.crc32(stage.encode()),),
+                )
+            )
+        )
 
+    @step(
+        reads=(
+            "prompt_first_names_males",
+            "prompt_last_names_males",
+            "prompt_first_names_females",
+            "prompt_last_names_females",
+            "prompt_dates",
+            "prompt_games",
+            "prompt_tournaments",
+            "prompt_staff_shifts",
+            "prompt_emails",
+        ),
+        writes=("random_helpers",),
+    )
     def _assign_random_helpers(self) -> None:
         self.random_helpers = RandomHelpers(
             self.config,
@@ -79,6 +139,18 @@ class RandomGenerator:
             },
         )
 
+    @step(
+        writes=(
+            "prompt_games",
+            "prompt_first_names_males",
+            "prompt_last_names_males",
+            "prompt_first_names_females",
+            "prompt_last_names_females",
+            "prompt_cities",
+            "prompt_emails",
+            "prompt_tournaments",
+        )
+    )
     def read_prompts(self) -> None:
         self.prompt_games = pd.read_csv(Path("config/prompts/games.csv"))
         self.prompt_first_names_males = pd.read_csv(
@@ -97,7 +169,9 @@ class RandomGenerator:
         self.prompt_emails = pd.read_csv(Path("config/prompts/domains.csv"))
         self.prompt_tournaments = pd.read_csv(Path("config/prompts/tournaments.csv"))
 
-    def gen_prompt_dates(self) -> None:
+    @step(writes=("prompt_dates",))
+    @seeded
+    def gen_prompt_dates(self, rng: np.random.Generator) -> None:
         # all the dates
         self.prompt_dates = pd.DataFrame(
             {
@@ -140,20 +214,22 @@ class RandomGenerator:
         ### sales = base + noise
         self.prompt_dates["volume_sales"] = (
             self.prompt_dates["volume_base"]
-            + np.random.normal(
+            + rng.normal(
                 loc=0, scale=self.config["traffic_std"], size=self.prompt_dates.shape[0]
             )
         ).round()
         ### rental = base * ratio + noise
         self.prompt_dates["volume_rental"] = (
             self.prompt_dates["volume_base"] * self.config["rental_to_sales_ratio"]
-            + np.random.normal(
+            + rng.normal(
                 loc=0, scale=self.config["traffic_std"], size=self.prompt_dates.shape[0]
             )
         ).round()
         self.prompt_dates = self.prompt_dates.reset_index(drop=True)
 
-    def gen_prompt_hours(self) -> None:
+    @step(writes=("prompt_hours",))
+    @seeded
+    def gen_prompt_hours(self, rng: np.random.Generator) -> None:
         # list of the hours when opened
         self.prompt_hours = pd.DataFrame(
             {
@@ -164,16 +240,14 @@ class RandomGenerator:
             }
         )
         # traffic increments
-        self.prompt_hours["customer_n"] = np.random.exponential(
+        self.prompt_hours["customer_n"] = rng.exponential(
             size=self.prompt_hours.shape[0]
         ).cumsum()
         # traffic decrements after the pick
         decrease_stage = self.prompt_hours[
             self.prompt_hours["hour"] > self.config["shop_open_hours"]["pick"]
         ]
-        self.prompt_hours.loc[
-            decrease_stage.index, "customer_n"
-        ] -= np.random.exponential(
+        self.prompt_hours.loc[decrease_stage.index, "customer_n"] -= rng.exponential(
             scale=self.config["traffic_decrease_magnitude"],
             size=decrease_stage.shape[0],
         ).cumsum()
@@ -183,42 +257,46 @@ class RandomGenerator:
             self.prompt_hours["customer_n"] / self.prompt_hours["customer_n"].sum()
         )
 
-    def prepar_prompt_games(self) -> None:
+    @step(writes=("prompt_games",))
+    @seeded
+    def prepar_prompt_games(self, rng: np.random.Generator) -> None:
         # sample the games but leave the first in csv as the first there
-        self.prompt_games[1:] = self.prompt_games[1:].sample(frac=1)
+        self.prompt_games[1:] = self.prompt_games[1:].sample(frac=1, random_state=rng)
         # add the weights
-        rng = np.linspace(0, 2, self.prompt_games["name"].shape[0])
-        expon_curve = np.exp(-rng)
+        span = np.linspace(0, 2, self.prompt_games["name"].shape[0])
+        expon_curve = np.exp(-span)
         self.prompt_games["weights"] = expon_curve / expon_curve.sum()
 
-    def gen_staff(self) -> None:
+    @step(writes=("staff", "random_helpers"))
+    @seeded
+    def gen_staff(self, rng: np.random.Generator) -> None:
         # basic info
         self.staff = pd.DataFrame(
             {
-                "gender": np.random.choice(
-                    ["M", "F"], size=self.config["staff_number"]
+                "gender": rng.choice(["M", "F"], size=self.config["staff_number"]),
+                "phone": self.random_helpers.gen_phones(
+                    self.config["staff_number"], rng
                 ),
-                "phone": self.random_helpers.gen_one_phone(
-                    np.zeros(self.config["staff_number"])
-                ),
-                "to_date": self.random_helpers.gen_staff_to_date(),
+                "to_date": self.random_helpers.gen_staff_to_date(rng),
             }
         )
         # details
         self.staff["city"] = np.full(self.staff.shape[0], "Wrocław")
         self.staff["from_date"] = self.random_helpers.gen_staff_from_date(self.staff)
-        self.staff["first_name"] = self.random_helpers.gen_one_name(
-            self.staff["gender"], "first"
+        self.staff["first_name"] = self.random_helpers.gen_names(
+            self.staff["gender"], "first", rng
         )
-        self.staff["last_name"] = self.random_helpers.gen_one_name(
-            self.staff["gender"], "last"
+        self.staff["last_name"] = self.random_helpers.gen_names(
+            self.staff["gender"], "last", rng
         )
-        self.staff["email"] = self.random_helpers.gen_email(
-            self.staff["first_name"], self.staff["last_name"]
+        self.staff["email"] = self.random_helpers.gen_emails(
+            self.staff["first_name"], self.staff["last_name"], rng
         )
-        self.staff["current_salary"] = self.random_helpers.gen_salary(self.staff)
+        self.staff["current_salary"] = self.random_helpers.gen_salary(self.staff, rng)
         self.staff["is_manager"] = self.random_helpers.gen_manager_status(self.staff)
-        self.staff["updated_at"] = self.random_helpers.gen_staff_update_time(self.staff)
+        self.staff["updated_at"] = self.random_helpers.gen_staff_update_time(
+            self.staff, rng
+        )
         # indexing
         self.staff.sort_values(by=["updated_at"], inplace=True)
         self.staff = self.staff.reset_index(drop=True)
@@ -241,6 +319,7 @@ class RandomGenerator:
             axis=1,
         )
 
+    @step(writes=("prompt_staff_shifts",))
     def gen_prompt_staff_shifts(self) -> None:
         # all the hour-day combinations
         hours = pd.DataFrame(
@@ -299,40 +378,33 @@ class RandomGenerator:
             drop=True
         )
 
-    def gen_relationships(self) -> None:
+    @step(reads=("staff", "prompt_dates", "random_helpers"), writes=("relationships",))
+    @seeded
+    def gen_relationships(self, rng: np.random.Generator) -> None:
         n = int(
             np.ceil(self.config["staff_number"] * self.config["relationships"]["ratio"])
         )
-        staff_id = []
-        staff_gender = []
-        update = []
-        current_staff = self.staff.loc[self.staff["current_salary"].isnull() == False]
-        for _ in range(n):
-            employee = np.random.choice(
-                current_staff.staff_id,
-                p=current_staff.current_salary / current_staff.current_salary.sum(),
-            )
-            staff_id.append(employee)
-            staff_gender.append(
-                *current_staff["gender"].loc[current_staff.staff_id == employee].values
-            )
-            date_range = pd.date_range(
-                start=current_staff["from_date"]
-                .loc[current_staff["staff_id"] == employee]
-                .values[0],
-                end=self.prompt_dates["date"].iloc[-1],
-            )
-            update.append(
-                pd.Timestamp(np.random.choice(date_range))
-                + datetime.timedelta(
-                    hours=np.random.randint(
-                        self.config["shop_open_hours"]["from"],
-                        self.config["shop_open_hours"]["to"],
-                    ),
-                    minutes=np.random.randint(0, 60),
-                    seconds=np.random.randint(0, 60),
-                )
-            )
+        current_staff = self.staff.loc[
+            self.staff["current_salary"].isnull() == False
+        ].set_index("staff_id", drop=False)
+        staff_id = rng.choice(
+            current_staff.staff_id,
+            p=current_staff.current_salary / current_staff.current_salary.sum(),
+            size=n,
+        )
+        staff_gender = current_staff["gender"].loc[staff_id].to_numpy()
+        # any day of the employment
+        from_date = pd.to_datetime(current_staff["from_date"].loc[staff_id])
+        employment_days = (self.prompt_dates["date"].iloc[-1] - from_date).dt.days
+        days = (
+            from_date.to_numpy()
+            + pd.to_timedelta(
+                rng.integers(0, employment_days.to_numpy() + 1), unit="D"
+            ).to_numpy()
+        )
+        update = self.random_helpers.draw_timestamps(
+            days, 1, self.random_helpers.open_hours(), rng
+        )
         self.relationships = pd.DataFrame(
             {
                 "staff_id": staff_id,
@@ -342,6 +414,7 @@ class RandomGenerator:
                     loc=self.config["relationships"]["avg_dates_n"],
                     scale=self.config["relationships"]["std_dates_n"],
                     condition=0,
+                    rng=rng,
                 ).astype(int),
                 "updated_at": update,
             }
@@ -364,16 +437,18 @@ class RandomGenerator:
             axis=1,
         )
 
-    def gen_partners(self) -> None:
+    @step(reads=("random_helpers",), writes=("partners", "relationships"))
+    @seeded
+    def gen_partners(self, rng: np.random.Generator) -> None:
         partner = self.relationships["partner_id"]
         staff_gender = self.relationships["staff_gender"].values
         gender = []
         weight = self.config["heterosexuals_ratio"]
         for el in staff_gender:
             if el == "M":
-                gender.append(np.random.choice(["M", "F"], p=[1 - weight, weight]))
+                gender.append(rng.choice(["M", "F"], p=[1 - weight, weight]))
             elif el == "F":
-                gender.append(np.random.choice(["M", "F"], p=[weight, 1 - weight]))
+                gender.append(rng.choice(["M", "F"], p=[weight, 1 - weight]))
 
         self.partners = pd.DataFrame(
             {
@@ -382,8 +457,8 @@ class RandomGenerator:
                 "updated_at": self.relationships["updated_at"],
             }
         )
-        self.partners["name"] = self.random_helpers.gen_one_name(
-            self.partners["gender"], mode="first"
+        self.partners["name"] = self.random_helpers.gen_names(
+            self.partners["gender"], mode="first", rng=rng
         )
         self.partners.sort_values(by=["updated_at"], inplace=True)
         self.partners = self.partners.reindex(
@@ -392,12 +467,15 @@ class RandomGenerator:
         self.relationships.drop(columns=["staff_gender"], inplace=True)
         self.partners = self.partners.reset_index(drop=True)
 
+    @step(writes=("customers",))
     def gen_mock_customers(self) -> None:
         self.customers = pd.DataFrame(
             {"customer_id": [*range(1, self.config["customers_number"] + 1)]}
         )
 
-    def gen_maintenance_expenses(self) -> None:
+    @step(reads=("staff", "random_helpers"), writes=("maintenance_expenses",))
+    @seeded
+    def gen_maintenance_expenses(self, rng: np.random.Generator) -> None:
         self.maintenance_expenses = pd.DataFrame(
             {"date": [], "title": [], "amount": [], "type": [], "updated_at": []}
         )
@@ -405,21 +483,23 @@ class RandomGenerator:
             [
                 self.maintenance_expenses,
                 self.random_helpers.gen_rent_expenses(),
-                self.random_helpers.gen_energy_expenses(),
-                self.random_helpers.gen_water_expenses(),
-                self.random_helpers.gen_heat_expenses(),
-                self.random_helpers.gen_salary_expenses(self.staff),
+                self.random_helpers.gen_energy_expenses(rng),
+                self.random_helpers.gen_water_expenses(rng),
+                self.random_helpers.gen_heat_expenses(rng),
+                self.random_helpers.gen_salary_expenses(self.staff, rng),
             ]
         )
         self.maintenance_expenses["updated_at"] = self.maintenance_expenses[
             "date"
         ] + pd.DateOffset(
-            hours=np.random.randint(
-                self.config["shop_open_hours"]["from"],
-                self.config["shop_open_hours"]["to"],
+            hours=int(
+                rng.integers(
+                    self.config["shop_open_hours"]["from"],
+                    self.config["shop_open_hours"]["to"],
+                )
             ),
-            minutes=np.random.randint(0, 60),
-            seconds=np.random.randint(0, 60),
+            minutes=int(rng.integers(0, 60)),
+            seconds=int(rng.integers(0, 60)),
         )
         
         self.maintenance_expenses.sort_values(by=["updated_at"], inplace=True)
@@ -431,7 +511,9 @@ class RandomGenerator:
             self.maintenance_expenses.reset_index()["index"] + 1
         )
         self.maintenance_expenses["spend_id"] = (
-            self.maintenance_expenses.reset_index()["index"] + 1
+            self.maintenance_expenses.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("maintenance_expenses", 0)
         )
         self.maintenance_expenses = self.maintenance_expenses.reindex(
             [
@@ -447,6 +529,7 @@ class RandomGenerator:
             axis=1,
         )
 
+    @step(reads=("maintenance_expenses",), writes=("expense_types",))
     def gen_expense_types(self) -> None:
         self.expense_types = pd.DataFrame(
             {
@@ -466,6 +549,7 @@ class RandomGenerator:
             ["expenses_type_id", "expenses_type", "updated_at"], axis=1
         )
 
+    @step(reads=("maintenance_expenses", "expense_types"), writes=("expense_titles",))
     def gen_expense_titles(self) -> None:
         self.expense_titles = pd.DataFrame(
             {
@@ -488,8 +572,8 @@ class RandomGenerator:
             ["title_id", "title", "expenses_type_id", "updated_at"], axis=1
         )
 
-    def gen_tournaments(self) -> None:
-        dates = pd.DataFrame(
+    def tournament_dates(self) -> pd.Series:
+        return pd.DataFrame(
             self.prompt_dates.loc[
                 self.prompt_dates["weekday"] == self.config["event_info"]["weekday"],
                 "date",
@@ -499,11 +583,16 @@ class RandomGenerator:
                 ]["period_weeks"]
             ]
         ).reset_index()["date"]
+
+    @step(reads=("prompt_dates", "random_helpers"), writes=("tournaments",))
+    @seeded
+    def gen_tournaments(self, rng: np.random.Generator) -> None:
+        dates = self.tournament_dates()
         tournament = self.random_helpers.prepar_tournament_game()
         tournament = tournament.sample(
-            dates.shape[0], replace=False, ignore_index=True
+            dates.shape[0], replace=False, ignore_index=True, random_state=rng
         )  # cannot be the same row
-        tree_levels_number = np.random.randint(
+        tree_levels_number = rng.integers(
             self.config["tournament_tree_params"]["min"],
             self.config["tournament_tree_params"]["max"] + 1,
             size=dates.shape[0],
@@ -524,10 +613,12 @@ class RandomGenerator:
                 - datetime.timedelta(
                     days=self.config["event_info"]["deadline_offset_days"]
                 ),
-                "staff_id": self.random_helpers.gen_tournament_staff(dates.shape[0]),
+                "staff_id": self.random_helpers.gen_tournament_staff(
+                    dates.shape[0], rng
+                ),
                 "expenses": np.round(
                     self.config["exponses_params"]["mean"]
-                    + np.random.gamma(
+                    + rng.gamma(
                         shape=self.config["exponses_params"]["shape"],
                         scale=self.config["exponses_params"]["scale"],
                         size=dates.shape[0],
@@ -540,7 +631,11 @@ class RandomGenerator:
         )
         self.tournaments.sort_values(by=["updated_at"], inplace=True)
         self.tournaments = self.tournaments.reset_index(drop=True)
-        self.tournaments["tournament_id"] = self.tournaments.reset_index()["index"] + 1
+        self.tournaments["tournament_id"] = (
+            self.tournaments.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("tournaments", 0)
+        )
         self.tournaments["invoice_id"] = self.tournaments["tournament_id"]
         self.tournaments = self.tournaments.reindex(
             [
@@ -560,7 +655,12 @@ class RandomGenerator:
             axis=1,
         )
 
-    def gen_participations(self) -> None:
+    @step(
+        reads=("tournaments", "prompt_games", "customers", "random_helpers"),
+        writes=("participations",),
+    )
+    @seeded
+    def gen_participations(self, rng: np.random.Generator) -> None:
         # participants number
         players = pd.merge(
             self.tournaments[
@@ -573,32 +673,27 @@ class RandomGenerator:
         )
         players["participants_number"] = players["participants_number"].astype("int")
         players_number = players["participants_number"] * (2 ** players["tree_levels"])
-        players["players"] = players_number
 
         # customer_id and place
-        participants = map(
-            lambda x: self.customers["customer_id"]
-            .sample(x, replace=False, ignore_index=True)
-            .values,
-            players_number,
+        tournament_ix, customer_id, place = self.random_helpers.sample_participants(
+            self.customers["customer_id"].to_numpy(), players_number.to_numpy(), rng
         )
-        players["place"] = players["players"].apply(lambda x: [*range(1, x + 1)])
-        players["customer_id"] = list(participants)
-
         self.participations = players[
-            ["tournament_id", "customer_id", "fee", "sign_up_deadline", "place"]
-        ]
-        self.participations = self.participations.explode(
-            ["customer_id", "place"], ignore_index=True
+            ["tournament_id", "fee", "sign_up_deadline"]
+        ].iloc[tournament_ix]
+        self.participations = self.participations.reset_index(drop=True)
+        self.participations["customer_id"] = customer_id
+        self.participations["place"] = place
+        self.participations["sign_up_date"] = self.random_helpers.gen_sign_u_date(
+            self.participations["sign_up_deadline"], rng
         )
-        self.participations["sign_up_date"] = self.participations[
-            "sign_up_deadline"
-        ].apply(self.random_helpers.gen_sign_u_date)
         self.participations["updated_at"] = self.participations["sign_up_date"].copy()
         self.participations.sort_values(by=["updated_at"], inplace=True)
         self.participations = self.participations.reset_index(drop=True)
         self.participations["particip_id"] = (
-            self.participations.reset_index()["index"] + 1
+            self.participations.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("participations", 0)
         )
         self.participations["invoice_id"] = (
             self.participations.reset_index()["index"] + 1
@@ -617,13 +712,15 @@ class RandomGenerator:
             axis=1,
         )
 
-    def gen_inventory(self) -> None:
+    @step(reads=("tournaments", "random_helpers"), writes=("inventory",))
+    @seeded
+    def gen_inventory(self, rng: np.random.Generator) -> None:
         # concat the parts
         self.inventory = pd.concat(
             [
-                self.random_helpers.gen_sell_inventory(),
-                self.random_helpers.gen_rent_inventory(),
-                self.random_helpers.gen_tournament_inventory(self.tournaments),
+                self.random_helpers.gen_sell_inventory(rng),
+                self.random_helpers.gen_rent_inventory(rng),
+                self.random_helpers.gen_tournament_inventory(self.tournaments, rng),
             ]
         )
         # add updated at value
@@ -654,6 +751,7 @@ class RandomGenerator:
             axis=1,
         )
 
+    @step(reads=("inventory",), writes=("game_prices",))
     def gen_game_prices(self) -> None:
         self.game_prices = self.inventory.drop_duplicates(
             subset=["price"], keep="last", ignore_index=True
@@ -669,56 +767,61 @@ class RandomGenerator:
         )
         
 
-    def gen_sales(self) -> None:
-        # get a list of dates for each customer
-        dates_gener = itertools.chain(
-            *self.random_helpers.v_repeat(
-                self.prompt_dates["date"], self.prompt_dates["volume_sales"]
-            )
-        )
-        dates = np.array(list(dates_gener))
-        # add random time to the date
-        hours = np.array(
-            np.random.choice(
-                self.prompt_hours["hour"], p=self.prompt_hours["prob"], size=dates.size
-            )
+    def map_date_shards(
+        self, fun: callable, rng: np.random.Generator, *args
+    ) -> pd.DataFrame:
+        # contiguous date shards, each with its own stream
+        shards = np.array_split(
+            np.arange(self.prompt_dates.shape[0]),
+            min(self.config["date_shards"], self.prompt_dates.shape[0]),
+        )
+        jobs = zip(
+            *[
+                (self.prompt_dates.iloc[ix], ix[0], shard_rng, *args)
+                for ix, shard_rng in zip(shards, rng.spawn(len(shards)))
+            ]
         )
-        minutes = np.random.randint(0, 60, size=dates.size)
-        seconds = np.random.randint(0, 60, size=dates.size)
-        timestamps = dates + self.random_helpers.v_timedelta(hours, minutes, seconds)
-        timestamps.sort()
+        if self.shard_executor is None:
+            results = map(fun, *jobs)
+        else:
+            results = self.shard_executor.map(fun, *jobs)
+        return pd.concat(results, ignore_index=True)
+
+    @step(
+        reads=("prompt_dates", "prompt_hours", "random_helpers"),
+        writes=("sales", "inventory"),
+    )
+    @seeded
+    def gen_sales(self, rng: np.random.Generator) -> None:
+        # draw the customers of every date shard
+        self.sales = self.map_date_shards(
+            self.random_helpers.draw_sales_shard,
+            rng,
+            self.prompt_hours,
+            self.config["customer_pcs_probas"],
+        )
+        self.sales.sort_values("date", inplace=True, kind="stable", ignore_index=True)
         # staff ids
-        staff = self.random_helpers.v_get_staff_id(timestamps)
-        # how many at once are bought
-        pcs = np.random.choice(
-            list(self.config["customer_pcs_probas"].keys()),
-            p=list(self.config["customer_pcs_probas"].values()),
-            size=dates.size,
-        ).astype(int)
-        # make a data frame and add invoices as ix
-        self.sales = pd.DataFrame({"date": timestamps, "staff_id": staff, "pcs": pcs})
+        self.sales["staff_id"] = self.random_helpers.v_get_staff_id(
+            self.sales["date"], rng
+        )
+        # add invoices as ix
         self.sales = self.sales.reset_index().rename(columns={"index": "invoice"})
-        # additional rows when the pieces number is larger than one
-        for pcs_n in self.config["customer_pcs_probas"].keys():
-            selection = self.sales[self.sales["pcs"] == int(pcs_n)]
-            self.sales = pd.concat([self.sales] + [selection] * (int(pcs_n) - 1))
+        # one row per piece of the basket
+        self.sales = self.sales.loc[self.sales.index.repeat(self.sales["pcs"])]
         self.sales = self.sales.reset_index(drop=True).drop("pcs", axis="columns")
-        # pre-filter the inventory table
-        sales_inventory = self.inventory[self.inventory["destination"] == "S"]
-        self.sales = pd.concat(
-            [
-                self.sales,
-                sales_inventory.iloc[: self.sales.shape[0]].reset_index()[
-                    ["inventory_id", "price", "delivery_date"]
-                ],
-            ],
-            axis=1,
-        )
-        self.sales = self.sales[~(self.sales["date"] < self.sales["delivery_date"])]
-        self.sales = self.sales.drop(columns=["delivery_date"])
-        self.sales = self.sales.dropna()
-        self.sales["inventory_id"] = self.sales["inventory_id"].astype(int)
-        self.inventory.loc[self.inventory["inventory_id"].isin(self.sales["inventory_id"]), "active"] = False
+        # give out the copies already delivered; skip the sales without any
+        inventory_ix = self.random_helpers.allocate_sell_inventory(
+            self.inventory, self.sales["date"].to_numpy()
+        )
+        sold = inventory_ix >= 0
+        self.sales = self.sales.loc[sold].reset_index(drop=True)
+        inventory_ix = inventory_ix[sold]
+        self.sales["inventory_id"] = self.inventory.loc[
+            inventory_ix, "inventory_id"
+        ].to_numpy()
+        self.sales["price"] = self.inventory.loc[inventory_ix, "price"].to_numpy()
+        self.inventory.loc[inventory_ix, "active"] = False
         # other details
         self.sales["updated_at"] = self.sales["date"]
         self.sales["return_oper"] = False
@@ -726,7 +829,9 @@ class RandomGenerator:
         self.sales.sort_values("updated_at", inplace=True)
         # fix
         self.sales = self.sales.reset_index(drop=True)
-        self.sales["sale_id"] = self.sales.reset_index()["index"] + 1
+        self.sales["sale_id"] = (
+            self.sales.reset_index()["index"] + 1 + self.id_offsets.get("sales", 0)
+        )
         self.sales = self.sales.reindex(
             [
                 "sale_id",
@@ -741,113 +846,88 @@ class RandomGenerator:
             axis=1,
         )
 
-    def gen_rental(self) -> None:
-        rental_date = []
-        return_dates = []
-        customer = []
-        price = []
-        staff = []
-        inventory_ids = []
-        rate = []
-        update = []
-        penalty = []
-        invoice = []
-        penalty_invoice = []
-
-        for j in range(self.prompt_dates["date"].shape[0]):
-            for i in range(int(self.prompt_dates["volume_rental"][j])):
-                hour = np.random.choice(
-                    self.prompt_hours["hour"], p=self.prompt_hours["prob"]
-                )
-                date = self.prompt_dates["date"][j] + datetime.timedelta(
-                    hours=int(hour),
-                    minutes=np.random.randint(0, 60),
-                    seconds=np.random.randint(0, 60),
-                )
-                game = np.random.choice(
-                    self.prompt_games["name"], p=self.prompt_games["weights"]
-                )
-                staff_id = int(self.random_helpers.v_get_staff_id(date))
-                holding_time = np.random.gamma(
-                    self.config["holding_time_params"]["shape"],
-                    scale=self.config["holding_time_params"]["scale"],
-                )
-                return_date_t = self.prompt_dates["date"][j] + datetime.timedelta(
-                    days=int(holding_time),
-                    hours=round(abs(holding_time) % 1 * 24, 2),
-                    minutes=np.random.randint(0, 60),
-                    seconds=np.random.randint(0, 60),
-                )
-                return_date = self.random_helpers.proper_return_date(
-                    return_date_t, date
-                )
-                mask = (
-                    (self.inventory["game"] == game)
-                    & (self.inventory["delivery_date"] < date)
-                    & (self.inventory["destination"] == "R")
-                    & (self.inventory["active"] == True)
-                )
-                if mask.any():
-                    customer.append(
-                        int(np.random.choice(self.customers["customer_id"]))
-                    )
-                    price.append(self.inventory["price"].loc[mask.idxmax()])
-                    rental_date.append(date)
-                    staff.append(staff_id)
-                    game_inventory_id = self.inventory["inventory_id"].loc[
-                        mask.idxmax()
-                    ]
-                    inventory_ids.append(game_inventory_id)
-                    invoice.append(f"{i}{j}")
-                    if return_date > datetime.datetime.today():
-                        return_dates.append(np.nan)
-                        update.append(date)
-                        self.inventory.loc[mask.idxmax(), "active"] = False
-                        penalty.append(np.nan)
-                        penalty_invoice.append(np.nan)
-                    else:
-                        return_dates.append(return_date)
-                        update.append(return_date)
-                        delta = return_date - date
-                        if delta.days > self.config["rental_allowed_days"]:
-                            penalty.append(
-                                (
-                                    (
-                                        self.inventory[
-                                            self.inventory["inventory_id"]
-                                            == game_inventory_id
-                                        ]["price"]
-                                    )
-                                    * self.config["penalty_ratio"]
-                                )
-                                .to_numpy()[0]
-                                .round(2)
-                                * delta.days
-                            )
-                            penalty_invoice.append(f"P{i}_{j}")
-                        else:
-                            penalty.append(np.nan)
-                            penalty_invoice.append(np.nan)
-                    rate.append(np.random.randint(1, 11))
+    @step(
+        reads=(
+            "prompt_dates",
+            "prompt_hours",
+            "prompt_games",
+            "customers",
+            "random_helpers",
+        ),
+        writes=("rental", "inventory"),
+    )
+    @seeded
+    def gen_rental(self, rng: np.random.Generator) -> None:
+        # draw the rentals of every date shard
+        shards = self.map_date_shards(
+            self.random_helpers.draw_rental_shard,
+            rng,
+            self.prompt_hours,
+            self.prompt_games,
+            self.config["holding_time_params"],
+        )
+        day_ix = shards["day_ix"].to_numpy()
+        in_day_ix = shards["in_day_ix"].to_numpy()
+        dates = pd.DatetimeIndex(shards["date"])
+        games = shards["game"].to_numpy()
+        staff = self.random_helpers.v_get_staff_id(dates, rng)
+        return_dates = self.random_helpers.proper_return_date(
+            pd.DatetimeIndex(shards["return_date"]), dates
+        )
+        # the ones not returned yet
+        return_dates = return_dates.where(return_dates <= datetime.datetime.today())
+        # give out the free copies; skip the rentals without any
+        inventory_ix = self.random_helpers.allocate_rent_inventory(
+            self.inventory,
+            games,
+            dates.to_numpy(),
+            return_dates.to_numpy(),
+        )
+        rented = inventory_ix >= 0
+        if not rented.all():
+            logging.info(
+                f"{(~rented).sum()} of {rented.size} drawn rentals have been dropped,"
+                + " as no copy of their games was free."
+            )
+        inventory_ix = inventory_ix[rented]
+        dates = dates[rented]
+        return_dates = return_dates[rented]
+        self.inventory.loc[inventory_ix[return_dates.isnull()], "active"] = False
+        # the penalty for holding the game too long
+        price = self.inventory.loc[inventory_ix, "price"].to_numpy()
+        delta_days = (return_dates - dates).days.to_numpy()
+        late = delta_days > self.config["rental_allowed_days"]
+        invoice_ix = pd.Series(in_day_ix[rented]).astype(str)
+        day_ix = pd.Series(day_ix[rented]).astype(str)
 
         self.rental = pd.DataFrame(
             {
-                "inventory_id": inventory_ids,
-                "customer_id": customer,
-                "rental_date": rental_date,
+                "inventory_id": self.inventory.loc[
+                    inventory_ix, "inventory_id"
+                ].to_numpy(),
+                "customer_id": rng.choice(
+                    self.customers["customer_id"], size=inventory_ix.size
+                ),
+                "rental_date": dates,
                 "return_date": return_dates,
-                "staff_id": staff,
+                "staff_id": staff[rented].astype(int),
                 "price": price,
-                "invoice": invoice,
-                "penalty_payment": penalty,
-                "penalty_invoice": penalty_invoice,
-                "rate": rate,
-                "updated_at": update,
+                "invoice": invoice_ix + day_ix,
+                "penalty_payment": np.where(
+                    late,
+                    (price * self.config["penalty_ratio"]).round(2) * delta_days,
+                    np.nan,
+                ),
+                "penalty_invoice": ("P" + invoice_ix + "_" + day_ix).where(late),
+                "rate": rng.integers(1, 11, size=inventory_ix.size),
+                "updated_at": return_dates.where(return_dates.notnull(), dates),
             }
         )
         self.rental.sort_values("updated_at", inplace=True)
         self.rental = self.rental.reset_index(drop=True)
-        self.rental["rental_id"] = self.rental.reset_index()["index"] + 1
+        self.rental["rental_id"] = (
+            self.rental.reset_index()["index"] + 1 + self.id_offsets.get("rental", 0)
+        )
         self.rental = self.rental.reindex(
             [
                 "rental_id",
@@ -866,6 +946,7 @@ class RandomGenerator:
             axis=1,
         )
 
+    @step(reads=("inventory", "prompt_games"), writes=("games",))
     def gen_games(self) -> None:
         update = self.inventory[["game", "delivery_date"]].groupby(["game"]).min()
         self.games = pd.merge(
@@ -902,6 +983,7 @@ class RandomGenerator:
             axis=1,
         )
 
+    @step(reads=("games",), writes=("game_categories",))
     def gen_game_categories(self) -> None:
         self.game_categories = self.games[["category", "updated_at"]].drop_duplicates(
             "category", keep="first"
@@ -915,6 +997,7 @@ class RandomGenerator:
             ["category_id", "game_category", "updated_at"], axis=1
         )
 
+    @step(reads=("games",), writes=("game_types",))
     def gen_game_types(self) -> None:
         self.game_types = self.games[["type", "updated_at"]].drop_duplicates(
             "type", keep="first"
@@ -926,10 +1009,11 @@ class RandomGenerator:
             ["type_id", "game_type", "updated_at"], axis=1
         )
 
-    def update_mock_customers(self) -> None:
+    def keep_active_customers(self, rental_activity: pd.DataFrame) -> None:
+        # the customers who came at all, updated at their first visit
         active_customers = pd.concat(
             [
-                self.rental[["customer_id", "updated_at"]],
+                rental_activity,
                 self.participations[["customer_id", "updated_at"]],
             ],
             ignore_index=True,
@@ -942,26 +1026,34 @@ class RandomGenerator:
         self.customers.sort_values("updated_at", inplace=True)
         self.customers.reset_index(drop=True, inplace=True)
 
-    def gen_real_customers(self) -> None:
-        self.customers["gender"] = np.random.choice(
-            ["M", "F"], size=self.customers.shape[0]
-        )
-        self.customers["phone"] = self.random_helpers.gen_one_phone(
-            np.zeros(self.customers.shape[0])
-        )
-        self.customers["city"] = np.random.choice(
+    @step(reads=("rental", "participations"), writes=("customers",))
+    def update_mock_customers(self) -> None:
+        self.keep_active_customers(self.rental[["customer_id", "updated_at"]])
+
+    @step(reads=("customer_activity", "participations"), writes=("customers",))
+    def update_streamed_customers(self) -> None:
+        self.keep_active_customers(self.customer_activity)
+
+    @step(reads=("prompt_cities",), writes=("customers", "random_helpers"))
+    @seeded
+    def gen_real_customers(self, rng: np.random.Generator) -> None:
+        self.customers["gender"] = rng.choice(["M", "F"], size=self.customers.shape[0])
+        self.customers["phone"] = self.random_helpers.gen_phones(
+            self.customers.shape[0], rng
+        )
+        self.customers["city"] = rng.choice(
             self.prompt_cities["city"],
             p=self.prompt_cities["prob"],
             size=self.customers.shape[0],
         )
-        self.customers["first_name"] = self.random_helpers.gen_one_name(
-            self.customers["gender"], "first"
+        self.customers["first_name"] = self.random_helpers.gen_names(
+            self.customers["gender"], "first", rng
         )
-        self.customers["last_name"] = self.random_helpers.gen_one_name(
-            self.customers["gender"], "last"
+        self.customers["last_name"] = self.random_helpers.gen_names(
+            self.customers["gender"], "last", rng
         )
-        self.customers["email"] = self.random_helpers.gen_email(
-            self.customers["first_name"], self.customers["last_name"]
+        self.customers["email"] = self.random_helpers.gen_emails(
+            self.customers["first_name"], self.customers["last_name"], rng
         )
         self.customers["previous_customer_id"] = self.customers["customer_id"]
         self.customers["customer_id"] = self.customers.reset_index()["index"] + 1
@@ -978,6 +1070,12 @@ class RandomGenerator:
             ]
         )
 
+    @step(writes=("customers",))
+    def keep_streamed_customer_ids(self) -> None:
+        # the rental passed on before refers to the first identifiers
+        self.customers["customer_id"] = self.customers["previous_customer_id"]
+
+    @step(reads=("customers", "staff"), writes=("city",))
     def gen_cities(self) -> None:
         merged_people = pd.concat([self.customers, self.staff], ignore_index=True)
         merged_people.sort_values(["updated_at"], inplace=True)
@@ -992,8 +1090,7 @@ class RandomGenerator:
         self.city["city_id"] = self.city.reset_index()["index"] + 1
         self.city = self.city.reindex(["city_id", "city", "updated_at"], axis=1)
 
-    def gen_working_payments(self):
-        # inventory
+    def inventory_payments(self) -> pd.DataFrame:
         df_inv = self.inventory[
             ["purchase_payment", "invoice_id", "updated_at"]
         ].rename(
@@ -1007,21 +1104,27 @@ class RandomGenerator:
         df_inv["amount"] = -df_inv["amount"]
         df_inv["pid"] = self.inventory["inventory_id"]
         df_inv["gid"] = "I"
-        # sales
+        return df_inv
+
+    def sales_payments(self) -> pd.DataFrame:
         df_sales = self.sales[["price", "invoice", "date"]].rename(
             columns={"price": "amount"}
         )
         df_sales["invoice"] = "S" + df_sales["invoice"].astype(str)
         df_sales["pid"] = self.sales["sale_id"]
         df_sales["gid"] = "S"
-        # rent
+        return df_sales
+
+    def rental_payments(self) -> pd.DataFrame:
         df_rent = self.rental[["price", "invoice", "rental_date"]].rename(
             columns={"price": "amount", "rental_date": "date"}
         )
         df_rent["invoice"] = "R" + df_rent["invoice"].astype(str)
         df_rent["pid"] = self.rental["rental_id"]
         df_rent["gid"] = "R"
-        # rent penalty
+        return df_rent
+
+    def penalty_payments(self) -> pd.DataFrame:
         df_rent_penalty = (
             self.rental[["penalty_payment", "penalty_invoice", "return_date"]]
             .dropna()
@@ -1036,7 +1139,9 @@ class RandomGenerator:
         df_rent_penalty["invoice"] = "R" + df_rent_penalty["invoice"].astype(str)
         df_rent_penalty["pid"] = self.rental["rental_id"]
         df_rent_penalty["gid"] = "RP"
-        # expenses
+        return df_rent_penalty
+
+    def expense_payments(self) -> pd.DataFrame:
         df_exp = self.maintenance_expenses[
             ["amount", "invoice_id", "updated_at"]
         ].rename(columns={"updated_at": "date", "invoice_id": "invoice"})
@@ -1044,7 +1149,9 @@ class RandomGenerator:
         df_exp["amount"] = -df_exp["amount"]
         df_exp["pid"] = self.maintenance_expenses["spend_id"]
         df_exp["gid"] = "ME"
-        # tour
+        return df_exp
+
+    def tournament_payments(self) -> pd.DataFrame:
         df_tour = self.tournaments[["expenses", "invoice_id", "updated_at"]].rename(
             columns={
                 "expenses": "amount",
@@ -1056,96 +1163,155 @@ class RandomGenerator:
         df_tour["amount"] = -df_tour["amount"]
         df_tour["pid"] = self.tournaments["tournament_id"]
         df_tour["gid"] = "T"
-        # participations
+        return df_tour
+
+    def participation_payments(self) -> pd.DataFrame:
         df_part = self.participations[["fee", "invoice_id", "updated_at"]].rename(
             columns={"fee": "amount", "invoice_id": "invoice", "updated_at": "date"}
         )
         df_part["invoice"] = "P" + df_part["invoice"].astype(str)
         df_part["pid"] = self.participations["particip_id"]
         df_part["gid"] = "P"
+        return df_part
+
+    @step(
+        reads=(
+            "inventory",
+            "sales",
+            "rental",
+            "maintenance_expenses",
+            "tournaments",
+            "participations",
+        ),
+        writes=("payments",),
+    )
+    def gen_working_payments(self):
         self.payments = pd.concat(
-            [df_inv, df_sales, df_rent, df_rent_penalty, df_exp, df_tour, df_part],
+            [
+                self.inventory_payments(),
+                self.sales_payments(),
+                self.rental_payments(),
+                self.penalty_payments(),
+                self.expense_payments(),
+                self.tournament_payments(),
+                self.participation_payments(),
+            ],
+            ignore_index=True,
+        )
+
+    @step(
+        reads=("inventory", "maintenance_expenses", "tournaments", "participations"),
+        writes=("payments",),
+    )
+    def gen_stock_payments(self) -> None:
+        # all but the traffic, which is paid for period by period
+        self.payments = pd.concat(
+            [
+                self.inventory_payments(),
+                self.expense_payments(),
+                self.tournament_payments(),
+                self.participation_payments(),
+            ],
             ignore_index=True,
         )
 
+    @step(reads=("payments",), writes=("invoices",))
     def gen_invoices(self) -> None:
         self.invoices = self.payments[["invoice", "date"]]
         self.invoices = self.invoices.drop_duplicates("invoice")
         self.invoices["updated_at"] = self.invoices.loc[:, "date"]
         self.invoices = self.invoices.reset_index(drop=True)
-        self.invoices["invoice_id"] = self.invoices.reset_index()["index"] + 1
+        self.invoices["invoice_id"] = (
+            self.invoices.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("invoices", 0)
+        )
         self.invoices = self.invoices.reindex(
             ["invoice_id", "invoice", "date", "updated_at"], axis=1
         )
 
+    @step(reads=("invoices",), writes=("payments",))
     def gen_payments(self) -> None:
         self.payments = pd.merge(self.payments, self.invoices, on="invoice")[
             ["amount", "invoice_id", "updated_at", "pid", "gid"]
         ]
         self.payments = self.payments.reset_index(drop=True)
-        self.payments["payment_id"] = self.payments.reset_index()["index"] + 1
+        self.payments["payment_id"] = (
+            self.payments.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("payments", 0)
+        )
         self.payments = self.payments.reindex(
             ["payment_id", "amount", "invoice_id", "updated_at", "pid", "gid"], axis=1
         )
 
+    @step(reads=("payments",), writes=("payment_index",))
+    def index_payments(self) -> None:
+        # final payment of every source row, one lookup per payment group
+        self.payment_index = RemapIndex()
+        for gid, group in self.payments.groupby("gid"):
+            self.payment_index.add_ids(gid, group["pid"], group["payment_id"])
+
+    @step(reads=("customers", "games", "city"), writes=("key_index",))
+    def index_keys(self) -> None:
+        self.key_index = RemapIndex()
+        self.key_index.add_ids(
+            "customers",
+            self.customers["previous_customer_id"],
+            self.customers["customer_id"],
+        )
+        self.key_index.add_labels("games", self.games["title"], self.games["game_id"])
+        self.key_index.add_labels("city", self.city["city"], self.city["city_id"])
+
+    @step(reads=("key_index",), writes=("customers",))
     def cleanse_customers(self) -> None:
-        self.customers["city"] = self.customers["city"].map(
-            dict(zip(self.city["city"], self.city["city_id"]))
-        )
+        self.customers["city"] = self.key_index.remap("city", self.customers["city"])
         self.customers = self.customers.rename(columns={"city": "city_id"})
         self.customers.drop(columns=["previous_customer_id"], inplace=True)
 
+    @step(reads=("key_index", "payment_index"), writes=("participations",))
     def cleanse_participations(self) -> None:
         self.participations.rename(columns={"fee": "fee_payment_id"}, inplace=True)
-        self.participations["customer_id"] = self.participations["customer_id"].map(
-            dict(
-                zip(
-                    self.customers["previous_customer_id"],
-                    self.customers["customer_id"],
-                )
-            )
+        self.participations["customer_id"] = self.key_index.remap(
+            "customers", self.participations["customer_id"]
         )
-        self.participations["fee_payment_id"] = self.participations["particip_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "P"]["pid"], self.payments[self.payments["gid"] == "P"]["payment_id"]))
+        self.participations["fee_payment_id"] = self.payment_index.remap(
+            "P", self.participations["particip_id"]
         )
         self.participations.drop(columns=["invoice_id"], inplace=True)
 
+    @step(reads=("key_index", "payment_index"), writes=("tournaments",))
     def cleanse_tournaments(self) -> None:
-        self.tournaments["game"] = self.tournaments["game"].map(
-            dict(zip(self.games["title"], self.games["game_id"]))
+        self.tournaments["game"] = self.key_index.remap(
+            "games", self.tournaments["game"]
         )
         self.tournaments = self.tournaments.rename(
             columns={"game": "game_id", "expenses": "expenses_payments_id"}
         )
-        self.tournaments["expenses_payments_id"] = self.tournaments["tournament_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "T"]["pid"], self.payments[self.payments["gid"] == "T"]["payment_id"]))
+        self.tournaments["expenses_payments_id"] = self.payment_index.remap(
+            "T", self.tournaments["tournament_id"]
         )
         self.tournaments.drop(columns=["tree_levels", "invoice_id"], inplace=True)
 
+    @step(reads=("key_index", "payment_index"), writes=("rental",))
     def cleanse_rental(self) -> None:
-        self.rental["customer_id"] = self.rental["customer_id"].map(
-            dict(
-                zip(
-                    self.customers["previous_customer_id"],
-                    self.customers["customer_id"],
-                )
-            )
+        self.rental["customer_id"] = self.key_index.remap(
+            "customers", self.rental["customer_id"]
         )
         self.rental = self.rental.rename(
             columns={"penalty_payment": "penalty_payment_id", "price": "payment_id"}
         )
-        self.rental["payment_id"] = self.rental["rental_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "R"]["pid"], self.payments[self.payments["gid"] == "R"]["payment_id"]))
+        self.rental["payment_id"] = self.payment_index.remap(
+            "R", self.rental["rental_id"]
         )
-        self.rental["penalty_payment_id"] = self.rental["rental_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "RP"]["pid"], self.payments[self.payments["gid"] == "RP"]["payment_id"]))
+        self.rental["penalty_payment_id"] = self.payment_index.remap(
+            "RP", self.rental["rental_id"]
         )
         self.rental.drop(columns=["invoice", "penalty_invoice"], inplace=True)
 
+    @step(reads=("key_index", "game_prices", "payment_index"), writes=("inventory",))
     def cleanse_inventory(self) -> None:
-        self.inventory["game"] = self.inventory["game"].map(
-            dict(zip(self.games["title"], self.games["game_id"]))
-        )
+        self.inventory["game"] = self.key_index.remap("games", self.inventory["game"])
         self.inventory = self.inventory.rename(
             columns={
                 "game": "game_id",
@@ -1153,22 +1319,24 @@ class RandomGenerator:
                 "purchase_payment": "purchase_payment_id",
             }
         )
-        self.inventory["purchase_payment_id"] = self.inventory["inventory_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "I"]["pid"], self.payments[self.payments["gid"] == "I"]["payment_id"]))
+        self.inventory["purchase_payment_id"] = self.payment_index.remap(
+            "I", self.inventory["inventory_id"]
         )
         self.inventory["price_id"] = self.inventory["price_id"].map(
             dict(zip(self.game_prices["current_price"], self.game_prices["price_id"]))
         )
         self.inventory.drop(columns=["invoice_id"], inplace=True)
 
+    @step(reads=("key_index",), writes=("staff",))
     def cleanse_staff(self) -> None:
-        temp_cities = dict(zip(self.city["city"], self.city["city_id"]))
-        self.staff["city"] = self.staff["city"].map(temp_cities)
+        self.staff["city"] = self.key_index.remap("city", self.staff["city"])
         self.staff.rename(columns={"city": "city_id"}, inplace=True)
 
+    @step(writes=("invoices",))
     def cleanse_invoices(self) -> None:
         self.invoices.drop(columns=["invoice"], inplace=True)
 
+    @step(reads=("expense_titles", "payment_index"), writes=("maintenance_expenses",))
     def cleanse_maintenance_expenses(self) -> None:
         self.maintenance_expenses["title"] = self.maintenance_expenses["title"].map(
             dict(zip(self.expense_titles["title"], self.expense_titles["title_id"]))
@@ -1179,20 +1347,20 @@ class RandomGenerator:
         self.maintenance_expenses = self.maintenance_expenses.rename(
             columns={"title": "title_id"}
         )
-        self.maintenance_expenses["payment_id"] = self.maintenance_expenses[
-            "spend_id"
-        ].map(dict(zip(self.payments[self.payments["gid"] == "ME"]["pid"], self.payments[self.payments["gid"] == "ME"]["payment_id"])))
+        self.maintenance_expenses["payment_id"] = self.payment_index.remap(
+            "ME", self.maintenance_expenses["spend_id"]
+        )
         self.maintenance_expenses = self.maintenance_expenses.reindex(
             ["spend_id", "title_id", "payment_id", "date", "updated_at"], axis=1
         )
 
+    @step(reads=("payment_index",), writes=("sales",))
     def cleanse_sales(self) -> None:
         self.sales = self.sales.rename(columns={"price": "payment_id"})
-        self.sales["payment_id"] = self.sales["sale_id"].map(
-            dict(zip(self.payments[self.payments["gid"] == "S"]["pid"], self.payments[self.payments["gid"] == "S"]["payment_id"]))
-        )
+        self.sales["payment_id"] = self.payment_index.remap("S", self.sales["sale_id"])
         self.sales.drop(columns=["invoice"], inplace=True)
 
+    @step(reads=("game_categories", "game_types"), writes=("games",))
     def cleanse_games(self) -> None:
         self.games["category"] = self.games["category"].map(
             dict(
@@ -1209,11 +1377,13 @@ class RandomGenerator:
             columns={"category": "category_id", "type": "type_id"}
         )
 
+    @step(writes=("payments",))
     def cleanse_payments(self) -> None:
         self.payments = self.payments.drop(columns=["pid", "gid"])
 
-    def prepare_data(self) -> None:
-        pipeline = [
+    def head_steps(self) -> list:
+        # everything that comes before the shop traffic
+        return [
             self.read_prompts,
             self.gen_prompt_dates,
             self.gen_prompt_hours,
@@ -1232,6 +1402,24 @@ class RandomGenerator:
             self.gen_participations,
             self.gen_inventory,
             self.gen_game_prices,
+        ]
+
+    def open_shard_executor(self) -> None:
+        # the date shards are drawn by the processes shared by the steps,
+        # in the calling thread while profiling
+        if profiler.workers(self.config["date_shards"]) > 1:
+            self.shard_executor = ProcessPoolExecutor(
+                max_workers=self.config["date_shards"], mp_context=get_context("spawn")
+            )
+
+    def close_shard_executor(self) -> None:
+        if self.shard_executor is not None:
+            self.shard_executor.shutdown()
+            self.shard_executor = None
+
+    def prepare_data(self) -> None:
+        pipeline = [
+            *self.head_steps(),
             self.gen_sales,
             self.gen_rental,
             self.gen_games,
@@ -1243,6 +1431,8 @@ class RandomGenerator:
             self.gen_working_payments,
             self.gen_invoices,
             self.gen_payments,
+            self.index_payments,
+            self.index_keys,
             self.cleanse_participations,
             self.cleanse_tournaments,
             self.cleanse_rental,
@@ -1257,17 +1447,45 @@ class RandomGenerator:
         ]
         
         bar_format = "Completed data generating steps: {bar:20} {n_fmt}/{total_fmt} (it might take a while)"
-        for fun in tqdm(pipeline, bar_format=bar_format):
-            fun()
+        self.open_shard_executor()
+        try:
+            StepScheduler(pipeline, self.config["pipeline_workers"]).run(bar_format)
+        finally:
+            self.close_shard_executor()
 
     def fetch(self) -> dict:
         """Gather all the final data frames and assign them to the string table names.
+        With a fixed seed, take the data set from the cache if it has been generated
+        before with the same inputs, and save it there otherwise.
 
         Returns:
             dict: A dictionary of table names and the
                 generated data frames.
         """
+        # unseeded data sets are never repeated
+        if self.seed is None or not self.config["cache"]["enabled"]:
+            self.prepare_data()
+            return self.gather()
+        snapshot_cache = SnapshotCache(self.config)
+        key = snapshot_cache.key(self.config, self.seed)
+        result = snapshot_cache.load(key)
+        if result is not None:
+            logging.info("Random values have been taken from the cache.")
+            for table, df in result.items():
+                setattr(self, table, df)
+            return result
         self.prepare_data()
+        result = self.gather()
+        snapshot_cache.save(key, result)
+        return result
+
+    def gather(self) -> dict:
+        """Assign the final data frames to the string table names.
+
+        Returns:
+            dict: A dictionary of table names and the
+                generated data frames.
+        """
         result = {
             "city": self.city,
             "customers": self.customers,
@@ -1291,6 +1509,552 @@ class RandomGenerator:
         }
         return result
 
+    def stream(self) -> Iterator[tuple]:
+        """Generate the data set one month of the shop traffic at a time and pass
+        the tables on in chunks. The sales and the rental of each month, with their
+        invoices and payments, are passed and freed before the next month is drawn;
+        the identifiers continue from the previous months. The other tables are
+        passed at the end. The inventory and the customer activity stay in memory
+        all the time.
+
+        .. note::
+            The months are drawn with their own random streams, so with a fixed seed
+            the data set differs from the one generated at once, but it is the same
+            in every streamed run. It is never cached.
+
+        Yields:
+            tuple: A table name and a data frame chunk of the table.
+        """
+        tail = [
+            self.gen_games,
+            self.gen_game_categories,
+            self.gen_game_types,
+            self.update_streamed_customers,
+            self.gen_real_customers,
+            self.keep_streamed_customer_ids,
+            self.gen_cities,
+            self.gen_stock_payments,
+            self.gen_invoices,
+            self.gen_payments,
+            self.index_payments,
+            self.index_keys,
+            self.cleanse_participations,
+            self.cleanse_tournaments,
+            self.cleanse_customers,
+            self.cleanse_inventory,
+            self.cleanse_staff,
+            self.cleanse_invoices,
+            self.cleanse_maintenance_expenses,
+            self.cleanse_games,
+            self.cleanse_payments,
+        ]
+        bar_format = "Completed data generating steps: {bar:20} {n_fmt}/{total_fmt}"
+        self.open_shard_executor()
+        try:
+            StepScheduler(self.head_steps(), self.config["pipeline_workers"]).run(
+                bar_format
+            )
+            # the copies with the time they are free from as the delivery date
+            stock = self.inventory[
+                ["inventory_id", "game", "destination", "price", "active"]
+            ].set_index(self.inventory["inventory_id"].to_numpy())
+            stock["delivery_date"] = self.inventory["delivery_date"].to_numpy()
+            periods = PeriodGenerator(
+                self, stock, self.customers["customer_id"], self.id_offsets
+            )
+            activity = []
+            months = self.prompt_dates["date"].dt.to_period("M")
+            for month, dates in self.prompt_dates.groupby(months, sort=True):
+                with profiler.measure("generate", f"period {month}") as record:
+                    tables = periods.draw(dates)
+                    record["rows"] = sum(df.shape[0] for df in tables.values())
+                activity.append(
+                    tables["rental"][["customer_id", "updated_at"]]
+                    .groupby("customer_id", as_index=False)
+                    .min()
+                )
+                yield from tables.items()
+                del tables
+            self.customer_activity = pd.concat(activity, ignore_index=True)
+            self.inventory["active"] = stock["active"].to_numpy()
+            del periods, stock
+            StepScheduler(tail, self.config["pipeline_workers"]).run(bar_format)
+        finally:
+            self.close_shard_executor()
+        # the rest, freed one table after another
+        tables = {
+            table: df
+            for table, df in self.gather().items()
+            if table not in ("rental", "sales")
+        }
+        self.random_helpers = None
+        self.payment_index = None
+        self.key_index = None
+        for table in list(tables):
+            setattr(self, table, pd.DataFrame())
+            yield table, tables.pop(table)
+
+
+class PeriodGenerator(RandomGenerator):
+    """Generator of the shop traffic in a period: the sales and the rental, with
+    their invoices and payments. The periods are drawn one after another on the
+    stock left by the previous ones.
+
+    Attributes: The working and final data frames of the traffic, the stock
+        and the numbers of the rows drawn so far.
+
+    Args:
+        parent (RandomGenerator): Generator of the whole data set, with the prompts
+            and the random helpers ready.
+        stock (pd.DataFrame): Inventory indexed by its identifiers, with the time
+            each copy is free from as its delivery date. Updated in place.
+        customer_ids (pd.Series): Identifiers of the customers to draw from.
+        id_offsets (dict): Numbers of the rows drawn before, by the table names.
+            Updated in place.
+    """
+
+    # tables drawn in each period
+    TABLES = ("invoices", "payments", "rental", "sales")
+
+    def __init__(
+        self,
+        parent: RandomGenerator,
+        stock: pd.DataFrame,
+        customer_ids: pd.Series,
+        id_offsets: dict,
+    ) -> None:
+        super().__init__(parent.seed)
+        self.config = parent.config
+        self.seed_sequence = parent.seed_sequence
+        self.random_helpers = parent.random_helpers
+        self.shard_executor = parent.shard_executor
+        self.prompt_hours = parent.prompt_hours
+        self.prompt_games = parent.prompt_games
+        self.stock = stock
+        self.id_offsets = id_offsets
+        self.customers = pd.DataFrame({"customer_id": customer_ids.to_numpy()})
+        # the customers keep their identifiers
+        self.key_index = RemapIndex()
+        self.key_index.add_ids(
+            "customers", self.customers["customer_id"], self.customers["customer_id"]
+        )
+
+    @step(reads=("sales", "rental"), writes=("payments",))
+    def gen_working_payments(self) -> None:
+        self.payments = pd.concat(
+            [self.sales_payments(), self.rental_payments(), self.penalty_payments()],
+            ignore_index=True,
+        )
+
+    def draw(self, dates: pd.DataFrame) -> dict:
+        """Draw the traffic of the given days and update the stock.
+
+        Args:
+            dates (pd.DataFrame): Consecutive rows of the prompt dates.
+
+        Returns:
+            dict: A dictionary of table names and the data frames of the period.
+        """
+        self.period = dates["date"].iloc[0].strftime("%Y-%m-%d")
+        self.prompt_dates = dates.reset_index(drop=True)
+        self.inventory = self.stock
+        self.gen_sales()
+        self.gen_rental()
+        # the rented copies are free again from their last return
+        returns = self.rental.groupby("inventory_id")["return_date"].max().dropna()
+        self.stock.loc[returns.index, "delivery_date"] = returns
+        self.gen_working_payments()
+        self.gen_invoices()
+        self.gen_payments()
+        self.index_payments()
+        self.cleanse_rental()
+        self.cleanse_sales()
+        self.cleanse_invoices()
+        self.cleanse_payments()
+        tables = {table: getattr(self, table) for table in self.TABLES}
+        for table, df in tables.items():
+            self.id_offsets[table] = self.id_offsets.get(table, 0) + df.shape[0]
+            setattr(self, table, pd.DataFrame())
+        self.payment_index = None
+        return tables
+
+
+class AppendGenerator(RandomGenerator):
+    """Generator of the days passed since the last update of the database. It goes on
+    from the database state: the traffic is drawn on the copies in stock, for the
+    customers and the staff in the database, the open rentals are closed once they
+    are returned, the stock is restocked and the tournaments keep their cadence.
+
+    Attributes: The working and final data frames of the new days, the database state,
+        the lifetime dates and the stock.
+
+    Args:
+        state (dict): Rows and values read from the database (see `fillup.read_state`).
+        seed (int): Optional random seed. Defaults to None (the configured one).
+    """
+
+    # tables with the rows continued from the database ones, by their keys
+    CONTINUED = {
+        "expense_types": "expenses_type",
+        "expense_titles": "title",
+        "game_prices": "current_price",
+    }
+
+    def __init__(self, state: dict, seed: int = None) -> None:
+        super().__init__(seed)
+        self.state = state
+        self.id_offsets = dict(state["max_ids"])
+        self.lifetime_dates = pd.DataFrame()
+        self.stock = pd.DataFrame()
+        self.staff = state["staff"]
+        self.customers = state["customers"]
+
+    @step(writes=("prompt_games",))
+    def restrict_prompt_games(self) -> None:
+        # only the games known to the database, in the same proportions
+        self.prompt_games = self.prompt_games.loc[
+            self.prompt_games["name"].isin(self.state["games"]["title"])
+        ].reset_index(drop=True)
+        self.prompt_games["weights"] /= self.prompt_games["weights"].sum()
+
+    @step(writes=("prompt_dates", "lifetime_dates"))
+    def cut_prompt_dates(self) -> None:
+        # the days after the one of the last update
+        self.lifetime_dates = self.prompt_dates
+        self.prompt_dates = self.prompt_dates.loc[
+            self.prompt_dates["date"] > self.state["since"].normalize()
+        ].reset_index(drop=True)
+
+    def continue_rows(self, table: str) -> None:
+        # the rows missing in the database get the next identifiers
+        df = getattr(self, table)
+        known = self.state[table]
+        key = self.CONTINUED[table]
+        new = df.loc[~df[key].isin(known[key])].reset_index(drop=True)
+        new[df.columns[0]] = new.index + 1 + self.id_offsets.get(table, 0)
+        setattr(self, table, pd.concat([known, new], ignore_index=True))
+
+    @step(reads=("maintenance_expenses",), writes=("expense_types",))
+    def continue_expense_types(self) -> None:
+        self.gen_expense_types()
+        self.continue_rows("expense_types")
+
+    @step(reads=("maintenance_expenses", "expense_types"), writes=("expense_titles",))
+    def continue_expense_titles(self) -> None:
+        self.gen_expense_titles()
+        self.continue_rows("expense_titles")
+
+    def tournament_dates(self) -> pd.Series:
+        # the cadence goes on from the last tournament in the database
+        event_info = self.config["event_info"]
+        event_days = self.lifetime_dates.loc[
+            self.lifetime_dates["weekday"] == event_info["weekday"], "date"
+        ].reset_index(drop=True)
+        if pd.isnull(self.state["last_deadline"]):
+            first = event_info["start_offset_weeks"]
+        else:
+            last = np.searchsorted(
+                event_days,
+                self.state["last_deadline"].normalize()
+                + datetime.timedelta(days=event_info["deadline_offset_days"]),
+                side="right",
+            )
+            first = max(last - 1, 0) + event_info["period_weeks"]
+        dates = event_days.iloc[first :: event_info["period_weeks"]]
+        # only the ones with some days to sign up after the last update
+        deadlines = dates - datetime.timedelta(days=event_info["deadline_offset_days"])
+        open_days = self.prompt_dates["date"]
+        window_start = np.searchsorted(
+            open_days,
+            deadlines - datetime.timedelta(days=event_info["can_sign_up_offset_days"]),
+            side="right",
+        )
+        window_end = np.searchsorted(open_days, deadlines, side="left")
+        return dates.loc[window_end > window_start].reset_index(drop=True)
+
+    @step(
+        reads=("tournaments", "lifetime_dates", "random_helpers"),
+        writes=("inventory",),
+    )
+    @seeded
+    def restock_inventory(self, rng: np.random.Generator) -> None:
+        # the deliveries for sale keep their rate from the last one in the database
+        period = int(
+            self.lifetime_dates.shape[0]
+            / (
+                self.config["avg_supply_yearly_rate"]
+                * self.config["shop_lifetime_years"]
+            )
+        )
+        last = np.searchsorted(
+            self.lifetime_dates["date"],
+            self.state["last_delivery"].normalize(),
+            side="right",
+        )
+        positions = np.arange(
+            max(last - 1, 0) + period, self.lifetime_dates.shape[0], period
+        )
+        deliveries = [
+            self.random_helpers.gen_sell_delivery(
+                self.lifetime_dates["volume_sales"].iloc[ix : ix + period].sum(),
+                self.lifetime_dates["date"].iloc[ix],
+                rng,
+            )
+            for ix in positions
+            if self.lifetime_dates["date"].iloc[ix] > self.state["since"].normalize()
+        ]
+        # the tournament copies still missing
+        t_inventory = self.random_helpers.gen_tournament_inventory(
+            self.tournaments, rng
+        )
+        t_missing = t_inventory.groupby("game").cumcount() >= t_inventory["game"].map(
+            self.state["tournament_copies"]
+        ).fillna(0)
+        self.inventory = pd.concat(
+            [*deliveries, t_inventory.loc[t_missing]], ignore_index=True
+        )
+        self.inventory["updated_at"] = self.inventory["delivery_date"]
+        self.inventory = self.inventory.sort_values(by=["updated_at"])
+        self.inventory = self.inventory.reset_index(drop=True)
+        self.inventory["inventory_id"] = (
+            self.inventory.reset_index()["index"]
+            + 1
+            + self.id_offsets.get("inventory", 0)
+        )
+        uniq_dates = np.sort(np.unique(self.inventory["delivery_date"]))
+        invoice_translator = dict(zip(uniq_dates, np.arange(uniq_dates.size) + 1))
+        self.inventory["invoice_id"] = self.inventory["delivery_date"].map(
+            invoice_translator
+        )
+        self.inventory = self.inventory.reindex(
+            [
+                "inventory_id",
+                "game",
+                "destination",
+                "price",
+                "active",
+                "purchase_payment",
+                "invoice_id",
+                "delivery_date",
+                "updated_at",
+            ],
+            axis=1,
+        )
+
+    @step(reads=("inventory",), writes=("game_prices",))
+    def continue_game_prices(self) -> None:
+        self.gen_game_prices()
+        self.continue_rows("game_prices")
+
+    @step(reads=("random_helpers",), writes=("rental",))
+    @seeded
+    def close_open_rental(self, rng: np.random.Generator) -> None:
+        # the games held since the last update are brought back after a while
+        open_rental = self.state["open_rental"]
+        holding_time = rng.gamma(
+            self.config["holding_time_params"]["shape"],
+            scale=self.config["holding_time_params"]["scale"],
+            size=open_rental.shape[0],
+        )
+        dates = pd.DatetimeIndex(open_rental["rental_date"])
+        return_dates = self.random_helpers.proper_return_date(
+            pd.DatetimeIndex(
+                self.state["since"] + pd.to_timedelta(holding_time, unit="D")
+            ).round("s"),
+            dates,
+        )
+        returned = return_dates <= datetime.datetime.today()
+        dates = dates[returned]
+        return_dates = return_dates[returned]
+        price = open_rental["price"].to_numpy()[returned]
+        delta_days = (return_dates - dates).days.to_numpy()
+        late = delta_days > self.config["rental_allowed_days"]
+        rental_id = open_rental["rental_id"].loc[returned].reset_index(drop=True)
+        self.rental = pd.DataFrame(
+            {
+                "rental_id": rental_id,
+                "inventory_id": open_rental["inventory_id"].to_numpy()[returned],
+                "return_date": return_dates,
+                "penalty_payment": np.where(
+                    late,
+                    (price * self.config["penalty_ratio"]).round(2) * delta_days,
+                    np.nan,
+                ),
+                "penalty_invoice": ("PC" + rental_id.astype(str)).where(late),
+                "updated_at": return_dates,
+            }
+        )
+
+    @step(reads=("inventory", "rental"), writes=("stock",))
+    def gen_stock(self) -> None:
+        # the copies with the time they are free from as the delivery date
+        self.stock = pd.concat(
+            [
+                self.state["inventory"],
+                self.inventory[
+                    ["inventory_id", "game", "destination", "price", "active"]
+                    + ["delivery_date"]
+                ],
+            ],
+            ignore_index=True,
+        )
+        self.stock = self.stock.set_index(self.stock["inventory_id"].to_numpy())
+        self.stock.loc[self.rental["inventory_id"], "active"] = True
+        self.stock.loc[self.rental["inventory_id"], "delivery_date"] = self.rental[
+            "return_date"
+        ].to_numpy()
+
+    @step(
+        reads=(
+            "inventory",
+            "rental",
+            "maintenance_expenses",
+            "tournaments",
+            "participations",
+        ),
+        writes=("payments",),
+    )
+    def gen_working_payments(self) -> None:
+        self.payments = pd.concat(
+            [
+                self.inventory_payments(),
+                self.penalty_payments(),
+                self.expense_payments(),
+                self.tournament_payments(),
+                self.participation_payments(),
+            ],
+            ignore_index=True,
+        )
+
+    @step(writes=("key_index",))
+    def index_keys(self) -> None:
+        self.key_index = RemapIndex()
+        self.key_index.add_ids(
+            "customers",
+            self.customers["customer_id"],
+            self.customers["customer_id"],
+        )
+        self.key_index.add_labels(
+            "games", self.state["games"]["title"], self.state["games"]["game_id"]
+        )
+
+    @step(reads=("payment_index",), writes=("rental",))
+    def cleanse_rental(self) -> None:
+        self.rental = self.rental.rename(
+            columns={"penalty_payment": "penalty_payment_id"}
+        )
+        self.rental["penalty_payment_id"] = self.payment_index.remap(
+            "RP", self.rental["rental_id"]
+        )
+        self.rental = self.rental.reindex(
+            ["rental_id", "return_date", "penalty_payment_id", "updated_at"], axis=1
+        )
+
+    def fetch_new(self) -> tuple:
+        """Generate the days since the last update of the database.
+
+        Returns:
+            tuple: Two dictionaries of table names and data frames: the new rows
+                and the changed columns of the existing rows, identified by
+                the first column. Both are empty if the database is up to date.
+        """
+        bar_format = "Completed data generating steps: {bar:20} {n_fmt}/{total_fmt}"
+        StepScheduler(
+            [
+                self.read_prompts,
+                self.gen_prompt_dates,
+                self.gen_prompt_hours,
+                self.prepar_prompt_games,
+                self.restrict_prompt_games,
+                self.gen_prompt_staff_shifts,
+                self.cut_prompt_dates,
+            ],
+            self.config["pipeline_workers"],
+        ).run(bar_format)
+        if self.prompt_dates.empty:
+            logging.info("The database is up to date.")
+            return {}, {}
+        self.open_shard_executor()
+        try:
+            StepScheduler(
+                [
+                    self._assign_random_helpers,
+                    self.gen_maintenance_expenses,
+                    self.continue_expense_types,
+                    self.continue_expense_titles,
+                    self.gen_tournaments,
+                    self.gen_participations,
+                    self.restock_inventory,
+                    self.continue_game_prices,
+                    self.close_open_rental,
+                    self.gen_stock,
+                ],
+                self.config["pipeline_workers"],
+            ).run(bar_format)
+            periods = PeriodGenerator(
+                self, self.stock, self.customers["customer_id"], self.id_offsets
+            )
+            traffic = []
+            months = self.prompt_dates["date"].dt.to_period("M")
+            for month, dates in self.prompt_dates.groupby(months, sort=True):
+                with profiler.measure("generate", f"period {month}") as record:
+                    traffic.append(periods.draw(dates))
+                    record["rows"] = sum(df.shape[0] for df in traffic[-1].values())
+            self.inventory["active"] = self.stock.loc[
+                self.inventory["inventory_id"], "active"
+            ].to_numpy()
+            StepScheduler(
+                [
+                    self.gen_working_payments,
+                    self.gen_invoices,
+                    self.gen_payments,
+                    self.index_payments,
+                    self.index_keys,
+                    self.cleanse_participations,
+                    self.cleanse_tournaments,
+                    self.cleanse_rental,
+                    self.cleanse_inventory,
+                    self.cleanse_invoices,
+                    self.cleanse_maintenance_expenses,
+                    self.cleanse_payments,
+                ],
+                self.config["pipeline_workers"],
+            ).run(bar_format)
+        finally:
+            self.close_shard_executor()
+        new_rows = {
+            table: self.gather()[table].loc[
+                lambda df: df.iloc[:, 0] > self.state["max_ids"].get(table, 0)
+            ]
+            for table in (
+                *self.CONTINUED,
+                "inventory",
+                "maintenance_expenses",
+                "tournaments",
+                "participations",
+            )
+        }
+        for table in PeriodGenerator.TABLES:
+            new_rows[table] = pd.concat(
+                [tables[table] for tables in traffic]
+                + ([getattr(self, table)] if table in ("invoices", "payments") else []),
+                ignore_index=True,
+            )
+        # the copies given out or brought back
+        known = self.state["inventory"]
+        active = self.stock.loc[known["inventory_id"], "active"].to_numpy()
+        changed = active != known["active"].to_numpy()
+        updated_rows = {
+            "rental": self.rental,
+            "inventory": pd.DataFrame(
+                {
+                    "inventory_id": known["inventory_id"].to_numpy()[changed],
+                    "active": active[changed],
+                }
+            ),
+        }
+        return new_rows, updated_rows
+
 
 def generate_data() -> dict:
     """Generate the random data set. Log the success info.
@@ -1301,3 +2065,31 @@ def generate_data() -> dict:
     data = RandomGenerator().fetch()
     logging.info("Random values have been generated.")
     return data
+
+
+def continue_data(state: dict) -> tuple:
+    """Generate the days passed since the last update of the database.
+    Log the success info.
+
+    Args:
+        state (dict): Rows and values read from the database.
+
+    Returns:
+        tuple: Two dictionaries of table names and data frames:
+            the new rows and the changed columns of the existing rows.
+    """
+    new_rows, updated_rows = AppendGenerator(state).fetch_new()
+    if new_rows:
+        logging.info("Random values have been generated.")
+    return new_rows, updated_rows
+
+
+def stream_data() -> Iterator[tuple]:
+    """Generate the random data set month by month and pass it on in chunks.
+    Log the success info once all of it is generated.
+
+    Yields:
+        tuple: A table name and a data frame chunk of the table.
+    """
+    yield from RandomGenerator().stream()
+    logging.info("Random values have been generated.")
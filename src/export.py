@@ -0,0 +1,243 @@
+"""Offline export of the entire data set to the files, without a database."""
+
+import datetime
+import gzip
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet
+
+from src.fillup import DBArchitect
+
+FORMATS = ("parquet", "csv", "sql")
+
+
+def sql_literal(value: Any) -> str:
+    """Write a single value the way MySQL reads it in an INSERT statement.
+
+    Args:
+        value (Any): Some value of a data frame cell.
+
+    Returns:
+        str: A SQL literal.
+    """
+    if value is None or (not isinstance(value, str) and pd.isnull(value)):
+        return "NULL"
+    if isinstance(value, (bool, np.bool_)):
+        return str(int(value))
+    if isinstance(value, (int, float, np.number)):
+        return str(value)
+    if isinstance(value, (datetime.date, np.datetime64)):
+        return pd.Timestamp(value).strftime("'%Y-%m-%d %H:%M:%S'")
+    text = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{text}'"
+
+
+def sql_rows(df: pd.DataFrame) -> pd.Series:
+    """Turn the rows into tuples of SQL literals, column by column.
+
+    Args:
+        df (pd.DataFrame): Some data frame.
+
+    Returns:
+        pd.Series: Rows written as `(value,value,...)`.
+    """
+    columns = []
+    for _, values in df.items():
+        if pd.api.types.is_datetime64_any_dtype(values):
+            literals = values.dt.strftime("'%Y-%m-%d %H:%M:%S'")
+        elif pd.api.types.is_bool_dtype(values):
+            literals = values.astype(int).astype(str)
+        elif (
+            pd.api.types.is_float_dtype(values)
+            and (values.dropna() == values.dropna().round()).all()
+        ):
+            literals = values.astype("Int64").astype(str)
+        elif pd.api.types.is_numeric_dtype(values):
+            literals = values.astype(str)
+        else:
+            literals = values.map(sql_literal, na_action="ignore")
+        columns.append(literals.where(values.notnull(), "NULL"))
+    return "(" + pd.concat(columns, axis=1).agg(",".join, axis=1) + ")"
+
+
+class DataExporter:
+    """Writer of the generated tables to the files. Every table is written
+    on a separate thread, in chunks of the rows, so that the converted copy
+    of a whole table is never kept in memory. Reads the chunk size and
+    the number of the workers from the loading configuration file.
+
+    Attributes:
+        directory: Path of the output directory.
+        config: A loading configuration dictionary.
+
+    Args:
+        directory (Path): Path of the output directory.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        with open(Path("config/fillup.settings.json"), "r") as f:
+            self.config = json.load(f)
+
+    def chunks(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        """Split the data frame into the chunks of the configured size.
+
+        Args:
+            df (pd.DataFrame): Some data frame.
+
+        Yields:
+            pd.DataFrame: Subsequent chunks of the rows.
+        """
+        chunk_size = self.config["chunk_size"]
+        for chunk_start in range(0, df.shape[0], chunk_size):
+            yield df.iloc[chunk_start : chunk_start + chunk_size]
+
+    def write_parquet(self, table: str, df: pd.DataFrame) -> Path:
+        """Write the table as a Parquet file, one row group per chunk.
+
+        Args:
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+
+        Returns:
+            Path: Path of the written file.
+        """
+        path = self.directory / f"{table}.parquet"
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        # the database keeps the seconds only
+        with parquet.ParquetWriter(
+            path, schema, coerce_timestamps="us", allow_truncated_timestamps=True
+        ) as writer:
+            for chunk in self.chunks(df):
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                )
+        return path
+
+    def write_csv(self, table: str, df: pd.DataFrame) -> Path:
+        """Write the table as a gzip-compressed CSV file with a header,
+        quoted the standard way, so that any CSV reader takes it as it is.
+
+        Args:
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+
+        Returns:
+            Path: Path of the written file.
+        """
+        path = self.directory / f"{table}.csv.gz"
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+            df.head(0).to_csv(f, index=False, lineterminator="\n")
+            for chunk in self.chunks(df):
+                chunk.to_csv(
+                    f,
+                    index=False,
+                    header=False,
+                    date_format="%Y-%m-%d %H:%M:%S",
+                    lineterminator="\n",
+                )
+        return path
+
+    def write_sql(self, table: str, df: pd.DataFrame) -> Path:
+        """Write the multi-row INSERT statements of the table to a part
+        of the SQL dump.
+
+        Args:
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+
+        Returns:
+            Path: Path of the written part.
+        """
+        path = self.directory / f"{table}.sql.part"
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(f"\n-- Data of table `{table}`\n\n")
+            f.write(f"LOCK TABLES `{table}` WRITE;\n")
+            f.write(f"/*!40000 ALTER TABLE `{table}` DISABLE KEYS */;\n")
+            columns = ",".join(f"`{column}`" for column in df.columns)
+            for chunk in self.chunks(df):
+                f.write(f"INSERT INTO `{table}` ({columns}) VALUES ")
+                f.write(",".join(sql_rows(chunk)) + ";\n")
+            f.write(f"/*!40000 ALTER TABLE `{table}` ENABLE KEYS */;\n")
+            f.write("UNLOCK TABLES;\n")
+        return path
+
+    def merge_sql(self, parts: list) -> Path:
+        """Join the table parts into a single dump, together with
+        the table, constraint, index and view definitions. The constraints,
+        the indexes and the summary tables come after the data. Remove
+        the parts afterwards.
+
+        Args:
+            parts (list): Paths of the parts in the order of the tables.
+
+        Returns:
+            Path: Path of the dump.
+        """
+        path = self.directory / "dump.sql"
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("-- Geeks & Dragons data dump\n\n")
+            f.write("SET NAMES utf8mb4;\n")
+            f.write("SET FOREIGN_KEY_CHECKS=0;\n")
+            f.write("SET UNIQUE_CHECKS=0;\n\n")
+            for statement in DBArchitect.read_statements("tables"):
+                if statement.strip():
+                    f.write(statement.strip() + ";\n")
+            for part in parts:
+                with open(part, "r", encoding="utf-8") as part_file:
+                    shutil.copyfileobj(part_file, f)
+                os.remove(part)
+            f.write("\n")
+            for q_type in ("constraints", "indexes", "views", "summaries"):
+                for statement in DBArchitect.read_statements(q_type):
+                    if statement.strip():
+                        f.write(statement.strip() + ";\n")
+            f.write("\nSET UNIQUE_CHECKS=1;\n")
+            f.write("SET FOREIGN_KEY_CHECKS=1;\n")
+        return path
+
+    def run(self, random_data: dict, file_format: str) -> Path:
+        """Write all the tables in the given format, in parallel.
+
+        Args:
+            random_data (dict): A dictionary of table names and the
+                generated data frames.
+            file_format (str): One of `parquet`, `csv` and `sql`.
+
+        Raises:
+            ValueError: If the format is unknown.
+
+        Returns:
+            Path: Path of the output directory.
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown export format '{file_format}'")
+        writer = getattr(self, f"write_{file_format}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.config["workers"]) as executor:
+            paths = list(executor.map(writer, random_data, random_data.values()))
+        if file_format == "sql":
+            self.merge_sql(paths)
+        return self.directory
+
+
+def export(random_data: dict, file_format: str) -> None:
+    """Write the data set to a new directory in `exports`. Log the success info.
+
+    Args:
+        random_data (dict): A dictionary of table names and the
+            generated data frames.
+        file_format (str): One of `parquet`, `csv` and `sql`.
+    """
+    directory = Path(f"exports/{datetime.datetime.today().strftime('%y%m%d%H%M')}")
+    DataExporter(directory).run(random_data, file_format)
+    logging.info(f"Random values have been exported to '{directory}'.")
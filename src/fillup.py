@@ -1,15 +1,25 @@
 """Features related to the database creation and inserting the entire data set."""
 
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterator
 
-import pandas as pd
-from typing import Any 
 import numpy as np
-from mysql.connector.errors import ProgrammingError
+import pandas as pd
+from mysql.connector.abstracts import MySQLConnectionAbstract
+from mysql.connector.cursor import MySQLCursor
+from mysql.connector.errors import Error
 from tqdm import tqdm
 
-from src.connection import DBConnector, DBEngineer, SQLError
+from src.connection import DBConnectionPool, DBConnector, DBEngineer, SQLError
+from src.profiling import profiler
 
 
 def modify_safely(fun: callable) -> callable:
@@ -26,19 +36,48 @@ def modify_safely(fun: callable) -> callable:
 
     def wrapper(*args):
         self: DBEngineer = args[0]
+        backend = self.db_connector.backend
         with self.cursor() as crsr:
-            crsr.execute("SET FOREIGN_KEY_CHECKS=0;")
+            crsr.execute(backend.foreign_key_checks(False))
             try:
                 result = fun(*args)
-            except ProgrammingError as err:
+            except backend.errors as err:
                 raise SQLError(f"Error in execution: {err}")
             else:
-                crsr.execute("SET FOREIGN_KEY_CHECKS=1;")
+                crsr.execute(backend.foreign_key_checks(True))
                 return result
 
     return wrapper
 
 
+# server or client refusing the LOAD DATA LOCAL INFILE statement
+LOCAL_INFILE_ERRNOS = (1148, 2068, 3948)
+
+
+def csv_safe_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Prepare the data frame to be written as a CSV file for LOAD DATA.
+    Booleans become integers, integral floats (with the nans) become nullable
+    integers and backslashes in the texts are escaped.
+
+    Args:
+        df (pd.DataFrame): Some data frame.
+
+    Returns:
+        pd.DataFrame: A converted copy of the data frame.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_bool_dtype(df[col]):
+            df[col] = df[col].astype(int)
+        elif pd.api.types.is_float_dtype(df[col]):
+            values = df[col].dropna()
+            if (values == values.round()).all():
+                df[col] = df[col].astype("Int64")
+        elif pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+            df[col] = df[col].str.replace("\\", "\\\\", regex=False)
+    return df
+
+
 class DBArchitect(DBEngineer):
     """A structure creator. Handles both tables and views cases.
 
@@ -57,15 +96,22 @@ class DBArchitect(DBEngineer):
             q_type (str): Type of an object group to be created.
 
         Raises:
-            ValueError: If the type is other than tables or views.
+            ValueError: If the type is other than tables, constraints,
+                indexes, views or summaries.
 
         Returns:
             str: A list of statements.
         """
         if q_type == "tables":
             file_path = Path("sql/tables.sql")
+        elif q_type == "constraints":
+            file_path = Path("sql/constraints.sql")
+        elif q_type == "indexes":
+            file_path = Path("sql/indexes.sql")
         elif q_type == "views":
             file_path = Path("sql/views.sql")
+        elif q_type == "summaries":
+            file_path = Path("sql/summaries.sql")
         else:
             raise ValueError(f"Unknown object type '{q_type}'")
         with open(file_path, "r") as f:
@@ -86,9 +132,7 @@ class DBArchitect(DBEngineer):
 
         with self.cursor(commit=True) as crsr:
             crsr.execute(
-                f"""SELECT table_name
-                            FROM information_schema.{q_type}
-                            WHERE table_schema = '{db_name}';"""
+                self.db_connector.backend.list_objects(q_type, db_name)
             )  # NOTE that only two q_types accepted
             elems = [row[0] for row in crsr.fetchall()]
             for elem in elems:
@@ -96,14 +140,15 @@ class DBArchitect(DBEngineer):
 
     @modify_safely
     def create(self, q_type: str) -> None:
-        """Create all the the tables/views in the database.
+        """Create all the the tables/constraints/indexes/views/summaries in the database.
 
         Args:
-            q_type (str): Type of an object group to be created (tables, views).
+            q_type (str): Type of an object group to be created
+                (tables, constraints, indexes, views, summaries).
         """
         with self.cursor(commit=True) as crsr:
             for query in self.read_statements(q_type):
-                crsr.execute(query)
+                crsr.execute(self.db_connector.backend.translate(query))
 
     def build(self, q_type: str) -> None:
         """Build a database sector by dropping a group of objects and
@@ -116,63 +161,337 @@ class DBArchitect(DBEngineer):
         self.create(q_type)
 
     def run(self) -> None:
-        """Prepare a database by building the tables and the views."""
+        """Prepare a database by building the tables and the views.
+        The tables get only their primary keys, see `constrain`.
+        """
         self.build("tables")
         self.build("views")
 
+    def constrain(self) -> None:
+        """Add the unique constraints and the foreign keys to the filled tables.
+        Building their indexes once is faster than updating them
+        with every inserted row.
+        """
+        self.create("constraints")
+
+    def index(self) -> None:
+        """Add the indexes of the columns the views join and group on
+        to the filled tables. Check if the views use them afterwards.
+        """
+        self.create("indexes")
+        self.check_indexes()
+
+    def check_indexes(self) -> None:
+        """Compare the query plans of the views with the indexes meant for them,
+        as listed in the comments of the index file. Warn about the unused ones.
+        """
+        expected = {}
+        for statement in self.read_statements("indexes"):
+            match = re.search(r"-- (.*)\s+CREATE INDEX (\w+)", statement)
+            if match:
+                for view in match.group(1).split(", "):
+                    expected.setdefault(view, set()).add(match.group(2))
+        with self.cursor() as crsr:
+            for view, indexes in expected.items():
+                used = self.db_connector.backend.explain(crsr, f"SELECT * FROM {view}")
+                for index in indexes - used:
+                    logging.warning(f"View '{view}' does not use the index '{index}'.")
+
+    def materialize(self) -> None:
+        """Store the report views as the `mv_` summary tables, replacing
+        the previous ones, so that the report reads the ready results.
+        """
+        self.create("summaries")
+
 
 class DBFiller(DBEngineer):
     """Database filler. Inserts all the records into the prepared database.
+    Reads the loading settings from the configuration file.
 
     Attributes:
         db_connector: A custom data base connector.
+        config: A loading configuration dictionary.
+        load_stats: A dictionary of table names and their loading statistics.
+        local_infile: Whether the local infile loader is still in use.
+            It is turned off for good once the server refuses it.
 
     Args:
         db_connector (DBConnector): A custom data base connector.
     """
+
+    def __init__(self, db_connector: DBConnector) -> None:
+        super().__init__(db_connector)
+        with open(Path("config/fillup.settings.json"), "r") as f:
+            self.config = json.load(f)
+        self.load_stats = {}
+        self.local_infile = self.config["local_infile"]["enabled"]
+        # the tables can be filled on several threads at once
+        self._lock = threading.Lock()
+
     @staticmethod
-    def _sqlize_nans(value: Any) -> Any:
-        """Replace numpy nan with sql null.
+    def _sqlize_nans(df: pd.DataFrame) -> list:
+        """Replace numpy nans with sql nulls, column by column, and get the rows.
 
         Args:
-            value (Any): Some value.
+            df (pd.DataFrame): Some data frame.
 
         Returns:
-            Any: Safe, not-nan value.
+            list: A list of safe, not-nan row tuples.
         """
-        if pd.isnull(value):
-            return None
-        else:
-            return value
+        columns = []
+        for col in df.columns:
+            values = df[col].to_numpy(dtype=object)
+            values[pd.isnull(values)] = None
+            columns.append(values)
+        return list(zip(*columns))
+
+    @staticmethod
+    def _native_columns(df: pd.DataFrame) -> list:
+        """Convert the whole columns at once to the plain values, the timestamps
+        to the `YYYY-MM-DD HH:MM:SS` texts, with sql nulls instead of nans.
+
+        Args:
+            df (pd.DataFrame): Some data frame.
+
+        Returns:
+            list: A list of the converted column arrays.
+        """
+        columns = []
+        for col in df.columns:
+            nulls = df[col].isnull().to_numpy()
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                texts = np.datetime_as_string(
+                    df[col].to_numpy().astype("datetime64[s]"), unit="s"
+                )
+                values = pd.Series(texts).str.replace("T", " ", regex=False)
+            else:
+                values = df[col]
+            values = values.to_numpy(dtype=object)
+            values[nulls] = None
+            columns.append(values)
+        return columns
+
+    def _insert(
+        self, crsr: MySQLCursor, table: str, df: pd.DataFrame, bar: tqdm = None
+    ) -> None:
+        """Insert the rows in multi-row batches of the configured size.
+        An in-process database takes all the rows in one call instead,
+        read straight from the converted columns.
+
+        Args:
+            crsr (MySQLCursor): A cursor.
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+            bar (tqdm, optional): A progress bar of the inserted rows. Defaults to None.
+        """
+        chunk_size = self.config["chunk_size"]
+        placeholder = self.db_connector.backend.placeholder
+        statement = (
+            f"INSERT INTO {table} VALUES ({','.join([placeholder] * df.shape[1])})"
+        )
+        if self.db_connector.backend.in_process:
+            crsr.executemany(statement, zip(*self._native_columns(df)))
+            if bar is not None:
+                bar.update(df.shape[0])
+            return
+        for chunk_start in range(0, df.shape[0], chunk_size):
+            chunk = df.iloc[chunk_start : chunk_start + chunk_size]
+            crsr.executemany(statement, self._sqlize_nans(chunk))
+            if bar is not None:
+                bar.update(chunk.shape[0])
 
-    def fill_table(self, table: str, df: pd.DataFrame) -> None:
-        """Fill one database table with the data provided.
+    @staticmethod
+    def _load_infile(crsr: MySQLCursor, table: str, df: pd.DataFrame) -> None:
+        """Write the rows to a temporary CSV file and load it with
+        the native MySQL bulk loader. Remove the file afterwards.
+
+        Args:
+            crsr (MySQLCursor): A cursor.
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+        """
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False, encoding="utf-8", newline=""
+        ) as f:
+            csv_safe_frame(df).to_csv(
+                f,
+                index=False,
+                header=False,
+                na_rep="\\N",
+                date_format="%Y-%m-%d %H:%M:%S",
+                lineterminator="\n",
+            )
+        try:
+            crsr.execute(
+                f"""LOAD DATA LOCAL INFILE '{Path(f.name).as_posix()}'
+                    INTO TABLE {table} CHARACTER SET utf8mb4
+                    FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY '\\\\'
+                    LINES TERMINATED BY '\\n';"""
+            )
+        finally:
+            os.remove(f.name)
+
+    def fill_table(
+        self,
+        table: str,
+        df: pd.DataFrame,
+        conn: MySQLConnectionAbstract = None,
+        bar: tqdm = None,
+    ) -> None:
+        """Fill one database table with the data provided. The rows are sent
+        in multi-row batches of the configured size, or with the local infile
+        loader if it is enabled for the table. Save the loading speed.
 
         Args:
             table (str): A table name.
             df (pd.DataFrame): Data frame representation of the table.
                 It has to keep the column order given by the database.
+            conn (MySQLConnectionAbstract, optional): A pool connection to be used.
+                Its transaction is left uncommitted. Defaults to None (the main one).
+            bar (tqdm, optional): A progress bar of the inserted rows. Defaults to None.
         """
         # ! TODO: test the errors if the col number does not match
-       
-        with self.cursor(commit=True) as crsr:
-            for row in df.values.tolist():
-                statement = f"INSERT INTO {table} VALUES ({','.join(['%s'] * len(row))});"
-                crsr.execute(statement, [self._sqlize_nans(val) for val in row])
+        start = time.perf_counter()
+        with profiler.measure("fill", table) as record:
+            record["rows"] = df.shape[0]
+            with self.cursor(commit=conn is None, conn=conn) as crsr:
+                if (
+                    self.db_connector.backend.local_infile
+                    and self.local_infile
+                    and table in self.config["local_infile"]["tables"]
+                ):
+                    try:
+                        self._load_infile(crsr, table, df)
+                        if bar is not None:
+                            bar.update(df.shape[0])
+                    except Error as err:
+                        if err.errno not in LOCAL_INFILE_ERRNOS:
+                            raise
+                        logging.warning(
+                            f"Local infile loading is disabled ({err.msg})."
+                            + " Falling back to the INSERT statements."
+                        )
+                        with self._lock:
+                            self.local_infile = False
+                        self._insert(crsr, table, df, bar)
+                else:
+                    self._insert(crsr, table, df, bar)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            # a streamed table comes in several chunks
+            stats = self.load_stats.setdefault(table, {"rows": 0, "seconds": 0})
+            stats["rows"] += df.shape[0]
+            stats["seconds"] += elapsed
+            stats["rows_per_second"] = (
+                stats["rows"] / stats["seconds"] if stats["seconds"] else float("inf")
+            )
+
+    def log_load_stats(self) -> None:
+        """Log the loading speed of every filled table."""
+        for table, stats in self.load_stats.items():
+            logging.info(
+                f"Table '{table}': {stats['rows']} rows in {stats['seconds']:.2f} s"
+                + f" ({stats['rows_per_second']:.0f} rows/s)."
+            )
+
+    def _fill_pooled(
+        self, pool: DBConnectionPool, table: str, df: pd.DataFrame, bar: tqdm
+    ) -> None:
+        """Fill one database table using a connection borrowed from the pool.
+
+        Args:
+            pool (DBConnectionPool): A pool of connections.
+            table (str): A table name.
+            df (pd.DataFrame): Data frame representation of the table.
+            bar (tqdm): A progress bar of the inserted rows.
+        """
+        with pool.connection() as conn:
+            self.fill_table(table, df, conn=conn, bar=bar)
+
+    def fill_tables_in_parallel(self, random_data: dict) -> None:
+        """Fill the database tables at the same time, each on a separate connection
+        from the pool. Display the progress of every table as a bar in the terminal.
+        Commit the connections only once every table is filled, so that a failed
+        table leaves no data saved. The commits themselves go one after another,
+        so if one of them fails, the tables committed before it keep their rows
+        (the next push rebuilds the tables anyway).
+
+        Args:
+            random_data (dict): A dictionary of table names and the
+                generated data frames.
+        """
+        workers = self.config["workers"]
+        # the largest tables go first to balance the work
+        tables = sorted(
+            random_data, key=lambda table: random_data[table].shape[0], reverse=True
+        )
+        bar_format = "{desc:22} {bar:20} {n_fmt}/{total_fmt} rows"
+        bars = {
+            table: tqdm(
+                total=random_data[table].shape[0],
+                desc=table,
+                position=i,
+                bar_format=bar_format,
+            )
+            for i, table in enumerate(tables)
+        }
+        pool = DBConnectionPool(self.db_connector, workers)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._fill_pooled, pool, table, random_data[table], bars[table]
+                    )
+                    for table in tables
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            pool.commit()
+        finally:
+            for bar in bars.values():
+                bar.close()
+            pool.close()
 
     @modify_safely
     def fill_all_tables(self, random_data: dict) -> None:
         """Fill all the database tables with the data provided.
         Use the `fill_table` method multiple times and display the progress
-        as a bar in the terminal.
+        as a bar in the terminal. If more than one worker is configured
+        and the run is not profiled, load the tables in parallel.
 
         Args:
             random_data (dict): A dictionary of table names and the
                 generated data frames.
         """
-        bar_format = "Filled tables: {bar:20} {n_fmt}/{total_fmt} (it might take longer a while)"
-        for table, df in tqdm(random_data.items(), bar_format=bar_format):
-            self.fill_table(table, df)        
+        workers = profiler.workers(self.config["workers"])
+        if workers > 1 and self.db_connector.backend.parallel_writes:
+            self.fill_tables_in_parallel(random_data)
+        else:
+            bar_format = "Filled tables: {bar:20} {n_fmt}/{total_fmt} (it might take longer a while)"
+            for table, df in tqdm(random_data.items(), bar_format=bar_format):
+                self.fill_table(table, df)
+        self.log_load_stats()
+
+    @modify_safely
+    def fill_stream(self, chunks: Iterator[tuple]) -> None:
+        """Fill the database tables with the chunks as they come. Commit every chunk
+        right away, so that none of them has to be kept after it is loaded.
+        Display the number of the loaded rows in the terminal.
+
+        Args:
+            chunks (Iterator[tuple]): Pairs of a table name and a data frame
+                chunk of the table.
+        """
+        bar_format = "Filled rows: {n_fmt} [{elapsed}, {rate_fmt}]"
+        with tqdm(bar_format=bar_format, unit="rows") as bar:
+            for table, df in chunks:
+                self.fill_table(table, df, bar=bar)
+        self.log_load_stats()
 
     def run(self, random_data: dict):
         """Fill all the tables in the database. Use the `fill_all_tables` method.
@@ -184,6 +503,235 @@ class DBFiller(DBEngineer):
         self.fill_all_tables(random_data)
 
 
+# tables of the events, with the last update of the database
+APPEND_DATES = (
+    "invoices",
+    "inventory",
+    "maintenance_expenses",
+    "rental",
+    "sales",
+    "tournaments",
+)
+# tables continued in the append mode, with their identifiers
+APPEND_IDS = {
+    "expense_titles": "title_id",
+    "expense_types": "expenses_type_id",
+    "game_prices": "price_id",
+    "inventory": "inventory_id",
+    "invoices": "invoice_id",
+    "maintenance_expenses": "spend_id",
+    "participations": "particip_id",
+    "payments": "payment_id",
+    "rental": "rental_id",
+    "sales": "sale_id",
+    "tournaments": "tournament_id",
+}
+
+
+class DBAppender(DBFiller):
+    """Database appender. Continues the data already in the database with the days
+    which have passed since its last update, instead of rebuilding it.
+
+    The new days are generated from the database state: the copies in stock,
+    the rentals still open, the customers, the staff, the games and the prices.
+    The new rows are inserted with the identifiers following the current maxima
+    and the existing rows which changed (the closed rentals and the copies given
+    out or brought back) are updated.
+
+    Attributes:
+        db_connector: A custom data base connector.
+        config: A loading configuration dictionary.
+        load_stats: A dictionary of table names and their loading statistics.
+        local_infile: Whether the local infile loader is still in use.
+            It is turned off for good once the server refuses it.
+
+    Args:
+        db_connector (DBConnector): A custom data base connector.
+    """
+
+    def _read(self, query: str) -> pd.DataFrame:
+        """Run a query on the database.
+
+        Args:
+            query (str): A SELECT statement.
+
+        Returns:
+            pd.DataFrame: The rows returned, with the column names of the query.
+        """
+        with self.cursor() as crsr:
+            crsr.execute(query)
+            rows = crsr.fetchall()
+            colnames = [col for col, *info in crsr.description]
+        return pd.DataFrame(rows, columns=colnames)
+
+    def _read_value(self, query: str) -> object:
+        """Run a query returning a single value, such as an aggregate.
+
+        Args:
+            query (str): A SELECT statement.
+
+        Returns:
+            object: The value in the first column of the first row,
+                None if it is NULL.
+        """
+        value = self._read(query).iloc[0, 0]
+        return None if pd.isnull(value) else value
+
+    def last_update(self) -> pd.Timestamp:
+        """Find the latest update of the event tables.
+
+        Raises:
+            SQLError: If the tables are empty.
+
+        Returns:
+            pd.Timestamp: Time of the last update.
+        """
+        query = " UNION ALL ".join(
+            f"SELECT MAX(updated_at) last_update FROM {table}" for table in APPEND_DATES
+        )
+        last_update = pd.to_datetime(self._read(query)["last_update"]).max()
+        if pd.isnull(last_update):
+            raise SQLError("There is no data to append to. Fill the database first.")
+        return last_update
+
+    def read_inventory(self) -> pd.DataFrame:
+        """Read the copies which can still be sold, rented or used in the tournaments,
+        with the time each of them is free from as the delivery date.
+
+        Returns:
+            pd.DataFrame: The copies with their games and prices.
+        """
+        inventory = self._read("""SELECT i.inventory_id, g.title game, i.destination,
+                p.current_price price, i.active, i.delivery_date
+            FROM inventory i
+            JOIN games g ON g.game_id = i.game_id
+            LEFT JOIN game_prices p ON p.price_id = i.price_id
+            WHERE i.active = TRUE OR i.destination <> 'S'""")
+        returns = self._read("""SELECT inventory_id, MAX(return_date) last_return
+            FROM rental GROUP BY inventory_id""")
+        inventory = inventory.merge(returns, on="inventory_id", how="left")
+        inventory["price"] = inventory["price"].astype(float)
+        inventory["active"] = inventory["active"].astype(bool)
+        inventory["delivery_date"] = pd.to_datetime(
+            inventory["last_return"].fillna(inventory["delivery_date"])
+        )
+        return inventory.drop(columns="last_return")
+
+    def read_state(self) -> dict:
+        """Read the state of the database the new days are generated from.
+
+        Returns:
+            dict: The time of the last update (`since`), the last sign-up deadline
+                and delivery for sale, the current maxima of the
+                identifiers (`max_ids`), the number of the tournament copies by
+                games and the data frames: the copies in stock (`inventory`), the
+                open rentals with their prices, the customers, the staff, the games,
+                the prices and the expense titles and types.
+        """
+        max_ids = {
+            table: int(self._read_value(f"SELECT MAX({pk}) FROM {table}") or 0)
+            for table, pk in APPEND_IDS.items()
+        }
+        inventory = self.read_inventory()
+        open_rental = self._read(
+            """SELECT r.rental_id, r.inventory_id, r.rental_date, p.amount price
+            FROM rental r JOIN payments p ON p.payment_id = r.payment_id
+            WHERE r.return_date IS NULL"""
+        )
+        open_rental["rental_date"] = pd.to_datetime(open_rental["rental_date"])
+        open_rental["price"] = open_rental["price"].astype(float)
+        staff = self._read(
+            "SELECT staff_id, first_name, last_name, current_salary, to_date FROM staff"
+        )
+        staff["current_salary"] = staff["current_salary"].astype(float)
+        staff["to_date"] = pd.to_datetime(staff["to_date"])
+        game_prices = self._read("SELECT price_id, current_price FROM game_prices")
+        game_prices["current_price"] = game_prices["current_price"].astype(float)
+        tournament_copies = inventory.loc[inventory["destination"] == "T", "game"]
+        return {
+            "since": self.last_update(),
+            "last_deadline": pd.to_datetime(
+                self._read_value("SELECT MAX(sign_up_deadline) FROM tournaments")
+            ),
+            "last_delivery": pd.to_datetime(
+                self._read_value(
+                    "SELECT MAX(delivery_date) FROM inventory WHERE destination = 'S'"
+                )
+            ),
+            "max_ids": max_ids,
+            "inventory": inventory,
+            "tournament_copies": tournament_copies.value_counts(),
+            "open_rental": open_rental,
+            "customers": self._read("SELECT customer_id FROM customers"),
+            "staff": staff,
+            "games": self._read("SELECT game_id, title FROM games"),
+            "game_prices": game_prices,
+            "expense_titles": self._read("SELECT title_id, title FROM expense_titles"),
+            "expense_types": self._read(
+                "SELECT expenses_type_id, expenses_type FROM expense_types"
+            ),
+        }
+
+    def update_table(self, table: str, df: pd.DataFrame) -> None:
+        """Update the existing rows of one database table, identified
+        by the first column, with the values of the other columns.
+
+        Args:
+            table (str): A table name.
+            df (pd.DataFrame): The changed columns of the rows.
+        """
+        placeholder = self.db_connector.backend.placeholder
+        assignments = ", ".join(f"{col} = {placeholder}" for col in df.columns[1:])
+        statement = (
+            f"UPDATE {table} SET {assignments} WHERE {df.columns[0]} = {placeholder}"
+        )
+        columns = self._native_columns(df)
+        with self.cursor(commit=True) as crsr:
+            crsr.executemany(statement, zip(*columns[1:], columns[0]))
+
+    @modify_safely
+    def append_all_tables(self, new_rows: dict, updated_rows: dict) -> None:
+        """Insert the new rows and update the changed ones.
+
+        Args:
+            new_rows (dict): A dictionary of table names and the new rows.
+            updated_rows (dict): A dictionary of table names and the changed
+                columns of the existing rows.
+        """
+        for table, df in new_rows.items():
+            if not df.empty:
+                self.fill_table(table, df)
+        for table, df in updated_rows.items():
+            if not df.empty:
+                self.update_table(table, df)
+                logging.info(f"Table '{table}': {df.shape[0]} rows updated.")
+        self.log_load_stats()
+
+    def run(self, new_rows: dict, updated_rows: dict):
+        """Append the new days to the tables. Use the `append_all_tables` method.
+
+        Args:
+            new_rows (dict): A dictionary of table names and the new rows.
+            updated_rows (dict): A dictionary of table names and the changed
+                columns of the existing rows.
+        """
+        self.append_all_tables(new_rows, updated_rows)
+
+
+def read_state(db_connector: DBConnector) -> dict:
+    """Read the state of the database to be continued. Log the last update.
+
+    Args:
+        db_connector (DBConnector): A database connector object.
+
+    Returns:
+        dict: Rows and values the new days are generated from.
+    """
+    state = DBAppender(db_connector).read_state()
+    logging.info(f"The database has been last updated at {state['since']}.")
+    return state
+
+
 def push(random_data: dict, db_connector: DBConnector) -> None:
     """Recreate and fill the database. Log the success info.
 
@@ -192,8 +740,45 @@ def push(random_data: dict, db_connector: DBConnector) -> None:
                 generated data frames.
         db_connector (DBConnector): A database connector object.
     """
-    DBArchitect(db_connector).run()
+    architect = DBArchitect(db_connector)
+    architect.run()
     DBFiller(db_connector).run(random_data)
+    architect.constrain()
+    architect.index()
+    architect.materialize()
+    logging.info(
+        "New database tables has been filled with random values and new views have been added."
+    )
+
+
+def push_stream(chunks: Iterator[tuple], db_connector: DBConnector) -> None:
+    """Recreate the database and fill it with the streamed chunks. Log the success info.
+
+    Args:
+        chunks (Iterator[tuple]): Pairs of a table name and a data frame
+            chunk of the table.
+        db_connector (DBConnector): A database connector object.
+    """
+    architect = DBArchitect(db_connector)
+    architect.run()
+    DBFiller(db_connector).fill_stream(chunks)
+    architect.constrain()
+    architect.index()
+    architect.materialize()
     logging.info(
         "New database tables has been filled with random values and new views have been added."
     )
+
+
+def append(new_rows: dict, updated_rows: dict, db_connector: DBConnector) -> None:
+    """Append the new days to the database, keeping the current data. Log the success info.
+
+    Args:
+        new_rows (dict): A dictionary of table names and the new rows.
+        updated_rows (dict): A dictionary of table names and the changed
+            columns of the existing rows.
+        db_connector (DBConnector): A database connector object.
+    """
+    DBAppender(db_connector).run(new_rows, updated_rows)
+    DBArchitect(db_connector).materialize()
+    logging.info("New random values have been appended to the database tables.")
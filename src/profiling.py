@@ -0,0 +1,135 @@
+"""Time and memory profiling of the data generation, filling and reporting."""
+
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+class Profiler:
+    """Collector of the measurements of the profiled steps.
+    It does nothing until enabled, so the steps can be measured unconditionally.
+
+    Attributes:
+        enabled: Whether the measurements are collected.
+        records: A list of dictionaries describing the measured steps.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.records = []
+        self._start = None
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start collecting the measurements and tracing the memory allocations."""
+        self.enabled = True
+        self._start = time.perf_counter()
+        tracemalloc.start()
+
+    def workers(self, configured: int) -> int:
+        """Get the number of the steps, tables or date shards to be run at once.
+        While profiling they run one after another in the calling thread, as the
+        traced memory belongs to the whole process and the CPU time to the thread.
+
+        Args:
+            configured (int): The number set in the configuration.
+
+        Returns:
+            int: 1 if the measurements are collected, the configured number otherwise.
+        """
+        return 1 if self.enabled else configured
+
+    @staticmethod
+    def peak_rss() -> int:
+        """Get the peak resident set size of the process.
+
+        Returns:
+            int: Peak RSS in bytes or None if it is unavailable on the platform.
+        """
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    @contextmanager
+    def measure(self, stage: str, name: str) -> dict:
+        """Measure the wall time, the CPU time of the current thread and the change
+        of the traced memory of the code block. The memory is traced for the whole
+        process, so the parallel work is run serially while profiling (see `workers`).
+
+        Args:
+            stage (str): Part of the run (generate, fill, report).
+            name (str): Name of the measured step.
+
+        Yields:
+            dict: A record of the step. Set its `rows` item to save the number
+                of the rows produced by the step.
+        """
+        record = {"stage": stage, "step": name, "rows": None}
+        if not self.enabled:
+            yield record
+            return
+        # the peak since the start of this step, not of the whole run
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        wall_before = time.perf_counter()
+        cpu_before = time.thread_time()
+        try:
+            yield record
+        finally:
+            wall_after = time.perf_counter()
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            record.update(
+                {
+                    "started_s": round(wall_before - self._start, 4),
+                    "wall_s": round(wall_after - wall_before, 4),
+                    "cpu_s": round(time.thread_time() - cpu_before, 4),
+                    "memory_delta_b": memory_after - memory_before,
+                    "memory_peak_b": memory_peak,
+                    "peak_rss_b": self.peak_rss(),
+                }
+            )
+            with self._lock:
+                self.records.append(record)
+
+    def save(self) -> Path:
+        """Save the collected records as JSON, together with the current settings,
+        and as CSV to the reports directory.
+
+        Returns:
+            Path: Path of the JSON profile (the CSV one differs in the suffix only).
+        """
+        settings = {}
+        for name in ["random.settings", "fillup.settings"]:
+            with open(Path(f"config/{name}.json"), "r") as f:
+                settings[name] = json.load(f)
+        path = Path(f"reports/profile{datetime.today().strftime('%y%m%d%H%M')}.json")
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.today().isoformat(timespec="seconds"),
+                    "settings": settings,
+                    "records": self.records,
+                },
+                f,
+                indent=4,
+            )
+        pd.DataFrame(self.records).to_csv(path.with_suffix(".csv"), index=False)
+        return path
+
+
+profiler = Profiler()
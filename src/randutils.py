@@ -1,7 +1,7 @@
 """Helper functions for data generation."""
 
 import datetime
-import itertools
+import heapq
 
 import numpy as np
 import numpy.typing as npt
@@ -13,28 +13,52 @@ class RandomHelpers:
     def __init__(self, config: dict, prompts: dict) -> None:
         self.config = config
         self.prompts = prompts
-        self.phone_base = []
-        self.email_base = []
-
-    def gen_one_phone(self, *args) -> str:
-        def _scalar_fun(*args):
-            while True:
-                # get the prefix and the rest of digits
-                digits = [
-                    np.random.choice(self.config["phone_num_prefixes"]),
-                    *np.random.randint(0, 10, size=7),
-                ]
-                # concat the digits
-                phone = "".join(map(str, digits))
-                if not phone in self.phone_base:
-                    break
-            self.phone_base.append(phone)
-            return phone
-
-        return np.vectorize(_scalar_fun)(*args)
+        self.phone_base = set()
+        self.email_base = set()
+        self.name_samplers = {}
+        self.shift_staff, self.shift_offsets, self.shift_counts = (
+            self.build_staff_lookup()
+        )
+
+    def build_staff_lookup(self) -> tuple:
+        # staff on duty in each (weekday, hour) slot, stored one slot after another
+        shifts = self.prompts.get("prompt_staff_shifts", pd.DataFrame())
+        if shifts.empty:
+            empty_slots = np.zeros(7 * 24, dtype=int)
+            return np.array([], dtype=int), empty_slots, empty_slots
+        slots = shifts["weekday"].to_numpy() * 24 + shifts["hour"].to_numpy()
+        staff = shifts["staff_id"].to_numpy()[np.argsort(slots, kind="stable")]
+        counts = np.bincount(slots, minlength=7 * 24)
+        offsets = counts.cumsum() - counts
+        return staff, offsets, counts
 
-    def gen_one_name(self, gender: str, mode: str) -> str:
-        def _scalar_fun(gender: str, mode: str):
+    @staticmethod
+    def _first_fresh(candidates: npt.NDArray, base: set) -> npt.NDArray:
+        # first occurrences of the values that were not registered before
+        _, first_ix = np.unique(candidates, return_index=True)
+        fresh = np.zeros(candidates.size, dtype=bool)
+        fresh[first_ix] = True
+        fresh &= np.array([value not in base for value in candidates], dtype=bool)
+        return fresh
+
+    def gen_phones(self, n: int, rng: np.random.Generator) -> npt.NDArray:
+        phones = np.empty(n, dtype=object)
+        missing = np.arange(n)
+        while missing.size:
+            # get the prefix and the rest of digits
+            numbers = rng.choice(
+                self.config["phone_num_prefixes"], size=missing.size
+            ) * 10**7 + rng.integers(0, 10**7, size=missing.size)
+            candidates = numbers.astype(str).astype(object)
+            # keep the unique ones and redraw only the collisions
+            fresh = self._first_fresh(candidates, self.phone_base)
+            phones[missing[fresh]] = candidates[fresh]
+            self.phone_base.update(candidates[fresh])
+            missing = missing[~fresh]
+        return phones
+
+    def name_sampler(self, gender: str, mode: str) -> tuple:
+        if (gender, mode) not in self.name_samplers:
             # first or last name colname mode
             if mode == "first":
                 col = "first_name"
@@ -50,40 +74,70 @@ class RandomHelpers:
                 }
             else:
                 raise ValueError(f"Cannot generate a name in {mode} mode")
-            # random name based on gender and stats
+            # normalized cumulative distribution to search the draws in
             df = dfs[gender]
-            return np.random.choice(df[col], p=df["prob"])
-
-        return np.vectorize(_scalar_fun)(gender, mode)
-
-    def gen_email(self, first_name: str, last_name: str) -> str:
-        def _scalar_fun(first_name: str, last_name: str):
-            # join the names and cleanse it
-            raw_name = f"{first_name.lower()}.{last_name.lower()}"
-            cleansed_name = unidecode_expect_ascii(raw_name)
+            cdf = df["prob"].to_numpy(dtype=float).cumsum()
+            self.name_samplers[(gender, mode)] = (df[col].to_numpy(), cdf / cdf[-1])
+        return self.name_samplers[(gender, mode)]
+
+    def gen_names(
+        self, genders: npt.ArrayLike, mode: str, rng: np.random.Generator
+    ) -> npt.NDArray:
+        genders = np.asarray(genders)
+        names = np.empty(genders.size, dtype=object)
+        # random names based on gender and stats, one draw per gender
+        for gender in np.unique(genders):
+            mask = genders == gender
+            values, cdf = self.name_sampler(gender, mode)
+            ix = np.searchsorted(cdf, rng.random(mask.sum()), side="right")
+            names[mask] = values[np.minimum(ix, values.size - 1)]
+        return names
+
+    def gen_emails(
+        self,
+        first_names: npt.ArrayLike,
+        last_names: npt.ArrayLike,
+        rng: np.random.Generator,
+    ) -> npt.NDArray:
+        # join the names and cleanse them
+        raw_names = (
+            pd.Series(first_names).str.lower() + "." + pd.Series(last_names).str.lower()
+        )
+        unique_names = raw_names.unique()
+        cleansed_names = raw_names.map(
+            dict(zip(unique_names, map(unidecode_expect_ascii, unique_names)))
+        ).to_numpy(dtype=object)
+        emails = np.empty(cleansed_names.size, dtype=object)
+        missing = np.arange(cleansed_names.size)
+        attempt = 0
+        while missing.size:
             # initially do not add the number after the name
-            number = ""
-            while True:
-                # concat all the elements
-                domain = np.random.choice(self.prompts["prompt_emails"]["domain"])
-                email = f"{cleansed_name}{number}@{domain}"
-                # in the second iteration add the number
-                number = np.random.randint(0, 10)
-                if not email in self.email_base:
-                    break
-            self.email_base.append(email)
-            return email
-
-        return np.vectorize(_scalar_fun)(first_name, last_name)
-
-    def gen_staff_to_date(self) -> npt.NDArray:
+            if attempt:
+                numbers = rng.integers(0, 10 * attempt, size=missing.size)
+                numbers = numbers.astype(str).astype(object)
+            else:
+                numbers = ""
+            # concat all the elements
+            domains = rng.choice(
+                self.prompts["prompt_emails"]["domain"], size=missing.size
+            ).astype(object)
+            candidates = cleansed_names[missing] + numbers + "@" + domains
+            # keep the unique ones and redraw only the collisions
+            fresh = self._first_fresh(candidates, self.email_base)
+            emails[missing[fresh]] = candidates[fresh]
+            self.email_base.update(candidates[fresh])
+            missing = missing[~fresh]
+            attempt += 1
+        return emails
+
+    def gen_staff_to_date(self, rng: np.random.Generator) -> npt.NDArray:
         # NULL fill
         dates = np.zeros(self.config["staff_number"], dtype=pd.Timestamp)
         dates[:] = np.nan
         # find the constants
         some_employee_ix = -2
         # fire him
-        dates[some_employee_ix] = np.random.choice(
+        dates[some_employee_ix] = rng.choice(
             self.prompts["prompt_dates"]["date"].iloc[90:-90]
         )
         return dates
@@ -102,20 +156,14 @@ class RandomHelpers:
         )
         return dates
 
-    def gen_staff_update_time(self, staff: pd.DataFrame):
+    def gen_staff_update_time(self, staff: pd.DataFrame, rng: np.random.Generator):
         df_date = staff[["to_date", "from_date"]]
-        return df_date.max(axis=1, skipna=True, numeric_only=False).apply(
-            lambda date: date
-            + pd.DateOffset(
-                hours=np.random.randint(8, 20),
-                minutes=np.random.randint(0, 60),
-                seconds=np.random.randint(0, 60),
-            )
-        )
+        days = pd.to_datetime(df_date.max(axis=1, skipna=True, numeric_only=False))
+        return self.draw_timestamps(days, 1, self.open_hours(), rng)
 
-    def gen_salary(self, staff: pd.DataFrame) -> npt.NDArray:
+    def gen_salary(self, staff: pd.DataFrame, rng: np.random.Generator) -> npt.NDArray:
         # over the base salary
-        salaries = np.random.exponential(
+        salaries = rng.exponential(
             scale=self.config["salary_settings"]["exp_scale"],
             size=staff.shape[0],
         )
@@ -137,9 +185,9 @@ class RandomHelpers:
         return status
 
     @staticmethod
-    def random_normal_bounded(n, loc, scale, condition, round_d=0):
+    def random_normal_bounded(n, loc, scale, condition, rng, round_d=0):
         # norm rvs with minimum value condition
-        arr = np.random.normal(scale=scale, loc=loc, size=n)
+        arr = rng.normal(scale=scale, loc=loc, size=n)
         mask = arr <= condition
         arr[mask] = condition
         return arr.round(round_d)
@@ -183,7 +231,7 @@ class RandomHelpers:
         )
         return df
 
-    def gen_energy_expenses(self):
+    def gen_energy_expenses(self, rng: np.random.Generator):
         date_df = self.prompts["prompt_dates"].loc[
             self.prompts["prompt_dates"]["date"].dt.day == self.config["payment_day"],
             "date",
@@ -200,6 +248,7 @@ class RandomHelpers:
                     loc=self.config["maintenance"]["energy_loc"],
                     scale=self.config["maintenance"]["energy_scale"],
                     condition=self.config["maintenance"]["energy_min"],
+                    rng=rng,
                     round_d=2,
                 ),
                 "type": np.full(date_df.shape[0], "MEDIA"),
@@ -207,7 +256,7 @@ class RandomHelpers:
         )
         return df
 
-    def gen_water_expenses(self):
+    def gen_water_expenses(self, rng: np.random.Generator):
         date_df = self.prompts["prompt_dates"].loc[
             self.prompts["prompt_dates"]["date"].dt.day == self.config["payment_day"],
             "date",
@@ -224,6 +273,7 @@ class RandomHelpers:
                     loc=self.config["maintenance"]["energy_loc"],
                     scale=self.config["maintenance"]["energy_scale"],
                     condition=self.config["maintenance"]["energy_min"],
+                    rng=rng,
                     round_d=2,
                 ),
                 "type": np.full(date_df.shape[0], "MEDIA"),
@@ -231,7 +281,7 @@ class RandomHelpers:
         )
         return df
 
-    def gen_heat_expenses(self):
+    def gen_heat_expenses(self, rng: np.random.Generator):
         dates = []
         date_df = self.prompts["prompt_dates"].loc[
             self.prompts["prompt_dates"]["date"].dt.day == self.config["payment_day"],
@@ -261,6 +311,7 @@ class RandomHelpers:
                     loc=self.config["maintenance"]["heat_loc"],
                     scale=self.config["maintenance"]["heat_scale"],
                     condition=self.config["maintenance"]["heat_min"],
+                    rng=rng,
                     round_d=2,
                 ),
                 "type": np.full(date_df.shape[0], "MEDIA"),
@@ -268,14 +319,14 @@ class RandomHelpers:
         )
         return df
 
-    def gen_salary_expenses(self, staff: pd.DataFrame):
+    def gen_salary_expenses(self, staff: pd.DataFrame, rng: np.random.Generator):
         date_df = self.gen_expenses_dates()
-        all_staff = pd.concat(
-            [staff[["first_name", "last_name", "current_salary"]]] * date_df.shape[0],
-            ignore_index=True,
-        )
+        # the staff once for each date, also for none of them
+        staff_ix = np.tile(np.arange(staff.shape[0]), date_df.shape[0])
+        all_staff = staff[["first_name", "last_name", "current_salary"]].iloc[staff_ix]
+        all_staff = all_staff.reset_index(drop=True)
         staff_name = staff["first_name"].str.cat(staff["last_name"], sep=" ")
-        names = pd.concat([staff_name] * date_df.shape[0], ignore_index=True)
+        names = staff_name.iloc[staff_ix].reset_index(drop=True)
         dates = np.repeat(date_df, staff_name.shape[0])
         dates = dates.reset_index()["date"]
         title_first = dates.dt.month_name(locale="pl_PL").apply(
@@ -293,14 +344,14 @@ class RandomHelpers:
         to_date = pd.to_datetime(
             staff["to_date"].loc[staff["to_date"].isnull() == False].values[0]
         )
-        df.loc[
-            (df["amount"].isnull() == True) & (df["date"] < to_date), "amount"
-        ] = np.round(
-            self.config["salary_settings"]["minimal"]
-            + np.random.exponential(
-                scale=self.config["salary_settings"]["exp_scale"],
-            ),
-            2,
+        df.loc[(df["amount"].isnull() == True) & (df["date"] < to_date), "amount"] = (
+            np.round(
+                self.config["salary_settings"]["minimal"]
+                + rng.exponential(
+                    scale=self.config["salary_settings"]["exp_scale"],
+                ),
+                2,
+            )
         )
         df.dropna(inplace=True)
         return df
@@ -321,22 +372,21 @@ class RandomHelpers:
         tournament_games = tournament_games[["name_game", "name_tournament"]]
         return tournament_games
 
-    def gen_tournament_staff(self, n=int):
-        available_staff = (
-            self.prompts["prompt_staff_shifts"]
-            .loc[
-                (
-                    self.prompts["prompt_staff_shifts"]["weekday"]
-                    == self.config["event_info"]["weekday"]
-                )
-                & (
-                    self.prompts["prompt_staff_shifts"]["hour"]
-                    >= self.config["event_info"]["hour"]
-                )
-            ]["staff_id"]
-            .unique()
+    def gen_tournament_staff(self, n: int, rng: np.random.Generator):
+        slots = self.config["event_info"]["weekday"] * 24 + np.arange(
+            self.config["event_info"]["hour"], 24
+        )
+        available_staff = np.unique(
+            np.concatenate(
+                [
+                    self.shift_staff[offset : offset + count]
+                    for offset, count in zip(
+                        self.shift_offsets[slots], self.shift_counts[slots]
+                    )
+                ]
+            )
         )
-        return np.random.choice(available_staff, size=n)
+        return rng.choice(available_staff, size=n)
 
     @staticmethod
     def count_matches(x):
@@ -346,73 +396,178 @@ class RandomHelpers:
             x -= 1
         return total
 
-    def gen_sign_u_date(self, deadline: datetime.datetime):
-        deadline = pd.to_datetime(deadline)
-        date = pd.to_datetime(
-            self.prompts["prompt_dates"]["date"]
-            .loc[
-                (self.prompts["prompt_dates"]["date"] < deadline)
-                & (
-                    self.prompts["prompt_dates"]["date"]
-                    > deadline
-                    - pd.DateOffset(
-                        days=self.config["event_info"]["can_sign_up_offset_days"]
-                    )
-                )
-            ]
-            .sample(1, ignore_index=True)
-            .values[0]
-        )
-        date += pd.DateOffset(
-            hours=np.random.randint(
-                self.config["shop_open_hours"]["from"],
-                self.config["shop_open_hours"]["to"],
-            ),
-            minutes=np.random.randint(0, 60),
-            seconds=np.random.randint(0, 60),
-        )
-        return date
+    def gen_sign_u_date(
+        self, deadlines: pd.Series, rng: np.random.Generator
+    ) -> npt.NDArray:
+        open_days = np.sort(
+            self.prompts["prompt_dates"]["date"].to_numpy(dtype="datetime64[ns]")
+        )
+        # the window of the open days before each deadline, found once per deadline
+        deadlines, deadline_ix = np.unique(
+            pd.to_datetime(deadlines).to_numpy(dtype="datetime64[ns]"),
+            return_inverse=True,
+        )
+        offset = np.timedelta64(
+            self.config["event_info"]["can_sign_up_offset_days"], "D"
+        )
+        window_start = np.searchsorted(open_days, deadlines - offset, side="right")
+        window_size = np.searchsorted(open_days, deadlines, side="left") - window_start
+        if (window_size <= 0).any():
+            raise ValueError(
+                "Cannot find any open day to sign up before some deadlines"
+            )
+        # any day of the window for each participant
+        days = open_days[
+            window_start[deadline_ix]
+            + (rng.random(deadline_ix.size) * window_size[deadline_ix]).astype(int)
+        ]
+        return self.draw_timestamps(days, 1, self.open_hours(), rng)
 
     @staticmethod
-    @np.vectorize
-    def v_repeat(date: datetime.datetime, volume: int):
-        return itertools.repeat(date, int(volume))
+    def sample_participants(
+        customer_ids: npt.NDArray,
+        counts: npt.NDArray,
+        rng: np.random.Generator,
+        block_size: int = 2**20,
+    ) -> tuple:
+        # distinct customers for each tournament in a random order of the places;
+        # the ones with the smallest random keys, drawn for a block of tournaments
+        counts = np.asarray(counts, dtype=int)
+        k = counts.max(initial=0)
+        if k > customer_ids.size:
+            raise ValueError("Cannot find enough customers for some of the tournaments")
+        picks = [np.empty((0, k), dtype=int)]
+        rows = max(1, block_size // max(customer_ids.size, 1))
+        for start in range(0, counts.size if k else 0, rows):
+            keys = rng.random((min(rows, counts.size - start), customer_ids.size))
+            smallest = np.argpartition(keys, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(keys, smallest, axis=1).argsort(axis=1)
+            picks.append(np.take_along_axis(smallest, order, axis=1))
+        picks = np.concatenate(picks)
+        # flat (tournament, customer, place) triples
+        taken = np.arange(k) < counts[:, None]
+        tournament_ix = np.repeat(np.arange(counts.size), counts)
+        return tournament_ix, customer_ids[picks[taken]], np.nonzero(taken)[1] + 1
+
+    def open_hours(self) -> pd.DataFrame:
+        # all the opening hours equally likely
+        hours = np.arange(
+            self.config["shop_open_hours"]["from"], self.config["shop_open_hours"]["to"]
+        )
+        return pd.DataFrame({"hour": hours, "prob": 1 / hours.size})
 
     @staticmethod
-    @np.vectorize
-    def v_timedelta(h: int, m: int, s: int):
-        return datetime.timedelta(hours=int(h), minutes=int(m), seconds=int(s))
+    def draw_timestamps(
+        days: npt.ArrayLike,
+        volumes: npt.ArrayLike,
+        hours: pd.DataFrame,
+        rng: np.random.Generator,
+    ) -> npt.NDArray:
+        # each day repeated by its volume, with the hours drawn from the table
+        days = np.asarray(days, dtype="datetime64[s]")
+        volumes = np.broadcast_to(volumes, days.shape).clip(0).astype(int)
+        day_ix = np.repeat(np.arange(days.size), volumes)
+        hour = rng.choice(
+            hours["hour"].to_numpy(), p=hours["prob"].to_numpy(), size=day_ix.size
+        )
+        offsets = hour * 3600 + rng.integers(0, 3600, size=day_ix.size)
+        # in order within each day; the frames keep the nanosecond unit
+        offsets = offsets[np.lexsort((offsets, day_ix))]
+        return (days[day_ix] + offsets.astype("timedelta64[s]")).astype(
+            "datetime64[ns]"
+        )
 
-    def v_get_staff_id(self, timestamp: pd.Timestamp):
-        def _scalar_fun(timestamp: pd.Timestamp):
-            # general of gen_tournament_staff
-            available_staff = self.prompts["prompt_staff_shifts"][
-                (self.prompts["prompt_staff_shifts"]["weekday"] == timestamp.weekday())
-                & (self.prompts["prompt_staff_shifts"]["hour"] == timestamp.hour)
-            ]["staff_id"]
+    @staticmethod
+    def draw_sales_shard(
+        dates: pd.DataFrame,
+        day_offset: int,
+        rng: np.random.Generator,
+        hours: pd.DataFrame,
+        pcs_probas: dict,
+    ) -> pd.DataFrame:
+        # the time of each customer visit
+        timestamps = RandomHelpers.draw_timestamps(
+            dates["date"], dates["volume_sales"], hours, rng
+        )
+        # how many at once are bought
+        pcs = rng.choice(
+            list(pcs_probas.keys()), p=list(pcs_probas.values()), size=timestamps.size
+        ).astype(int)
+        return pd.DataFrame({"date": timestamps, "pcs": pcs})
 
-            return np.random.choice(available_staff)
+    @staticmethod
+    def draw_rental_shard(
+        dates: pd.DataFrame,
+        day_offset: int,
+        rng: np.random.Generator,
+        hours: pd.DataFrame,
+        games: pd.DataFrame,
+        holding_time_params: dict,
+    ) -> pd.DataFrame:
+        # day of each rental and its number within the day
+        volumes = dates["volume_rental"].clip(lower=0).astype(int).to_numpy()
+        day_ix = np.repeat(np.arange(volumes.size), volumes)
+        in_day_ix = np.arange(day_ix.size) - np.repeat(
+            volumes.cumsum() - volumes, volumes
+        )
+        days = pd.DatetimeIndex(dates["date"].to_numpy()[day_ix])
+        rental_dates = RandomHelpers.draw_timestamps(dates["date"], volumes, hours, rng)
+        # return dates after the holding time
+        holding_time = rng.gamma(
+            holding_time_params["shape"],
+            scale=holding_time_params["scale"],
+            size=day_ix.size,
+        )
+        return_dates = (
+            days
+            + pd.to_timedelta(holding_time.astype(int), unit="D")
+            + pd.to_timedelta(np.round(np.abs(holding_time) % 1 * 24, 2), unit="h")
+            + pd.to_timedelta(
+                rng.integers(0, 60, size=day_ix.size) * 60
+                + rng.integers(0, 60, size=day_ix.size),
+                unit="s",
+            )
+        )
+        return pd.DataFrame(
+            {
+                "day_ix": day_ix + day_offset,
+                "in_day_ix": in_day_ix,
+                "date": rental_dates,
+                "game": rng.choice(games["name"], p=games["weights"], size=day_ix.size),
+                "return_date": return_dates,
+            }
+        )
 
-        return np.vectorize(_scalar_fun)(timestamp)
+    def v_get_staff_id(
+        self, timestamps: npt.ArrayLike, rng: np.random.Generator
+    ) -> npt.NDArray:
+        # general of gen_tournament_staff
+        timestamps = pd.DatetimeIndex(timestamps)
+        slots = timestamps.weekday.to_numpy() * 24 + timestamps.hour.to_numpy()
+        counts = self.shift_counts[slots]
+        if (counts == 0).any():
+            raise ValueError("Cannot find any staff on duty for some of the timestamps")
+        # pick one of the staff on duty in each slot
+        picks = self.shift_offsets[slots] + (rng.random(slots.size) * counts).astype(
+            int
+        )
+        return self.shift_staff[picks]
 
-    def gen_sell_inventory(self) -> pd.DataFrame:
+    def gen_sell_inventory(self, rng: np.random.Generator) -> pd.DataFrame:
         # evaluate a total game number
         total_games_n = np.round(
             self.prompts["prompt_dates"]["volume_sales"].sum()
-            * (self.config["inventory_multiplier"] + np.random.exponential())
+            * (self.config["inventory_multiplier"] + rng.exponential())
         )
         game_counts = list(
             map(round, self.prompts["prompt_games"]["weights"] * total_games_n)
         )
         # repeat the games
-        games_gener = itertools.chain(
-            *self.v_repeat(self.prompts["prompt_games"]["name"], game_counts)
-        )
-        games = np.array(list(games_gener))
+        games = np.repeat(self.prompts["prompt_games"]["name"].to_numpy(), game_counts)
         # add the basic details to the data frame
         s_inventory = pd.DataFrame(
             {
-                "game": np.random.permutation(games),
+                "game": rng.permutation(games),
                 "destination": np.full(games.size, "S"),
                 "active": np.full(games.size, True),
             }
@@ -433,7 +588,9 @@ class RandomHelpers:
         s_inventory["purchase_payment"] = (
             s_inventory["price"] * self.config["bulk_ratio"]
         ).round(2)
-        s_inventory = s_inventory.sample(n=s_inventory.shape[0]).reset_index(drop=True)
+        s_inventory = s_inventory.sample(
+            n=s_inventory.shape[0], random_state=rng
+        ).reset_index(drop=True)
         # get the delivery dates
         delivery_count = (
             self.config["avg_supply_yearly_rate"] * self.config["shop_lifetime_years"]
@@ -452,24 +609,58 @@ class RandomHelpers:
         s_inventory["delivery_date"] = group_dates
         return s_inventory
 
-    def gen_rent_inventory(self) -> pd.DataFrame:
+    def gen_sell_delivery(
+        self, volume: float, date: pd.Timestamp, rng: np.random.Generator
+    ) -> pd.DataFrame:
+        # a single delivery, as much as the given traffic needs
+        total_games_n = np.round(
+            volume * (self.config["inventory_multiplier"] + rng.exponential())
+        )
+        game_counts = list(
+            map(round, self.prompts["prompt_games"]["weights"] * total_games_n)
+        )
+        games = np.repeat(self.prompts["prompt_games"]["name"].to_numpy(), game_counts)
+        s_inventory = pd.DataFrame(
+            {
+                "game": rng.permutation(games),
+                "destination": np.full(games.size, "S"),
+                "active": np.full(games.size, True),
+            }
+        )
+        s_inventory = (
+            pd.merge(
+                s_inventory,
+                self.prompts["prompt_games"][["name", "purchase"]],
+                left_on="game",
+                right_on="name",
+                how="inner",
+            )
+            .rename(columns={"purchase": "price"})
+            .drop(columns="name")
+        )
+        s_inventory["purchase_payment"] = (
+            s_inventory["price"] * self.config["bulk_ratio"]
+        ).round(2)
+        s_inventory["delivery_date"] = date + datetime.timedelta(
+            hours=self.config["shop_open_hours"]["from"]
+        )
+        return s_inventory
+
+    def gen_rent_inventory(self, rng: np.random.Generator) -> pd.DataFrame:
         total_games_n = self.config["rental_games_n"]
         game_counts = list(
             map(round, self.prompts["prompt_games"]["weights"] * total_games_n)
         )
         # repeat the games
-        games_gener = itertools.chain(
-            *self.v_repeat(self.prompts["prompt_games"]["name"], game_counts)
-        )
-        games = np.array(list(games_gener))
+        games = np.repeat(self.prompts["prompt_games"]["name"].to_numpy(), game_counts)
         # active statuses
         active_status = np.full(games.size, True)
         active_status[: self.config["inactive_rental_games"]] = False
-        active_status = np.random.permutation(active_status)
+        active_status = rng.permutation(active_status)
         # add the basic details to the data frame
         r_inventory = pd.DataFrame(
             {
-                "game": np.random.permutation(games),
+                "game": rng.permutation(games),
                 "destination": np.full(games.size, "R"),
                 "active": active_status,
             }
@@ -499,7 +690,9 @@ class RandomHelpers:
         ).round(2)
         return r_inventory
 
-    def gen_tournament_inventory(self, tournaments: pd.DataFrame) -> pd.DataFrame:
+    def gen_tournament_inventory(
+        self, tournaments: pd.DataFrame, rng: np.random.Generator
+    ) -> pd.DataFrame:
         # find the required game counts
         game_counts_tournaments = (
             tournaments[["game", "tree_levels"]]
@@ -508,16 +701,14 @@ class RandomHelpers:
             .apply(lambda x: 2**x)
         ).reset_index()
         # repeat the games
-        games_gener = itertools.chain(
-            *self.v_repeat(
-                game_counts_tournaments["game"], game_counts_tournaments["tree_levels"]
-            )
+        games = np.repeat(
+            game_counts_tournaments["game"].to_numpy(),
+            game_counts_tournaments["tree_levels"].to_numpy(),
         )
-        games = np.array(list(games_gener))
         # add the basic details to the data frame
         t_inventory = pd.DataFrame(
             {
-                "game": np.random.permutation(games),
+                "game": rng.permutation(games),
                 "destination": np.full(games.size, "T"),
                 "active": np.full(games.size, True),
             }
@@ -544,12 +735,122 @@ class RandomHelpers:
         t_inventory["price"] = np.nan
         return t_inventory
 
-    def proper_return_date(self, timestamp: datetime.datetime, date: datetime.datetime):
-        if (timestamp.day == date.day) & (timestamp.hour < date.hour):
-            return timestamp.replace(hour=self.config["shop_open_hours"]["from"])
-        elif timestamp.hour < self.config["shop_open_hours"]["from"]:
-            return timestamp.replace(hour=self.config["shop_open_hours"]["from"])
-        elif timestamp.hour >= self.config["shop_open_hours"]["to"]:
-            return timestamp.replace(hour=self.config["shop_open_hours"]["to"] - 1)
+    def proper_return_date(
+        self, timestamps: pd.DatetimeIndex, dates: pd.DatetimeIndex
+    ) -> pd.DatetimeIndex:
+        hours = timestamps.hour.to_numpy()
+        # move the returns into the opening hours
+        proper_hours = np.select(
+            [
+                (timestamps.day == dates.day) & (hours < dates.hour),
+                hours < self.config["shop_open_hours"]["from"],
+                hours >= self.config["shop_open_hours"]["to"],
+            ],
+            [
+                self.config["shop_open_hours"]["from"],
+                self.config["shop_open_hours"]["from"],
+                self.config["shop_open_hours"]["to"] - 1,
+            ],
+            default=hours,
+        )
+        return timestamps + pd.to_timedelta(proper_hours - hours, unit="h")
+
+    @staticmethod
+    def allocate_rent_inventory(
+        inventory: pd.DataFrame,
+        games: npt.NDArray,
+        dates: npt.NDArray,
+        release_dates: npt.NDArray,
+    ) -> npt.NDArray:
+        # free copies of each game, ordered by the time they become available
+        available = inventory.loc[
+            (inventory["destination"] == "R") & (inventory["active"] == True)
+        ]
+        free_lists = {
+            game: list(
+                zip(
+                    group["delivery_date"].to_numpy(dtype="datetime64[ns]"), group.index
+                )
+            )
+            for game, group in available.groupby("game")
+        }
+        for free_list in free_lists.values():
+            heapq.heapify(free_list)
+        # give each rental the copy free for the longest time, in the time order
+        dates = dates.astype("datetime64[ns]")
+        release_dates = release_dates.astype("datetime64[ns]")
+        allocated = np.full(games.size, -1)
+        for k in np.argsort(dates, kind="stable"):
+            free_list = free_lists.get(games[k])
+            if free_list and free_list[0][0] < dates[k]:
+                _, ix = heapq.heappop(free_list)
+                allocated[k] = ix
+                # copies that are not back yet are never free again
+                if not np.isnat(release_dates[k]):
+                    heapq.heappush(free_list, (release_dates[k], ix))
+        return allocated
+
+    @staticmethod
+    def allocate_sell_inventory(
+        inventory: pd.DataFrame, dates: npt.NDArray
+    ) -> npt.NDArray:
+        # copies still for sale, in the order of delivery
+        copies = inventory.loc[
+            (inventory["destination"] == "S") & (inventory["active"] == True)
+        ].sort_values("delivery_date", kind="stable")
+        delivered = np.searchsorted(
+            copies["delivery_date"].to_numpy(dtype="datetime64[ns]"),
+            dates.astype("datetime64[ns]"),
+            side="right",
+        )
+        # each sale in the time order takes the oldest copy left, if any is delivered;
+        # the number of copies sold so far is capped by the delivered ones
+        k = np.arange(dates.size)
+        sold = k + np.minimum(1, np.minimum.accumulate(delivered - k))
+        fulfilled = np.diff(sold, prepend=0) > 0
+        allocated = np.full(dates.size, -1)
+        allocated[fulfilled] = copies.index[sold[fulfilled] - 1]
+        return allocated
+
+
+class RemapIndex:
+    def __init__(self) -> None:
+        # labels (None for the integer keys), the smallest key
+        # and the dense array of the final ids from there on
+        self.lookups = {}
+
+    def add_ids(self, name: str, keys: npt.ArrayLike, ids: npt.ArrayLike) -> None:
+        keys = np.asarray(keys, dtype=int)
+        start = keys.min() if keys.size else 0
+        lookup = np.full(keys.max(initial=start - 1) - start + 1, -1)
+        lookup[keys - start] = ids
+        self.lookups[name] = (None, start, lookup)
+
+    def add_labels(self, name: str, labels: npt.ArrayLike, ids: npt.ArrayLike) -> None:
+        self.lookups[name] = (pd.Index(labels), 0, np.asarray(ids, dtype=int))
+
+    def remap(self, name: str, keys: npt.ArrayLike) -> npt.NDArray:
+        """Translate the keys into the final ids of the given group.
+
+        Args:
+            name (str): Name of the group the keys belong to.
+            keys (npt.ArrayLike): Integer keys or labels to be translated.
+
+        Returns:
+            npt.NDArray: Final ids, as floats with nans in place of the keys
+                missing from the group (or all of them if there is no group).
+        """
+        if name not in self.lookups:
+            return np.full(len(keys), np.nan)
+        labels, start, lookup = self.lookups[name]
+        if labels is None:
+            positions = np.asarray(keys, dtype=int) - start
         else:
-            return timestamp
+            positions = labels.get_indexer(keys)
+        inside = (positions >= 0) & (positions < lookup.size)
+        ids = np.full(positions.size, -1)
+        ids[inside] = lookup[positions[inside]]
+        # floats with the missing ones, as Series.map would give
+        if (ids < 0).any():
+            return np.where(ids < 0, np.nan, ids)
+        return ids
@@ -16,10 +16,10 @@ import pandas as pd
 import pdfkit
 import seaborn as sns
 from matplotlib import pyplot as plt
-from mysql.connector import ProgrammingError
 from mysql.connector.cursor import MySQLCursor
 
 from src.connection import DBConnector, DBEngineer, SQLError
+from src.profiling import profiler
 
 
 class AssetsMissingError(Exception):
@@ -70,22 +70,31 @@ class AssetGenerator(DBEngineer):
         try:
             cursor.execute(f"SELECT * FROM {view_name};")
             rows = cursor.fetchall()
-            cursor.execute(f"SHOW COLUMNS FROM {view_name};")
-            header_info = cursor.fetchall()
-            colnames = [col for col, *info in header_info]
+            colnames = [col for col, *info in cursor.description]
             if rows:
                 return pd.DataFrame(rows, columns=colnames)
             else:
                 # in case the table is empty               
                 return pd.DataFrame({col: [] for col in colnames})
-        except ProgrammingError:
+        except self.db_connector.backend.errors:
             raise SQLError(f"Could not fetch the '{view_name}' data.")
 
     def fetch(self) -> None:
-        """Fetch all the views necessary for analyses and save them to the data attribute."""
+        """Fetch all the views necessary for analyses and save them to the data attribute.
+        Read the `mv_` summary tables of the views instead, if they are in the database.
+        """
         with self.cursor() as crsr:
+            crsr.execute(
+                self.db_connector.backend.list_objects(
+                    "tables", self.db_connector.db_name
+                )
+            )
+            tables = {row[0] for row in crsr.fetchall()}
             for view in self.data.keys():
-                df = self._fetch_one(cursor=crsr, view_name=view)
+                source = f"mv_{view}" if f"mv_{view}" in tables else view
+                with profiler.measure("report", f"fetch_{view}") as record:
+                    df = self._fetch_one(cursor=crsr, view_name=source)
+                    record["rows"] = df.shape[0]
                 self.data[view] = df
 
     def export_table(self, name: str, df: pd.DataFrame) -> None:
@@ -407,7 +416,8 @@ class AssetGenerator(DBEngineer):
         """Prepare all the images, tables and numbers and save them as a dynamic content."""
         self.remove_dynamic_assets()
         self.fetch()
-        self.analyze()
+        with profiler.measure("report", "analyze"):
+            self.analyze()
 
 
 class ReportCreator:
@@ -560,7 +570,8 @@ def generate(db_connector: DBConnector) -> None:
         db_connector (DBConnector): A database connector object.
     """
     AssetGenerator(db_connector).run()
-    ReportCreator().generate()
-    ToPDFConverter().convert()
+    with profiler.measure("report", "fill_template"):
+        ReportCreator().generate()
+    with profiler.measure("report", "convert_pdf"):
+        ToPDFConverter().convert()
     logging.info("New report has been generated.")
-
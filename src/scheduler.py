@@ -0,0 +1,184 @@
+"""Dependency-aware scheduling of the data generation steps."""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from tqdm import tqdm
+
+from src.profiling import profiler
+
+
+def step(reads: tuple = (), writes: tuple = ()) -> callable:
+    """Decorate the generation step to declare the data frames it works on.
+    A frame modified in place counts as written.
+
+    Args:
+        reads (tuple): Names of the attributes the step only reads.
+            Defaults to ().
+        writes (tuple): Names of the attributes the step creates or modifies.
+            Defaults to ().
+
+    Returns:
+        callable: A decorator marking the function.
+    """
+
+    def decorator(fun: callable) -> callable:
+        fun.reads = frozenset(reads)
+        fun.writes = frozenset(writes)
+        return fun
+
+    return decorator
+
+
+class StepScheduler:
+    """Scheduler running the independent generation steps concurrently.
+
+    A step waits for the earlier steps writing any frame it uses and for the
+    earlier steps reading any frame it writes, so the outcome is the same
+    as in the sequential run.
+
+    Attributes:
+        dependencies (list): Indices of the steps each step has to wait for.
+        timings (dict): Start and end time of each finished step, relative
+            to the beginning of the run, by the step index.
+
+    Args:
+        steps (list): Bound methods decorated with `step`, in their
+            sequential order. A method can appear more than once.
+        workers (int): Maximal number of steps running at once.
+            A single one while profiling.
+    """
+
+    def __init__(self, steps: list, workers: int) -> None:
+        self.steps = steps
+        self.workers = profiler.workers(workers)
+        self.dependencies = self.build_graph()
+        self.timings = {}
+
+    def build_graph(self) -> list:
+        """Find the steps each step depends on from the declared frames.
+
+        Raises:
+            ValueError: If some step does not declare its frames.
+
+        Returns:
+            list: Sets of the dependency indices, one per step.
+        """
+        last_writer = {}
+        readers = {}
+        dependencies = []
+        for ix, fun in enumerate(self.steps):
+            if not hasattr(fun, "reads"):
+                raise ValueError(
+                    f"Generation step '{fun.__name__}' does not declare its frames"
+                )
+            # read after write and write after write
+            deps = {
+                last_writer[frame]
+                for frame in fun.reads | fun.writes
+                if frame in last_writer
+            }
+            # write after read
+            for frame in fun.writes:
+                deps.update(readers.get(frame, ()))
+            for frame in fun.reads:
+                readers.setdefault(frame, []).append(ix)
+            for frame in fun.writes:
+                last_writer[frame] = ix
+                readers[frame] = []
+            dependencies.append(deps)
+        return dependencies
+
+    def _timed(self, ix: int, start: float) -> None:
+        fun = self.steps[ix]
+        step_start = time.perf_counter() - start
+        with profiler.measure("generate", fun.__name__) as record:
+            fun()
+            # rows of the frames produced by the step
+            frames = [getattr(fun.__self__, frame) for frame in fun.writes]
+            frames = [df for df in frames if isinstance(df, pd.DataFrame)]
+            if frames:
+                record["rows"] = sum(df.shape[0] for df in frames)
+        self.timings[ix] = (step_start, time.perf_counter() - start)
+
+    def run(self, bar_format: str = None) -> None:
+        """Run all the steps as soon as their dependencies are finished.
+        Log the timings afterwards.
+
+        Args:
+            bar_format (str): Format of the progress bar. Defaults to None.
+        """
+        pending = {ix: set(deps) for ix, deps in enumerate(self.dependencies)}
+        running = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, tqdm(
+            total=len(self.steps), bar_format=bar_format
+        ) as bar:
+            while pending or running:
+                # submit all the steps that are free to go
+                for ix in [ix for ix, deps in pending.items() if not deps]:
+                    del pending[ix]
+                    running[executor.submit(self._timed, ix, start)] = ix
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ix = running.pop(future)
+                    # pass the step error on; the remaining ones are not started
+                    future.result()
+                    for deps in pending.values():
+                        deps.discard(ix)
+                    bar.update()
+        self.log_timings(time.perf_counter() - start)
+
+    def critical_path(self) -> tuple:
+        """Find the longest chain of dependent steps.
+
+        Returns:
+            tuple: Total duration of the chain and the list of its step indices.
+        """
+        finish = {}
+        previous = {}
+        # the dependencies always come earlier in the list
+        for ix, deps in enumerate(self.dependencies):
+            previous[ix] = max(deps, key=lambda dep: finish[dep], default=None)
+            chain_start = finish[previous[ix]] if previous[ix] is not None else 0
+            finish[ix] = chain_start + self.duration(ix)
+        ix = max(finish, key=finish.get)
+        path = []
+        while ix is not None:
+            path.append(ix)
+            ix = previous[ix]
+        return max(finish.values()), path[::-1]
+
+    def duration(self, ix: int) -> float:
+        """Get the duration of a finished step.
+
+        Args:
+            ix (int): Step index.
+
+        Returns:
+            float: Time of the step execution in seconds.
+        """
+        step_start, step_end = self.timings[ix]
+        return step_end - step_start
+
+    def log_timings(self, wall_time: float) -> None:
+        """Log the time of every step and the critical path of the run.
+
+        Args:
+            wall_time (float): Time of the whole run in seconds.
+        """
+        for ix, fun in enumerate(self.steps):
+            logging.debug(f"Step '{fun.__name__}': {self.duration(ix):.2f} s.")
+        path_time, path = self.critical_path()
+        total_time = sum(self.duration(ix) for ix in range(len(self.steps)))
+        logging.info(
+            f"Data generated in {wall_time:.2f} s (steps sum up to {total_time:.2f} s,"
+            + f" critical path takes {path_time:.2f} s)."
+        )
+        logging.info(
+            "Critical path: "
+            + " -> ".join(self.steps[ix].__name__ for ix in path)
+            + "."
+        )
@@ -1 +1 @@
-"""The code is tested in production. :P"""
\ No newline at end of file
+"""Tests of the src package."""
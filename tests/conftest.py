@@ -0,0 +1,138 @@
+"""Shared fixtures of the tests. They run from the repository root, since
+the configuration, the prompts and the SQL files are read relative to it."""
+
+import locale
+import os
+from pathlib import Path
+
+import pytest
+
+# the reports are opened with the Windows shell, never in the tests
+if not hasattr(os, "startfile"):
+    os.startfile = lambda path: None
+
+from src import connection  # noqa: E402
+from src.backends import MySQLBackend  # noqa: E402
+from src.drandom import RandomGenerator  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def polish_locale_missing() -> bool:
+    current = locale.setlocale(locale.LC_TIME)
+    try:
+        locale.setlocale(locale.LC_TIME, "pl_PL")
+    except locale.Error:
+        return True
+    finally:
+        locale.setlocale(locale.LC_TIME, current)
+    return False
+
+
+@pytest.fixture(scope="session", autouse=True)
+def environment():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(ROOT)
+        # the month names of the expense titles fall back to the default ones
+        # on the systems without the Polish locale
+        if polish_locale_missing():
+            set_locale = locale.setlocale
+            mp.setattr(
+                locale,
+                "setlocale",
+                lambda category, name=None: set_locale(
+                    category, "C.UTF-8" if name and "pl" in str(name) else name
+                ),
+            )
+        yield
+
+
+def generate_data(seed: int, **settings) -> dict:
+    """Generate the data set with a fixed seed, bypassing the cache.
+
+    Args:
+        seed (int): The random seed.
+        **settings: Random settings overriding the configured ones.
+
+    Returns:
+        dict: A dictionary of table names and the generated data frames.
+    """
+    generator = RandomGenerator(seed)
+    generator.config["cache"]["enabled"] = False
+    generator.config["date_shards"] = 1
+    generator.config.update(settings)
+    return generator.fetch()
+
+
+@pytest.fixture(scope="session")
+def generate() -> callable:
+    return generate_data
+
+
+@pytest.fixture(scope="session")
+def random_data() -> dict:
+    return generate_data(7)
+
+
+class FakeCursor:
+    """Cursor recording the statements instead of running them."""
+
+    def __init__(self, connection: "FakeConnection") -> None:
+        self.connection = connection
+
+    def execute(self, statement: str, params: tuple = None) -> None:
+        self.connection.check(statement)
+        self.connection.statements.append((statement, params))
+
+    def executemany(self, statement: str, rows: list) -> None:
+        self.connection.check(statement)
+        self.connection.statements.append((statement, list(rows)))
+
+    def fetchall(self) -> list:
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    """Connection to no server, keeping the statements sent and the commits.
+    The statements starting with the keys of `errors` raise the given errors."""
+
+    def __init__(self) -> None:
+        self.statements = []
+        self.commits = 0
+        self.errors = {}
+
+    def check(self, statement: str) -> None:
+        for prefix, error in self.errors.items():
+            if statement.lstrip().startswith(prefix):
+                raise error
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_connector() -> connection.DBConnector:
+    connector = connection.DBConnector.__new__(connection.DBConnector)
+    connector.connection_settings = {"database": "test", "backend": "mysql"}
+    connector.backend = MySQLBackend
+    connector.conn = FakeConnection()
+    return connector
+
+
+@pytest.fixture
+def sqlite_connector(tmp_path, monkeypatch) -> connection.DBConnector:
+    settings = connection.DBConnector.read_settings()
+    settings.update(backend="sqlite", sqlite_file=str(tmp_path / "test.sqlite3"))
+    monkeypatch.setattr(
+        connection.DBConnector, "read_settings", staticmethod(lambda: settings)
+    )
+    return connection.DBConnector()
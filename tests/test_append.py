@@ -0,0 +1,166 @@
+import datetime
+import re
+import sqlite3
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src import drandom, fillup
+from src.fillup import APPEND_IDS, DBAppender, DBArchitect
+from tests.conftest import generate_data
+
+DAYS_AGO = 10
+
+
+def as_of(days: int) -> SimpleNamespace:
+    # the datetime module with the current time moved back by the given days
+    class Past(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime.now(tz) - datetime.timedelta(days=days)
+
+        @classmethod
+        def today(cls):
+            return cls.now()
+
+    return SimpleNamespace(
+        datetime=Past, date=datetime.date, timedelta=datetime.timedelta
+    )
+
+
+@pytest.fixture
+def filled(sqlite_connector, monkeypatch):
+    # the database filled some days ago
+    with monkeypatch.context() as mp:
+        mp.setattr(drandom, "datetime", as_of(DAYS_AGO))
+        fillup.push(generate_data(4), sqlite_connector)
+    return sqlite_connector
+
+
+@pytest.fixture
+def appended(filled):
+    state = fillup.read_state(filled)
+    generator = drandom.AppendGenerator(state, 4)
+    generator.config["date_shards"] = 1
+    new_rows, updated_rows = generator.fetch_new()
+    fillup.append(new_rows, updated_rows, filled)
+    # with the MySQL functions the views use
+    return state, new_rows, updated_rows, filled.conn
+
+
+def query(database: sqlite3.Connection, statement: str) -> list:
+    return database.execute(statement).fetchall()
+
+
+def test_read_state(filled):
+    state = fillup.read_state(filled)
+    database = filled.conn
+    for table, pk in APPEND_IDS.items():
+        [(max_id,)] = query(database, f"SELECT MAX({pk}) FROM {table}")
+        assert state["max_ids"][table] == max_id
+    [(open_rentals,)] = query(
+        database, "SELECT COUNT(*) FROM rental WHERE return_date IS NULL"
+    )
+    assert state["open_rental"].shape[0] == open_rentals
+    assert state["since"] <= pd.Timestamp.now() - pd.Timedelta(days=DAYS_AGO - 1)
+    # the copies sold are not in stock any more
+    stock = state["inventory"]
+    assert not (~stock["active"] & (stock["destination"] == "S")).any()
+
+
+def test_append_continues_the_identifiers(appended):
+    state, new_rows, _, database = appended
+    assert not new_rows["sales"].empty
+    for table, df in new_rows.items():
+        ids = df.iloc[:, 0]
+        if table in state["max_ids"] and not ids.empty:
+            first = state["max_ids"][table] + 1
+            assert sorted(ids) == list(range(first, first + ids.shape[0])), table
+    dates = pd.to_datetime(new_rows["sales"]["date"])
+    assert (dates > state["since"]).all()
+    # the primary keys stay unique in the database
+    for table, pk in APPEND_IDS.items():
+        [(duplicates,)] = query(
+            database, f"SELECT COUNT(*) - COUNT(DISTINCT {pk}) FROM {table}"
+        )
+        assert duplicates == 0, table
+
+
+def test_append_closes_open_rentals(appended):
+    state, _, updated_rows, database = appended
+    closed = updated_rows["rental"]
+    assert not closed.empty
+    assert closed["rental_id"].isin(state["open_rental"]["rental_id"]).all()
+    ids = ",".join(map(str, closed["rental_id"]))
+    rows = query(
+        database,
+        f"SELECT rental_date, return_date FROM rental WHERE rental_id IN ({ids})",
+    )
+    assert all(ret is not None and ret > rented for rented, ret in rows)
+    # a copy is never rented again before it is returned
+    rental = pd.read_sql(
+        "SELECT inventory_id, rental_date, return_date FROM rental",
+        database,
+        parse_dates=["rental_date", "return_date"],
+    ).sort_values(["inventory_id", "rental_date"])
+    previous_return = rental.groupby("inventory_id")["return_date"].shift()
+    assert not (rental["rental_date"] <= previous_return).any()
+    assert (
+        not rental.groupby("inventory_id")["return_date"]
+        .apply(lambda dates: dates.isna().iloc[:-1].any())
+        .any()
+    )
+
+
+def test_append_updates_the_inventory(appended):
+    state, _, updated_rows, database = appended
+    changed = updated_rows["inventory"]
+    assert not changed.empty
+    assert changed["inventory_id"].isin(state["inventory"]["inventory_id"]).all()
+    [(sold_active,)] = query(
+        database,
+        """SELECT COUNT(*) FROM sales s JOIN inventory i USING(inventory_id)
+        WHERE i.active = 1""",
+    )
+    [(rented_active,)] = query(
+        database,
+        """SELECT COUNT(*) FROM rental r JOIN inventory i USING(inventory_id)
+        WHERE r.return_date IS NULL AND i.active = 1""",
+    )
+    [(sold_twice,)] = query(
+        database, "SELECT COUNT(*) - COUNT(DISTINCT inventory_id) FROM sales"
+    )
+    assert (sold_active, rented_active, sold_twice) == (0, 0, 0)
+
+
+def test_append_refreshes_the_summaries(appended):
+    database = appended[-1]
+    summaries = re.findall(
+        r"CREATE TABLE (\w+) AS\s+SELECT \*\s+FROM (\w+)",
+        ";".join(DBArchitect.read_statements("summaries")),
+    )
+    assert summaries
+    for summary, view in summaries:
+        rows = query(database, f"SELECT * FROM {summary}")
+        assert sorted(map(repr, rows)) == sorted(
+            map(repr, query(database, f"SELECT * FROM {view}"))
+        ), summary
+
+
+def test_update_table(fake_connector):
+    df = pd.DataFrame(
+        {
+            "rental_id": [3, 5],
+            "return_date": pd.to_datetime(["2023-01-02", "2023-01-03"]),
+            "penalty_payment_id": [None, 7],
+        }
+    )
+    DBAppender(fake_connector).update_table("rental", df)
+    [(statement, rows)] = fake_connector.conn.statements
+    assert statement == (
+        "UPDATE rental SET return_date = %s, penalty_payment_id = %s "
+        "WHERE rental_id = %s"
+    )
+    assert [(row[1], row[2]) for row in rows] == [(None, 3), (7, 5)]
+    assert fake_connector.conn.commits == 1
@@ -0,0 +1,95 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src import fillup
+from src.backends import SQLiteBackend
+from src.drandom import RandomGenerator
+
+
+@pytest.mark.parametrize(
+    "statement, translated",
+    [
+        (
+            "CREATE TABLE games (game_id INT AUTO_INCREMENT PRIMARY KEY,"
+            + " title VARCHAR(100) COMMENT 'game title')",
+            "CREATE TABLE games (game_id INT PRIMARY KEY, title VARCHAR(100))",
+        ),
+        (
+            "CREATE OR REPLACE VIEW games_sold AS (SELECT 1) UNION ALL (SELECT 2)",
+            "CREATE VIEW games_sold AS SELECT * FROM (SELECT 1)"
+            + " UNION ALL SELECT * FROM (SELECT 2)",
+        ),
+        (
+            "ALTER TABLE rental\nADD CONSTRAINT FK_rental_inventory FOREIGN KEY "
+            + "(inventory_id) REFERENCES inventory(inventory_id)",
+            "CREATE INDEX FK_rental_inventory ON rental (inventory_id)",
+        ),
+        (
+            "ALTER TABLE games\nADD CONSTRAINT UC_games_title UNIQUE (title)",
+            "CREATE UNIQUE INDEX UC_games_title ON games (title)",
+        ),
+    ],
+)
+def test_translate(statement, translated):
+    assert SQLiteBackend.translate(statement) == translated
+
+
+def test_mysql_functions():
+    conn = SQLiteBackend.connect({"sqlite_file": ":memory:"})
+    row = conn.execute(
+        "SELECT YEAR('2023-07-14 10:00:00'), MONTH('2023-07-14 10:00:00'),"
+        + " DAYNAME('2023-07-14 10:00:00'), WEEKDAY('2023-07-14'),"
+        + " MAKEDATE(2023, 32), CONCAT_WS(' ', 'a', NULL, 'b'), YEAR(NULL)"
+    ).fetchone()
+    assert row == (2023, 7, "Friday", 4, "2023-02-01", "a b", None)
+
+
+def test_push(random_data, sqlite_connector):
+    fillup.push(random_data, sqlite_connector)
+    # with the MySQL functions the views use
+    conn = sqlite_connector.conn
+    for table, df in random_data.items():
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        assert count == df.shape[0], table
+    # the report views run on the embedded engine
+    views = re.findall(
+        r"CREATE (?:OR REPLACE )?VIEW (\w+)",
+        ";".join(fillup.DBArchitect.read_statements("views")),
+    )
+    assert views
+    for view in views:
+        conn.execute(f"SELECT * FROM {view}").fetchall()
+    # and are stored as the summary tables
+    summaries = re.findall(
+        r"CREATE TABLE (\w+) AS\s+SELECT \*\s+FROM (\w+)",
+        ";".join(fillup.DBArchitect.read_statements("summaries")),
+    )
+    assert summaries
+    for summary, view in summaries:
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {summary}").fetchone()
+        assert count == conn.execute(f"SELECT COUNT(*) FROM {view}").fetchone()[0]
+    dates = pd.read_sql("SELECT date FROM sales", conn)["date"]
+    assert dates.str.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}").all()
+
+
+def test_push_stream(sqlite_connector):
+    generator = RandomGenerator(7)
+    generator.config["date_shards"] = 1
+    rows = {}
+
+    def counted(chunks):
+        for table, df in chunks:
+            rows[table] = rows.get(table, 0) + df.shape[0]
+            yield table, df
+
+    fillup.push_stream(counted(generator.stream()), sqlite_connector)
+    conn = sqlite_connector.conn
+    for table, count in rows.items():
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone() == (count,)
+    (orphans,) = conn.execute(
+        "SELECT COUNT(*) FROM rental LEFT JOIN payments USING (payment_id)"
+        + " WHERE payments.amount IS NULL"
+    ).fetchone()
+    assert orphans == 0
@@ -0,0 +1,96 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.cache import SnapshotCache
+from src.drandom import RandomGenerator
+
+
+def make_config(directory, max_size_mb: float = 1) -> dict:
+    return {
+        "seed": None,
+        "pipeline_workers": 4,
+        "cache": {
+            "enabled": True,
+            "directory": str(directory),
+            "max_size_mb": max_size_mb,
+        },
+    }
+
+
+def make_data(rows: int = 10) -> dict:
+    return {
+        "games": pd.DataFrame(
+            {
+                "game_id": np.arange(1, rows + 1),
+                "title": [f"Game {i}" for i in range(rows)],
+            }
+        ),
+        "sales": pd.DataFrame(
+            {
+                "sale_id": np.arange(1, rows + 1),
+                "date": pd.date_range("2023-01-01 10:00", periods=rows, freq="h"),
+                "price": np.linspace(10, 20, rows),
+                "return_oper": np.arange(rows) % 2 == 0,
+                "penalty_payment_id": np.where(np.arange(rows) % 3, np.nan, 1.0),
+            }
+        ),
+    }
+
+
+def test_round_trip(tmp_path):
+    cache = SnapshotCache(make_config(tmp_path))
+    data = make_data()
+    assert cache.load("key") is None
+    cache.save("key", data)
+    loaded = cache.load("key")
+    assert list(loaded) == list(data)
+    for table, df in data.items():
+        pd.testing.assert_frame_equal(loaded[table], df)
+
+
+def test_interrupted_save_is_not_a_hit(tmp_path):
+    cache = SnapshotCache(make_config(tmp_path))
+    cache.save("key", make_data())
+    os.remove(tmp_path / "key" / "tables.json")
+    assert cache.load("key") is None
+
+
+def test_key_ignores_the_volatile_settings(tmp_path):
+    config = make_config(tmp_path)
+    key = SnapshotCache.key(config, 1)
+    other_workers = dict(config, pipeline_workers=1, cache={"enabled": False})
+    assert SnapshotCache.key(other_workers, 1) == key
+    assert SnapshotCache.key(config, 2) != key
+    assert SnapshotCache.key(dict(config, staff_number=7), 1) != key
+
+
+def test_least_recently_used_sets_are_evicted(tmp_path):
+    data = make_data(2000)
+    cache = SnapshotCache(make_config(tmp_path, max_size_mb=1024))
+    cache.save("old", data)
+    cache.save("new", data)
+    set_size = sum(file.stat().st_size for file in (tmp_path / "old").iterdir())
+    # the old set used again
+    os.utime(tmp_path / "new", (0, 0))
+    cache.load("old")
+    cache.max_size = set_size * 1.5
+    cache.evict()
+    assert (tmp_path / "old").exists()
+    assert not (tmp_path / "new").exists()
+
+
+def test_seeded_data_set_is_taken_from_the_cache(tmp_path, caplog):
+    generated = RandomGenerator(7)
+    generated.config.update(date_shards=1, cache=make_config(tmp_path, 1024)["cache"])
+    data = generated.fetch()
+    cached = RandomGenerator(7)
+    cached.config.update(date_shards=1, cache=make_config(tmp_path, 1024)["cache"])
+    cached.prepare_data = None
+    with caplog.at_level(logging.INFO):
+        loaded = cached.fetch()
+    assert "taken from the cache" in caplog.text
+    for table, df in data.items():
+        pd.testing.assert_frame_equal(loaded[table], df)
@@ -0,0 +1,156 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src import drandom
+from src.drandom import RandomGenerator
+
+
+def test_same_seed_any_number_of_workers(generate, random_data):
+    sequential = generate(7, pipeline_workers=1)
+    concurrent = generate(7, pipeline_workers=4)
+    assert list(sequential) == list(concurrent) == list(random_data)
+    for table in random_data:
+        pd.testing.assert_frame_equal(sequential[table], concurrent[table])
+        pd.testing.assert_frame_equal(sequential[table], random_data[table])
+
+
+class InlineExecutor:
+    """Executor drawing the shards one by one in the calling thread."""
+
+    def __init__(self, max_workers: int, mp_context=None) -> None:
+        pass
+
+    def map(self, fun: callable, *iterables) -> map:
+        return map(fun, *iterables)
+
+    def shutdown(self) -> None:
+        pass
+
+
+def test_same_seed_any_way_of_drawing_date_shards(generate, monkeypatch):
+    # the spawned processes import the reports opened with the Windows shell,
+    # so the shards are drawn in threads instead
+    monkeypatch.setattr(
+        drandom,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+    concurrent = generate(7, date_shards=3)
+    monkeypatch.setattr(drandom, "ProcessPoolExecutor", InlineExecutor)
+    inline = generate(7, date_shards=3)
+    for table in concurrent:
+        pd.testing.assert_frame_equal(concurrent[table], inline[table])
+    assert not concurrent["sales"]["inventory_id"].duplicated().any()
+
+
+def test_other_seed(generate, random_data):
+    other = generate(8)
+    assert any(not other[table].equals(df) for table, df in random_data.items())
+
+
+def test_keys(random_data):
+    tables = {
+        "customers": "customer_id",
+        "inventory": "inventory_id",
+        "sales": "sale_id",
+        "rental": "rental_id",
+        "payments": "payment_id",
+    }
+    for table, key in tables.items():
+        ids = random_data[table][key]
+        assert ids.tolist() == list(range(1, ids.size + 1)), table
+    payment_ids = set(random_data["payments"]["payment_id"])
+    assert set(random_data["sales"]["payment_id"]) <= payment_ids
+    assert set(random_data["sales"]["inventory_id"]) <= set(
+        random_data["inventory"]["inventory_id"]
+    )
+    assert not random_data["sales"]["inventory_id"].duplicated().any()
+
+
+def test_rentals_of_a_copy_do_not_overlap(random_data):
+    rental = random_data["rental"].sort_values(["inventory_id", "rental_date"])
+    previous_return = rental.groupby("inventory_id")["return_date"].shift()
+    assert not (rental["rental_date"] <= previous_return).any()
+    # a copy not returned yet is not rented again
+    open_before = rental.groupby("inventory_id")["return_date"].transform(
+        lambda dates: dates.isna().shift(fill_value=False).cummax()
+    )
+    assert not open_before.any()
+
+
+def test_dropped_rentals_are_logged(generate, random_data, caplog):
+    caplog.set_level(logging.INFO)
+    generate(7)
+    match = re.search(r"(\d+) of (\d+) drawn rentals have been dropped", caplog.text)
+    assert match
+    dropped, drawn = map(int, match.groups())
+    assert random_data["rental"].shape[0] == drawn - dropped
+
+
+def stream_chunks(seed: int) -> dict:
+    generator = RandomGenerator(seed)
+    generator.config["date_shards"] = 1
+    chunks = {}
+    for table, df in generator.stream():
+        chunks.setdefault(table, []).append(df)
+    return chunks
+
+
+@pytest.fixture(scope="module")
+def streamed() -> dict:
+    return stream_chunks(7)
+
+
+def test_stream_same_seed(streamed):
+    again = stream_chunks(7)
+    assert list(again) == list(streamed)
+    for table, chunks in streamed.items():
+        assert len(again[table]) == len(chunks)
+        for chunk, other in zip(chunks, again[table]):
+            pd.testing.assert_frame_equal(chunk, other)
+
+
+def test_stream_months(streamed, random_data):
+    assert set(streamed) == set(random_data)
+    for table, key in {"sales": "date", "rental": "rental_date"}.items():
+        assert len(streamed[table]) > 1
+        for chunk in streamed[table]:
+            assert chunk[key].dt.to_period("M").nunique() == 1, table
+
+
+def test_stream_ids_continue(streamed):
+    tables = {
+        "sales": "sale_id",
+        "rental": "rental_id",
+        "invoices": "invoice_id",
+        "payments": "payment_id",
+    }
+    for table, key in tables.items():
+        ids = pd.concat(streamed[table], ignore_index=True)[key]
+        assert ids.tolist() == list(range(1, ids.size + 1)), table
+
+
+def test_stream_stock(streamed):
+    data = {
+        table: pd.concat(chunks, ignore_index=True)
+        for table, chunks in streamed.items()
+    }
+    sales, rental = data["sales"], data["rental"]
+    inventory = data["inventory"].set_index("inventory_id")
+    # every copy is sold once and rented by one customer at a time
+    assert not sales["inventory_id"].duplicated().any()
+    assert not inventory.loc[sales["inventory_id"], "active"].any()
+    rental = rental.sort_values(["inventory_id", "rental_date"])
+    previous_return = rental.groupby("inventory_id")["return_date"].shift()
+    assert not (rental["rental_date"] <= previous_return).any()
+    not_returned = rental.loc[rental["return_date"].isnull(), "inventory_id"]
+    assert not inventory.loc[not_returned, "active"].any()
+    # the references of the traffic passed before the rest
+    payment_ids = set(data["payments"]["payment_id"])
+    assert rental["payment_id"].isin(payment_ids).all()
+    assert sales["payment_id"].isin(payment_ids).all()
+    assert rental["customer_id"].isin(set(data["customers"]["customer_id"])).all()
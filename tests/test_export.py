@@ -0,0 +1,83 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backends import SQLiteBackend
+from src.export import DataExporter, sql_literal
+
+
+def seconds(df: pd.DataFrame) -> pd.DataFrame:
+    # the files keep the times to the seconds, as the database does
+    return df.reset_index(drop=True).apply(
+        lambda column: column.dt.floor("s") if column.dtype.kind == "M" else column
+    )
+
+
+@pytest.mark.parametrize(
+    "value, literal",
+    [
+        (None, "NULL"),
+        (np.nan, "NULL"),
+        (True, "1"),
+        (np.int64(3), "3"),
+        (2.5, "2.5"),
+        (pd.Timestamp("2023-07-14 10:20:30.5"), "'2023-07-14 10:20:30'"),
+        ("it's", "'it\\'s'"),
+        ("back\\slash", "'back\\\\slash'"),
+    ],
+)
+def test_sql_literal(value, literal):
+    assert sql_literal(value) == literal
+
+
+def test_parquet(random_data, tmp_path):
+    DataExporter(tmp_path).run(random_data, "parquet")
+    for table, df in random_data.items():
+        exported = pd.read_parquet(tmp_path / f"{table}.parquet")
+        pd.testing.assert_frame_equal(seconds(exported), seconds(df))
+
+
+def test_csv(random_data, tmp_path):
+    DataExporter(tmp_path).run(random_data, "csv")
+    for table, df in random_data.items():
+        exported = pd.read_csv(tmp_path / f"{table}.csv.gz")
+        assert list(exported.columns) == list(df.columns)
+        assert exported.shape == df.shape
+
+
+def test_csv_is_quoted_the_standard_way(tmp_path):
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "title": ['say "hi", then go', "back\\slash", None],
+            "active": [True, False, True],
+        }
+    )
+    DataExporter(tmp_path).run({"games": df}, "csv")
+    exported = pd.read_csv(tmp_path / "games.csv.gz")
+    pd.testing.assert_frame_equal(exported, df)
+
+
+def test_sql(random_data, tmp_path):
+    DataExporter(tmp_path).run(random_data, "sql")
+    assert [path.name for path in tmp_path.iterdir()] == ["dump.sql"]
+    dump = (tmp_path / "dump.sql").read_text(encoding="utf-8")
+    # the data part of the dump, run on the embedded engine
+    conn = SQLiteBackend.connect({"sqlite_file": ":memory:"})
+    tables, data = dump.split("\n-- Data of table", 1)
+    for statement in tables.split(";"):
+        if statement.strip().startswith("CREATE TABLE"):
+            conn.execute(SQLiteBackend.translate(statement))
+    for statement in re.findall(r"^INSERT INTO .*;$", data, flags=re.MULTILINE):
+        # MySQL escapes the quotes with a backslash
+        conn.execute(statement.replace("\\'", "''").replace("`", '"'))
+    for table, df in random_data.items():
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        assert count == df.shape[0], table
+
+
+def test_unknown_format(random_data, tmp_path):
+    with pytest.raises(ValueError):
+        DataExporter(tmp_path).run(random_data, "xlsx")
@@ -0,0 +1,176 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from mysql.connector.errors import Error, ProgrammingError
+
+from src.backends import MySQLBackend
+from src.connection import SQLError
+from src.fillup import DBArchitect, DBFiller, csv_safe_frame
+from tests.conftest import FakeConnection
+
+
+def make_table(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sale_id": np.arange(1, rows + 1),
+            "price": np.where(np.arange(rows) % 2, np.nan, 9.99),
+            "date": pd.date_range("2023-01-01", periods=rows, freq="min"),
+        }
+    )
+
+
+def inserts(connector) -> list:
+    return [
+        rows
+        for statement, rows in connector.conn.statements
+        if statement.startswith("INSERT")
+    ]
+
+
+def test_rows_are_inserted_in_chunks(fake_connector):
+    filler = DBFiller(fake_connector)
+    filler.config["chunk_size"] = 1000
+    filler.fill_table("sales", make_table(2500))
+    assert [len(rows) for rows in inserts(fake_connector)] == [1000, 1000, 500]
+    statement, _ = fake_connector.conn.statements[0]
+    assert statement == "INSERT INTO sales VALUES (%s,%s,%s)"
+    assert filler.load_stats["sales"]["rows"] == 2500
+
+
+def test_chunks_keep_the_row_order_and_nulls(fake_connector):
+    filler = DBFiller(fake_connector)
+    filler.config["chunk_size"] = 2
+    df = make_table(5)
+    filler.fill_table("sales", df)
+    rows = [row for chunk in inserts(fake_connector) for row in chunk]
+    assert [row[0] for row in rows] == df["sale_id"].tolist()
+    assert [row[1] for row in rows] == [9.99, None, 9.99, None, 9.99]
+
+
+def test_empty_table(fake_connector):
+    filler = DBFiller(fake_connector)
+    filler.fill_table("sales", make_table(0))
+    assert inserts(fake_connector) == []
+    assert filler.load_stats["sales"]["rows"] == 0
+
+
+def test_local_infile(fake_connector):
+    filler = DBFiller(fake_connector)
+    filler.config["local_infile"] = {"enabled": True, "tables": ["sales"]}
+    filler.local_infile = True
+    filler.fill_table("sales", make_table(3))
+    ((statement, _),) = fake_connector.conn.statements
+    assert statement.lstrip().startswith("LOAD DATA LOCAL INFILE")
+    # the temporary file is removed once loaded
+    path = re.search(r"INFILE '([^']*)'", statement).group(1)
+    assert not Path(path).exists()
+    assert filler.load_stats["sales"]["rows"] == 3
+
+
+def test_local_infile_refused(fake_connector, caplog):
+    fake_connector.conn.errors["LOAD DATA"] = Error(msg="refused", errno=2068)
+    filler = DBFiller(fake_connector)
+    filler.config["local_infile"] = {"enabled": True, "tables": ["sales", "rental"]}
+    filler.local_infile = True
+    filler.fill_table("sales", make_table(3))
+    filler.fill_table("rental", make_table(2))
+    # the rest of the tables are inserted without trying again
+    assert [len(rows) for rows in inserts(fake_connector)] == [3, 2]
+    assert not filler.local_infile
+    assert "Falling back" in caplog.text
+
+
+def test_local_infile_other_error(fake_connector):
+    fake_connector.conn.errors["LOAD DATA"] = Error(msg="no table", errno=1146)
+    filler = DBFiller(fake_connector)
+    filler.config["local_infile"] = {"enabled": True, "tables": ["sales"]}
+    filler.local_infile = True
+    with pytest.raises(Error):
+        filler.fill_table("sales", make_table(3))
+
+
+def test_csv_safe_frame():
+    df = pd.DataFrame(
+        {
+            "id": [1.0, np.nan],
+            "price": [1.5, 2.0],
+            "active": [True, False],
+            "title": ["a\\b", None],
+        }
+    )
+    safe = csv_safe_frame(df)
+    assert safe["id"].tolist() == [1, pd.NA]
+    assert safe["price"].tolist() == [1.5, 2.0]
+    assert safe["active"].tolist() == [1, 0]
+    assert safe["title"].tolist() == ["a\\\\b", None]
+
+
+class Server:
+    """Opener of the pool connections, which fail on the statements in `errors`."""
+
+    def __init__(self) -> None:
+        self.connections = []
+        self.errors = {}
+
+    def connect(self, settings: dict) -> FakeConnection:
+        self.connections.append(FakeConnection())
+        self.connections[-1].errors = self.errors
+        return self.connections[-1]
+
+
+@pytest.fixture
+def server(monkeypatch) -> Server:
+    server = Server()
+    monkeypatch.setattr(MySQLBackend, "connect", server.connect)
+    return server
+
+
+def test_tables_in_parallel(fake_connector, server):
+    random_data = {
+        table: make_table(rows) for table, rows in zip("abcde", [5, 0, 9, 2, 7])
+    }
+    filler = DBFiller(fake_connector)
+    filler.config["workers"] = 3
+    filler.config["chunk_size"] = 4
+    filler.fill_all_tables(random_data)
+    assert len(server.connections) == 3
+    inserted = {}
+    for conn in server.connections:
+        # every session starts without the foreign key checks
+        assert conn.statements[0][0] == "SET FOREIGN_KEY_CHECKS=0;"
+        for statement, rows in conn.statements[1:]:
+            table = statement.split()[2]
+            inserted[table] = inserted.get(table, 0) + len(rows)
+        # committed once, when all the tables are filled
+        assert conn.commits == 1
+    assert inserted == {
+        table: df.shape[0] for table, df in random_data.items() if df.shape[0]
+    }
+    assert inserts(fake_connector) == []
+    assert set(filler.load_stats) == set(random_data)
+
+
+def test_tables_in_parallel_failure(fake_connector, server):
+    random_data = {table: make_table(3) for table in "abc"}
+    filler = DBFiller(fake_connector)
+    filler.config["workers"] = 2
+    server.errors["INSERT INTO b"] = ProgrammingError(msg="failed")
+    with pytest.raises(SQLError):
+        filler.fill_all_tables(random_data)
+    # nothing is saved
+    assert all(conn.commits == 0 for conn in server.connections)
+
+
+def test_unused_indexes_are_reported(fake_connector, monkeypatch, caplog):
+    monkeypatch.setattr(
+        MySQLBackend,
+        "explain",
+        staticmethod(lambda crsr, query: {"IX_sales_ranking"}),
+    )
+    DBArchitect(fake_connector).check_indexes()
+    # the views are checked against the indexes listed above them
+    assert "View 'employees_ranking'" not in caplog.text
+    assert "View 'top_players' does not use the index" in caplog.text
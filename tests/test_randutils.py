@@ -0,0 +1,248 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.randutils import RandomHelpers, RemapIndex
+
+
+def make_inventory(rows: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        rows, columns=["game", "destination", "active", "delivery_date"]
+    ).astype({"delivery_date": "datetime64[ns]"})
+
+
+def datetimes(*values: str) -> np.ndarray:
+    return np.array(values, dtype="datetime64[ns]")
+
+
+class TestAllocateSellInventory:
+    def test_takes_the_oldest_delivered_copy(self):
+        inventory = make_inventory(
+            [
+                ("A", "S", True, "2023-01-05"),
+                ("A", "S", True, "2023-01-01"),
+                ("A", "S", True, "2023-01-10"),
+            ]
+        )
+        dates = datetimes("2023-01-02", "2023-01-06", "2023-01-11")
+        allocated = RandomHelpers.allocate_sell_inventory(inventory, dates)
+        np.testing.assert_array_equal(allocated, [1, 0, 2])
+
+    def test_sales_before_any_delivery_are_not_fulfilled(self):
+        inventory = make_inventory(
+            [("A", "S", True, "2023-01-05"), ("A", "S", True, "2023-01-06")]
+        )
+        dates = datetimes("2023-01-01", "2023-01-02", "2023-01-07")
+        allocated = RandomHelpers.allocate_sell_inventory(inventory, dates)
+        np.testing.assert_array_equal(allocated, [-1, -1, 0])
+
+    def test_each_copy_is_sold_once(self):
+        inventory = make_inventory([("A", "S", True, "2023-01-01")] * 2)
+        dates = datetimes(*["2023-01-02"] * 4)
+        allocated = RandomHelpers.allocate_sell_inventory(inventory, dates)
+        np.testing.assert_array_equal(allocated, [0, 1, -1, -1])
+
+    def test_skips_the_rented_and_inactive_copies(self):
+        inventory = make_inventory(
+            [
+                ("A", "R", True, "2023-01-01"),
+                ("A", "S", False, "2023-01-01"),
+                ("A", "S", True, "2023-01-03"),
+            ]
+        )
+        dates = datetimes("2023-01-02", "2023-01-04", "2023-01-05")
+        allocated = RandomHelpers.allocate_sell_inventory(inventory, dates)
+        np.testing.assert_array_equal(allocated, [-1, 2, -1])
+
+
+class TestAllocateRentInventory:
+    def test_copy_is_free_again_after_the_return(self):
+        inventory = make_inventory([("A", "R", True, "2023-01-01")])
+        allocated = RandomHelpers.allocate_rent_inventory(
+            inventory,
+            np.array(["A", "A", "A"]),
+            datetimes("2023-01-02", "2023-01-03", "2023-01-06"),
+            datetimes("2023-01-05", "2023-01-04", "2023-01-07"),
+        )
+        np.testing.assert_array_equal(allocated, [0, -1, 0])
+
+    def test_gives_the_copy_free_for_the_longest_time(self):
+        inventory = make_inventory(
+            [("A", "R", True, "2023-01-03"), ("A", "R", True, "2023-01-01")]
+        )
+        allocated = RandomHelpers.allocate_rent_inventory(
+            inventory,
+            np.array(["A", "A"]),
+            datetimes("2023-01-04", "2023-01-05"),
+            datetimes("2023-01-10", "2023-01-10"),
+        )
+        np.testing.assert_array_equal(allocated, [1, 0])
+
+    def test_copies_not_returned_are_never_free_again(self):
+        inventory = make_inventory([("A", "R", True, "2023-01-01")])
+        allocated = RandomHelpers.allocate_rent_inventory(
+            inventory,
+            np.array(["A", "A"]),
+            datetimes("2023-01-02", "2023-02-01"),
+            np.array(["NaT", "NaT"], dtype="datetime64[ns]"),
+        )
+        np.testing.assert_array_equal(allocated, [0, -1])
+
+    def test_matches_the_game_and_skips_the_copies_for_sale(self):
+        inventory = make_inventory(
+            [
+                ("A", "S", True, "2023-01-01"),
+                ("B", "R", True, "2023-01-01"),
+                ("A", "R", False, "2023-01-01"),
+            ]
+        )
+        allocated = RandomHelpers.allocate_rent_inventory(
+            inventory,
+            np.array(["A", "B"]),
+            datetimes("2023-01-02", "2023-01-02"),
+            datetimes("2023-01-03", "2023-01-03"),
+        )
+        np.testing.assert_array_equal(allocated, [-1, 1])
+
+    def test_kept_rentals_of_a_copy_do_not_overlap(self):
+        rng = np.random.default_rng(5)
+        inventory = make_inventory(
+            [
+                (game, "R", True, f"2023-01-0{rng.integers(1, 5)}")
+                for game in rng.choice(["A", "B", "C"], 12)
+            ]
+        )
+        games = rng.choice(["A", "B", "C"], 500)
+        dates = np.datetime64("2023-01-01") + rng.integers(0, 90 * 24, 500).astype(
+            "timedelta64[h]"
+        )
+        release_dates = dates + rng.integers(1, 14 * 24, 500).astype("timedelta64[h]")
+        release_dates[rng.random(500) < 0.05] = np.datetime64("NaT")
+        allocated = RandomHelpers.allocate_rent_inventory(
+            inventory, games, dates, release_dates
+        )
+        kept = allocated >= 0
+        assert 0 < kept.sum() < kept.size
+        assert (inventory.loc[allocated[kept], "game"].to_numpy() == games[kept]).all()
+        rental = pd.DataFrame(
+            {
+                "copy": allocated[kept],
+                "date": dates[kept],
+                "release_date": release_dates[kept],
+            }
+        ).sort_values(["copy", "date"])
+        previous = rental.groupby("copy")["release_date"].shift()
+        assert not (rental["date"] <= previous).any()
+        # nothing follows a rental that is not returned
+        assert (
+            not rental.groupby("copy")["release_date"]
+            .apply(lambda release: release.isna().iloc[:-1].any())
+            .any()
+        )
+
+
+class TestSampleParticipants:
+    def test_distinct_customers_with_subsequent_places(self):
+        customer_ids = np.arange(100, 120)
+        counts = np.array([5, 0, 20, 3])
+        tournament_ix, customers, places = RandomHelpers.sample_participants(
+            customer_ids, counts, np.random.default_rng(1)
+        )
+        assert np.bincount(tournament_ix, minlength=counts.size).tolist() == [
+            5,
+            0,
+            20,
+            3,
+        ]
+        for ix, count in enumerate(counts):
+            taken = tournament_ix == ix
+            assert np.unique(customers[taken]).size == count
+            assert places[taken].tolist() == list(range(1, count + 1))
+        assert np.isin(customers, customer_ids).all()
+
+    def test_does_not_depend_on_the_block_size(self):
+        customer_ids = np.arange(50)
+        counts = np.array([4, 7, 1, 9, 2])
+        full = RandomHelpers.sample_participants(
+            customer_ids, counts, np.random.default_rng(3)
+        )
+        blocked = RandomHelpers.sample_participants(
+            customer_ids, counts, np.random.default_rng(3), block_size=100
+        )
+        for full_part, blocked_part in zip(full, blocked):
+            np.testing.assert_array_equal(full_part, blocked_part)
+
+    def test_no_tournaments(self):
+        tournament_ix, customers, places = RandomHelpers.sample_participants(
+            np.arange(10), np.array([], dtype=int), np.random.default_rng(0)
+        )
+        assert tournament_ix.size == customers.size == places.size == 0
+
+    def test_too_few_customers(self):
+        with pytest.raises(ValueError):
+            RandomHelpers.sample_participants(
+                np.arange(3), np.array([4]), np.random.default_rng(0)
+            )
+
+
+class TestGenSignUpDate:
+    config = {
+        "event_info": {"can_sign_up_offset_days": 7},
+        "shop_open_hours": {"from": 8, "to": 20},
+    }
+
+    def make_helpers(self, open_days: pd.DatetimeIndex) -> RandomHelpers:
+        return RandomHelpers(
+            self.config, {"prompt_dates": pd.DataFrame({"date": open_days})}
+        )
+
+    def test_open_day_within_the_window_before_the_deadline(self):
+        open_days = pd.date_range("2023-01-01", "2023-03-01")
+        open_days = open_days[open_days.weekday != 6]
+        helpers = self.make_helpers(open_days)
+        deadlines = pd.Series(pd.to_datetime(["2023-01-20", "2023-02-10"])).repeat(50)
+        sign_up = pd.DatetimeIndex(
+            helpers.gen_sign_u_date(deadlines, np.random.default_rng(2))
+        )
+        days = sign_up.normalize()
+        assert days.isin(open_days).all()
+        assert (days < deadlines.to_numpy()).all()
+        assert (days > deadlines.to_numpy() - np.timedelta64(7, "D")).all()
+        assert ((sign_up.hour >= 8) & (sign_up.hour < 20)).all()
+
+    def test_no_open_day_before_the_deadline(self):
+        helpers = self.make_helpers(pd.date_range("2023-01-10", "2023-01-20"))
+        with pytest.raises(ValueError):
+            helpers.gen_sign_u_date(
+                pd.Series(pd.to_datetime(["2023-01-05"])), np.random.default_rng(0)
+            )
+
+
+class TestRemapIndex:
+    def test_integer_keys_from_an_offset(self):
+        index = RemapIndex()
+        index.add_ids("rental", [103, 101, 102], [1, 2, 3])
+        np.testing.assert_array_equal(index.remap("rental", [101, 102, 103]), [2, 3, 1])
+
+    def test_missing_keys_become_nans(self):
+        index = RemapIndex()
+        index.add_ids("rental", [10, 12], [1, 2])
+        np.testing.assert_array_equal(
+            index.remap("rental", [9, 10, 11, 12, 13]), [np.nan, 1, np.nan, 2, np.nan]
+        )
+
+    def test_labels(self):
+        index = RemapIndex()
+        index.add_labels("games", ["Go", "Chess"], [5, 6])
+        np.testing.assert_array_equal(
+            index.remap("games", ["Chess", "Poker", "Go"]), [6, np.nan, 5]
+        )
+
+    def test_missing_group(self):
+        index = RemapIndex()
+        assert np.isnan(index.remap("sales", [1, 2])).all()
+
+    def test_empty_group(self):
+        index = RemapIndex()
+        index.add_ids("sales", [], [])
+        assert np.isnan(index.remap("sales", [0, 1])).all()
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from src.profiling import profiler
+from src.scheduler import StepScheduler, step
+
+
+class Pipeline:
+    """Steps recording the order they start and finish in."""
+
+    def __init__(self) -> None:
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, name: str, frame: str = None) -> None:
+        with self.lock:
+            self.events.append(("start", name))
+        time.sleep(0.01)
+        if frame:
+            setattr(self, frame, None)
+        with self.lock:
+            self.events.append(("end", name))
+
+    @step(writes=("a",))
+    def make_a(self) -> None:
+        self.record("make_a", "a")
+
+    @step(writes=("b",))
+    def make_b(self) -> None:
+        self.record("make_b", "b")
+
+    @step(reads=("a",), writes=("c",))
+    def make_c(self) -> None:
+        self.record("make_c", "c")
+
+    @step(reads=("b", "c"), writes=("d",))
+    def make_d(self) -> None:
+        self.record("make_d", "d")
+
+    @step(writes=("a",))
+    def update_a(self) -> None:
+        self.record("update_a", "a")
+
+    def steps(self) -> list:
+        return [self.make_a, self.make_b, self.make_c, self.make_d, self.update_a]
+
+
+def test_dependencies():
+    pipeline = Pipeline()
+    scheduler = StepScheduler(pipeline.steps(), workers=4)
+    # update_a waits for make_a (write after write) and make_c (write after read)
+    assert scheduler.dependencies == [set(), set(), {0}, {1, 2}, {0, 2}]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_steps_start_after_their_dependencies(workers):
+    pipeline = Pipeline()
+    scheduler = StepScheduler(pipeline.steps(), workers)
+    scheduler.run()
+    steps = pipeline.steps()
+    for ix, deps in enumerate(scheduler.dependencies):
+        start = pipeline.events.index(("start", steps[ix].__name__))
+        for dep in deps:
+            assert pipeline.events.index(("end", steps[dep].__name__)) < start
+    assert set(scheduler.timings) == set(range(len(steps)))
+
+
+def test_independent_steps_run_concurrently():
+    class Meeting(Pipeline):
+        # both steps have to be running at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        @step(writes=("a",))
+        def make_a(self) -> None:
+            self.barrier.wait()
+            super().make_a()
+
+        @step(writes=("b",))
+        def make_b(self) -> None:
+            self.barrier.wait()
+            super().make_b()
+
+    pipeline = Meeting()
+    StepScheduler([pipeline.make_a, pipeline.make_b], workers=2).run()
+    assert len(pipeline.events) == 4
+
+
+def test_profiled_steps_run_one_at_a_time(monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "records", [])
+    monkeypatch.setattr(profiler, "_start", time.perf_counter())
+    pipeline = Pipeline()
+    StepScheduler(pipeline.steps(), workers=4).run()
+    # each step ends before the next one starts
+    assert [event for event, _ in pipeline.events] == ["start", "end"] * 5
+    assert sorted(record["step"] for record in profiler.records) == sorted(
+        fun.__name__ for fun in pipeline.steps()
+    )
+
+
+def test_undeclared_step():
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        StepScheduler([pipeline.make_a, pipeline.record], workers=1)
+
+
+def test_step_error_is_passed_on():
+    class Failing(Pipeline):
+        @step(reads=("a",))
+        def fail(self) -> None:
+            raise RuntimeError("step failed")
+
+    pipeline = Failing()
+    scheduler = StepScheduler([pipeline.make_a, pipeline.fail, pipeline.update_a], 1)
+    with pytest.raises(RuntimeError):
+        scheduler.run()
+    assert ("start", "update_a") not in pipeline.events